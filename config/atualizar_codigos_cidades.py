@@ -3,81 +3,21 @@
 Script para verificar e atualizar códigos de cidades do site da Caixa
 """
 
-import time
 import json
+import os
+import sys
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.select import Select
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
-URL = "https://venda-imoveis.caixa.gov.br/sistema/busca-imovel.asp?sltTipoBusca=imoveis"
+# Adicionar o diretório src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper_caixa.cidades import CatalogoCidades
 
 # Estados para verificar (testando apenas alguns primeiro)
 ESTADOS_PARA_VERIFICAR = [
     "SC", "SP", "RS"
 ]
 
-def obter_cidades_do_site(estado):
-    """Obtém as cidades disponíveis para um estado no site"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Executar sem interface gráfica
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    wait = WebDriverWait(driver, 20)  # Aguardar até 20 segundos
-    
-    cidades = {}
-    
-    try:
-        print(f"🔍 Verificando cidades de {estado}...")
-        
-        # Acessar página inicial
-        driver.get(URL)
-        time.sleep(5)
-        
-        # Aguardar elemento do estado estar presente
-        select_estado = wait.until(EC.presence_of_element_located((By.ID, "cmb_estado")))
-        
-        # Selecionar estado
-        select = Select(select_estado)
-        select.select_by_value(estado)
-        
-        # Aguardar carregamento das cidades
-        print(f"  ⏳ Aguardando carregamento das cidades...")
-        time.sleep(5)
-        
-        # Aguardar até que as cidades sejam carregadas
-        try:
-            wait.until(lambda driver: len(Select(driver.find_element(By.ID, "cmb_cidade")).options) > 1)
-        except:
-            print(f"  ⚠️ Timeout aguardando cidades para {estado}")
-        
-        # Obter cidades disponíveis
-        select_cidade = Select(driver.find_element(By.ID, "cmb_cidade"))
-        
-        for option in select_cidade.options:
-            if option.get_attribute('value') and option.text.strip():
-                codigo = option.get_attribute('value')
-                nome = option.text.strip()
-                if nome != "Selecione":  # Ignorar opção padrão
-                    cidades[codigo] = nome
-                    print(f"  ✅ {nome}: {codigo}")
-        
-    except Exception as e:
-        print(f"❌ Erro ao verificar {estado}: {e}")
-    
-    finally:
-        driver.quit()
-    
-    return cidades
-
 def verificar_codigos_existentes():
     """Verifica os códigos atualmente configurados"""
     print("📋 Verificando códigos existentes...")
@@ -199,13 +139,12 @@ def main():
     # Obter códigos atuais
     codigos_atuais = verificar_codigos_existentes()
     
-    # Obter códigos do site
-    codigos_site = {}
-    for estado in ESTADOS_PARA_VERIFICAR:
-        cidades = obter_cidades_do_site(estado)
-        if cidades:
-            codigos_site[estado] = cidades
-        time.sleep(2)  # Pausa maior entre estados
+    # Obter códigos do site (uma única sessão HTTP, estados em paralelo)
+    with CatalogoCidades() as catalogo:
+        codigos_site = catalogo.atualizar(ESTADOS_PARA_VERIFICAR)
+    
+    for estado, cidades in codigos_site.items():
+        print(f"  ✅ {estado}: {len(cidades)} cidades")
     
     # Comparar códigos
     diferencas = comparar_codigos(codigos_atuais, codigos_site)
@@ -11,7 +11,12 @@ from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import os
+import sys
+
+# Caminho do ChromeDriver resolvido com cache (src/scraper_caixa/resolvedor.py)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from scraper_caixa.resolvedor import resolver_chromedriver
 
 URL = "https://venda-imoveis.caixa.gov.br/sistema/busca-imovel.asp?sltTipoBusca=imoveis"
 
@@ -20,7 +25,7 @@ def testar_aguardar_cidades():
     chrome_options = Options()
     chrome_options.add_argument("--window-size=1920,1080")
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(resolver_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     wait = WebDriverWait(driver, 20)  # Aguardar até 20 segundos
     
@@ -9,7 +9,12 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import os
+import sys
+
+# Caminho do ChromeDriver resolvido com cache (src/scraper_caixa/resolvedor.py)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from scraper_caixa.resolvedor import resolver_chromedriver
 
 URL = "https://venda-imoveis.caixa.gov.br/sistema/busca-imovel.asp?sltTipoBusca=imoveis"
 
@@ -19,7 +24,7 @@ def testar_obtencao_cidades():
     chrome_options.add_argument("--window-size=1920,1080")
     # chrome_options.add_argument("--headless")  # Comentado para debug
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(resolver_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     
     try:
@@ -4,6 +4,7 @@ Script automático para buscar imóveis em todas as cidades configuradas
 Com suporte a múltiplos destinatários de email
 """
 
+import argparse
 import time
 import socket
 from datetime import datetime
@@ -13,11 +14,21 @@ from email.mime.multipart import MIMEMultipart
 import json
 import os
 import sys
+from pathlib import Path
 
 # Adicionar o diretório src ao path
 sys.path.append('src')
 
-from scraper_caixa.scraper import buscar_imoveis_com_filtros
+from scraper_caixa import ListingStore, OrquestradorBuscas, ScraperConfig
+from scraper_caixa.checkpoint import DiarioExecucao
+from scraper_caixa.rastreamento import obter_rastreador, span
+from scraper_caixa.diff import (
+    atualizar_snapshot,
+    calcular_delta,
+    carregar_snapshot,
+    registro_snapshot,
+    salvar_snapshot,
+)
 from config.logging_config import setup_logging, get_logger
 
 def carregar_configuracao():
@@ -58,7 +69,7 @@ def carregar_config_gmail():
         'email_destinatarios': []
     }
 
-def enviar_email_relatorio(relatorio, relatorio_detalhado):
+def enviar_email_relatorio(relatorio, relatorio_mudancas):
     """Envia relatório por email usando Gmail com múltiplos destinatários"""
     SENHA_APP = "hfvk igne yago hwou"  # Senha de app fornecida
     config_gmail = carregar_config_gmail()
@@ -97,12 +108,12 @@ def enviar_email_relatorio(relatorio, relatorio_detalhado):
 {relatorio}
 
 ---
-Relatório detalhado anexado.
+Mudanças desde a última execução anexadas.
 Gerado automaticamente pelo Scraper Imóveis Caixa
                 """
                 msg.attach(MIMEText(corpo, 'plain', 'utf-8'))
-                relatorio_anexo = MIMEText(relatorio_detalhado, 'plain', 'utf-8')
-                relatorio_anexo.add_header('Content-Disposition', 'attachment', filename=f'relatorio_detalhado_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt')
+                relatorio_anexo = MIMEText(relatorio_mudancas, 'plain', 'utf-8')
+                relatorio_anexo.add_header('Content-Disposition', 'attachment', filename=f'relatorio_mudancas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt')
                 msg.attach(relatorio_anexo)
                 
                 # Conectar com timeout maior
@@ -143,8 +154,87 @@ Gerado automaticamente pelo Scraper Imóveis Caixa
         print("💡 O relatório foi salvo em arquivo local")
         print("💡 Verifique se o email remetente, destinatários e senha de app estão corretos")
 
-def buscar_todas_cidades():
-    """Busca imóveis em todas as cidades configuradas"""
+def calcular_mudancas(resultados, scraper_config, logger):
+    """
+    Compara os imóveis desta execução com o snapshot da anterior e grava o novo snapshot.
+    
+    Só cidades buscadas com sucesso e com imóveis entram na comparação de
+    removidos: uma busca vazia costuma ser falha do site, não a retirada de
+    todos os imóveis da cidade. Das cidades com paginação interrompida, os
+    imóveis lidos contam como novos/alterados, mas os das páginas não lidas
+    não são dados como removidos.
+    """
+    anterior = carregar_snapshot(scraper_config.snapshot_file)
+    primeira_execucao = not anterior
+    
+    atual = []
+    cidades_ok = set()
+    for resultado in resultados:
+        if not resultado.imoveis or not (resultado.sucesso or resultado.interrompida):
+            continue
+        estado = resultado.filtros['estado']
+        cidade = resultado.filtros['nome_cidade'].upper()
+        if resultado.sucesso and not resultado.interrompida:
+            cidades_ok.add((estado, cidade))
+        atual.extend(
+            registro_snapshot(imovel, estado, cidade)
+            for imovel in resultado.imoveis
+            if imovel.get('id_imovel')
+        )
+    
+    delta = calcular_delta(anterior, atual, cidades_ok)
+    salvar_snapshot(scraper_config.snapshot_file, atualizar_snapshot(anterior, atual, cidades_ok))
+    logger.info(f"🔄 Mudanças desde a última execução: {delta.resumo()}")
+    return delta, primeira_execucao
+
+def formatar_relatorio_mudancas(delta, imoveis_por_id, primeira_execucao):
+    """Relatório só com imóveis novos, removidos e com preço alterado, por cidade"""
+    if primeira_execucao:
+        cabecalho = "Primeira execução: todos os imóveis aparecem como novos."
+    elif delta.vazio:
+        cabecalho = "Nenhuma mudança desde a última execução."
+    else:
+        cabecalho = f"Mudanças desde a última execução: {delta.resumo()}."
+    
+    linhas = [cabecalho]
+    for (estado, cidade), mudancas in sorted(delta.por_cidade().items()):
+        linhas.append(f"\n🏙️ {cidade}/{estado}")
+        
+        for registro in mudancas.novos:
+            imovel = imoveis_por_id.get(registro['id_imovel'], registro)
+            linhas.append(f"\n  🆕 {imovel['nome_imovel']}")
+            if imovel.get('quartos'):
+                linhas.append(f"     🛏️ {imovel['quartos']} quarto(s)")
+            linhas.append(f"     💰 R$ {imovel['valor']}")
+            if imovel.get('endereco'):
+                linhas.append(f"     📍 {imovel['endereco']}")
+            linhas.append(f"     🔗 {link_imovel(imovel)}")
+        
+        for anterior, atual in mudancas.preco_alterado:
+            linhas.append(f"\n  💲 {atual['nome_imovel']}")
+            linhas.append(f"     💰 R$ {anterior['valor']} → R$ {atual['valor']}")
+            linhas.append(f"     🔗 {link_imovel(atual)}")
+        
+        for registro in mudancas.removidos:
+            linhas.append(f"\n  🗑️ {registro['nome_imovel']} (R$ {registro['valor']})")
+    
+    return "\n".join(linhas)
+
+def link_imovel(imovel):
+    """Link direto do imóvel, montado pelo id quando a extração não trouxe o link"""
+    return imovel.get('link_direto') or (
+        "https://venda-imoveis.caixa.gov.br/sistema/detalhe-imovel.asp"
+        f"?hdnOrigem=index&txtImovel={imovel['id_imovel']}"
+    )
+
+def buscar_todas_cidades(retomar=False, run_id=None):
+    """Busca imóveis em todas as cidades configuradas
+    
+    O progresso de cada cidade é registrado no diário da execução
+    (cache/execucoes/<run_id>.jsonl). Com `retomar`, continua a execução
+    `run_id` (ou a mais recente não finalizada): cidades concluídas voltam
+    do banco e as interrompidas continuam da última página gravada.
+    """
     # Configurar sistema de logs
     setup_logging()
     logger = get_logger('scraper_automatico')
@@ -161,62 +251,99 @@ def buscar_todas_cidades():
     logger.info("🚀 Iniciando busca automática de imóveis...")
     logger.info(f"📅 Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
     
+    # Motor de busca: "selenium" (padrão) ou "http" (sem navegador)
+    scraper_config = ScraperConfig(
+        headless=True,
+        search_engine=os.getenv('SCRAPER_SEARCH_ENGINE', 'selenium'),
+        max_workers=int(os.getenv('SCRAPER_MAX_WORKERS', '4')),
+        city_timeout=float(os.getenv('SCRAPER_CITY_TIMEOUT', '600')),
+        page_load_strategy=os.getenv('SCRAPER_PAGE_LOAD_STRATEGY', 'eager'),
+        batch_by_state=os.getenv('SCRAPER_BATCH_BY_STATE', '1') != '0',
+    )
+    logger.info(f"🔧 Motor de busca: {scraper_config.search_engine} ({scraper_config.max_workers} worker(s))")
+    
+    # Configurar filtros de cada cidade (ajustar conforme necessário)
+    tarefas = []
     for estado, cidades in config['cidades'].items():
-        logger.info(f"\n📍 Processando estado: {estado}")
-        
         for codigo, nome in cidades.items():
-            cidades_processadas += 1
-            logger.info(f"\n🏙️ [{cidades_processadas}] Buscando em {nome}/{estado}...")
-            
-            # Configurar filtros (ajustar conforme necessário)
-            filtros = {
+            tarefas.append({
                 'estado': estado,
                 'codigo_cidade': codigo,
                 'nome_cidade': nome,
                 'tipo_imovel': '4',  # Indiferente
                 'faixa_valor': None,  # Indiferente
                 'quartos': None       # Indiferente
-            }
+            })
+    
+    diario = None
+    if retomar:
+        diario = DiarioExecucao.retomar(scraper_config, run_id)
+        if diario is None:
+            logger.warning(f"⚠️ Nenhuma execução para retomar{f' ({run_id})' if run_id else ''}; iniciando uma nova")
+    if diario is None:
+        diario = DiarioExecucao.novo(scraper_config)
+    
+    # Cada worker usa seu próprio Chrome (ou sessão HTTP); falhas ficam isoladas por cidade.
+    # Cada cidade grava seus imóveis no banco (upsert em lote por id_imovel) página a página.
+    inicio_execucao = diario.inicio
+    resultados = OrquestradorBuscas(scraper_config, diario=diario).executar(tarefas)
+    
+    with ListingStore(config=scraper_config) as store:
+        vistos_nesta_execucao = len(store.consultar(vistos_desde=inicio_execucao))
+        logger.info(f"🗄️ Banco {scraper_config.store_file}: {store.contar()} imóveis, {vistos_nesta_execucao} vistos nesta execução")
+    
+    with span("changes"):
+        delta, primeira_execucao = calcular_mudancas(resultados, scraper_config, logger)
+    imoveis_por_id = {
+        str(imovel['id_imovel']): imovel
+        for resultado in resultados
+        for imovel in resultado.imoveis
+        if imovel.get('id_imovel')
+    }
+    relatorio_mudancas = formatar_relatorio_mudancas(delta, imoveis_por_id, primeira_execucao)
+    
+    for resultado in resultados:
+        cidades_processadas += 1
+        estado = resultado.filtros['estado']
+        nome = resultado.filtros['nome_cidade']
+        imoveis = resultado.imoveis
+        
+        if resultado.interrompida:
+            relatorio_completo.append(
+                f"\n⚠️ {nome}/{estado}: {resultado.erro} - só {len(imoveis)} imóveis das páginas lidas"
+            )
+            logger.error(f"❌ {nome}/{estado} incompleta: {resultado.erro}")
+        elif not resultado.sucesso:
+            relatorio_completo.append(f"\n❌ {nome}/{estado}: Erro - {resultado.erro}")
+            logger.error(f"❌ Erro em {nome}: {resultado.erro}")
+        elif imoveis:
+            relatorio_cidade = f"\n🏙️ {nome}/{estado}: {len(imoveis)} imóveis encontrados"
+            logger.info(f"✅ {nome}/{estado}: {len(imoveis)} imóveis encontrados")
             
-            try:
-                imoveis = buscar_imoveis_com_filtros(filtros)
+            # Mostrar TODOS os imóveis com informações completas
+            for i, imovel in enumerate(imoveis, 1):
+                relatorio_cidade += f"\n\n  {i}. {imovel['nome_imovel']}"
                 
-                if imoveis:
-                    relatorio_cidade = f"\n🏙️ {nome}/{estado}: {len(imoveis)} imóveis encontrados"
-                    logger.info(f"✅ {nome}/{estado}: {len(imoveis)} imóveis encontrados")
-                    
-                    # Mostrar TODOS os imóveis com informações completas
-                    for i, imovel in enumerate(imoveis, 1):
-                        relatorio_cidade += f"\n\n  {i}. {imovel['nome_imovel']}"
-                        
-                        # Adicionar quartos se disponível
-                        if imovel.get('quartos'):
-                            relatorio_cidade += f"\n     🛏️ {imovel['quartos']} quarto(s)"
-                        
-                        # Adicionar valor
-                        relatorio_cidade += f"\n     💰 R$ {imovel['valor']}"
-                        
-                        # Adicionar endereço se disponível
-                        if imovel.get('endereco'):
-                            relatorio_cidade += f"\n     📍 {imovel['endereco']}"
-                        
-                        # Adicionar link direto
-                        if imovel.get('link_direto'):
-                            relatorio_cidade += f"\n     🔗 {imovel['link_direto']}"
-                        elif imovel.get('id_imovel'):
-                            relatorio_cidade += f"\n     🔗 https://venda-imoveis.caixa.gov.br/sistema/detalhe-imovel.asp?hdnOrigem=index&txtImovel={imovel['id_imovel']}"
-                    
-                    relatorio_completo.append(relatorio_cidade)
-                    total_imoveis += len(imoveis)
-                else:
-                    relatorio_completo.append(f"\n🏙️ {nome}/{estado}: Nenhum imóvel encontrado")
-                    logger.warning(f"⚠️ {nome}/{estado}: Nenhum imóvel encontrado")
+                # Adicionar quartos se disponível
+                if imovel.get('quartos'):
+                    relatorio_cidade += f"\n     🛏️ {imovel['quartos']} quarto(s)"
                 
-                time.sleep(5)  # Pausa maior entre buscas para evitar erros
+                # Adicionar valor
+                relatorio_cidade += f"\n     💰 R$ {imovel['valor']}"
                 
-            except Exception as e:
-                relatorio_completo.append(f"\n❌ {nome}/{estado}: Erro - {e}")
-                logger.error(f"❌ Erro em {nome}: {e}")
+                # Adicionar endereço se disponível
+                if imovel.get('endereco'):
+                    relatorio_cidade += f"\n     📍 {imovel['endereco']}"
+                
+                # Adicionar link direto
+                if imovel.get('link_direto') or imovel.get('id_imovel'):
+                    relatorio_cidade += f"\n     🔗 {link_imovel(imovel)}"
+            
+            relatorio_completo.append(relatorio_cidade)
+            total_imoveis += len(imoveis)
+        else:
+            relatorio_completo.append(f"\n🏙️ {nome}/{estado}: Nenhum imóvel encontrado")
+            logger.warning(f"⚠️ {nome}/{estado}: Nenhum imóvel encontrado")
     
     # Contar imóveis por estado
     imoveis_por_estado = {}
@@ -249,6 +376,12 @@ def buscar_todas_cidades():
     else:
         relatorio_resumido += " nenhum imóvel nas cidades monitoradas."
     
+    if not primeira_execucao:
+        relatorio_resumido += (
+            f" Desde a última execução: {len(delta.novos)} novos, "
+            f"{len(delta.preco_alterado)} com preço alterado e {len(delta.removidos)} removidos."
+        )
+    
     # Relatório detalhado completo
     relatorio_detalhado = f"""
 📊 RELATÓRIO DETALHADO DE IMÓVEIS - CAIXA
@@ -277,6 +410,12 @@ Relatório gerado automaticamente
     
     logger.info(f"✅ Relatório resumido salvo em '{filename_resumido}'")
     logger.info(f"✅ Relatório detalhado salvo em '{filename_detalhado}'")
+    
+    # Salvar relatório de mudanças (o único anexado ao email)
+    filename_mudancas = f'relatorio_mudancas_{timestamp}.txt'
+    with open(filename_mudancas, 'w', encoding='utf-8') as f:
+        f.write(relatorio_mudancas)
+    logger.info(f"✅ Relatório de mudanças salvo em '{filename_mudancas}'")
     logger.info(f"📊 Total de imóveis encontrados: {total_imoveis}")
     
     # Mostrar relatório resumido
@@ -285,9 +424,23 @@ Relatório gerado automaticamente
     
     # Enviar por email
     logger.info("📧 Preparando envio por email...")
-    enviar_email_relatorio(relatorio_resumido, relatorio_detalhado)
+    with span("email"):
+        enviar_email_relatorio(relatorio_resumido, relatorio_mudancas)
+    
+    # Trace das fases (chrome://tracing ou ui.perfetto.dev)
+    obter_rastreador().exportar_chrome(Path(scraper_config.reports_dir) / f"trace_{diario.run_id}_{timestamp}.json")
     
+    diario.finalizar()
     return relatorio_resumido
 
 if __name__ == "__main__":
-    buscar_todas_cidades() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Busca imóveis da Caixa nas cidades configuradas")
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        metavar="RUN_ID",
+        help="retoma a execução RUN_ID (ou a mais recente não finalizada) a partir do diário",
+    )
+    args = parser.parse_args()
+    buscar_todas_cidades(retomar=args.resume is not None, run_id=args.resume or None) 
\ No newline at end of file
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de ponta a ponta contra o site local (sem internet)
+
+Sobe o servidor_caixa_local (formulário de busca, cidades, páginas de
+resultados e detalhes) com latência e falhas configuráveis e executa as
+buscas pelo caminho real: OrquestradorBuscas com o motor HTTP e/ou com o
+Selenium apontado para localhost. O resultado vai para um JSON com vazão
+(imóveis/s, cidades/min), latência por fase (p50/p95), pico de memória e
+comandos WebDriver, que pode ser comparado com uma baseline gravada.
+
+Uso:
+    python scripts/benchmark/benchmark_e2e.py --motor http
+    python scripts/benchmark/benchmark_e2e.py --motor ambos --latencia 0.05 --falhas 0.02
+    python scripts/benchmark/benchmark_e2e.py --gravar-baseline scripts/benchmark/baseline_e2e.json
+    python scripts/benchmark/benchmark_e2e.py --baseline scripts/benchmark/baseline_e2e.json --tolerancia 0.2
+
+Sai com código 1 se alguma métrica piorar além da tolerância.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Caminhos absolutos: o benchmark troca o diretório atual durante as buscas
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(RAIZ)  # config.logging_config e utils.validation, como no scraper_automatico.py
+sys.path.append(os.path.join(RAIZ, 'src'))
+sys.path.append(os.path.join(RAIZ, 'scripts', 'testes'))
+
+from scraper_caixa import OrquestradorBuscas, ScraperConfig, obter_contador_comandos, obter_rastreador
+from scraper_caixa.config import CHROME_BINARIES
+from servidor_caixa_local import CatalogoLocal, ServidorCaixaLocal
+
+# Cidades servidas pelo site local (todas com o mesmo catálogo de imóveis)
+CIDADES_BENCHMARK = {
+    "SC": {"8690": "JOINVILLE", "8621": "FLORIANOPOLIS", "8545": "BLUMENAU", "8558": "BRUSQUE"},
+    "DF": {"1809": "BRASILIA", "1835": "TAGUATINGA", "1831": "SAMAMBAIA", "1822": "GAMA"},
+}
+
+# Métricas comparadas com a baseline: (chave, True se maior é melhor)
+METRICAS_COMPARADAS = (
+    ("imoveis_por_s", True),
+    ("cidades_por_min", True),
+    ("duracao_s", False),
+    ("comandos_webdriver", False),
+    ("rss_pico_mb", False),
+)
+
+
+def montar_tarefas(cidades):
+    """Filtros de busca de todas as cidades do site local"""
+    return [
+        {
+            'estado': estado,
+            'codigo_cidade': codigo,
+            'nome_cidade': nome,
+            'tipo_imovel': None,
+            'faixa_valor': None,
+            'quartos': None,
+        }
+        for estado, por_codigo in cidades.items()
+        for codigo, nome in por_codigo.items()
+    ]
+
+
+def selenium_disponivel():
+    """True se há um Chrome instalado para o benchmark Selenium"""
+    return any(shutil.which(nome) for nome in CHROME_BINARIES)
+
+
+def rss_pico_mb():
+    """Pico de memória residente do processo e dos filhos já encerrados (MB)"""
+    if resource is None:
+        return None, None
+    # ru_maxrss em KB no Linux e em bytes no macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return (
+        round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 1),
+        round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor, 1),
+    )
+
+
+def executar_motor(motor, servidor, tarefas, args, diretorio):
+    """Executa todas as cidades com um motor e retorna as métricas"""
+    rastreador = obter_rastreador()
+    contador = obter_contador_comandos()
+    rastreador.limpar()
+    contador.limpar()
+
+    config = ScraperConfig(
+        headless=True,
+        search_engine=motor,
+        site_url=servidor.url,
+        max_workers=args.workers,
+        city_timeout=args.timeout_cidade,
+        rate_limit_rps=0,
+        rate_limit_file=None,
+        block_resources=(),
+        save_screenshots=False,
+        data_dir=diretorio,
+        cache_dir=diretorio / "cache",
+        store_file=diretorio / f"imoveis_{motor}.sqlite",
+        checkpoint_dir=diretorio / "execucoes",
+    )
+
+    requisicoes_antes = len(servidor.requisicoes)
+    inicio = time.monotonic()
+    resultados = OrquestradorBuscas(config).executar(tarefas)
+    duracao = time.monotonic() - inicio
+
+    imoveis = sum(len(r.imoveis) for r in resultados)
+    rss, rss_filhos = rss_pico_mb()
+    fases = {
+        linha["fase"]: {
+            "categoria": linha["categoria"],
+            "n": linha["n"],
+            "total_s": round(linha["total"], 4),
+            "p50_s": round(linha["p50"], 4),
+            "p95_s": round(linha["p95"], 4),
+            "max_s": round(linha["max"], 4),
+        }
+        for linha in rastreador.resumo()
+    }
+
+    return {
+        "cidades": len(resultados),
+        "cidades_com_erro": sum(1 for r in resultados if not r.sucesso),
+        "erros": sorted({r.erro for r in resultados if r.erro})[:5],
+        "imoveis": imoveis,
+        # Falhas de página não viram erro da cidade: a diferença aparece aqui
+        "imoveis_esperados": len(tarefas) * args.imoveis,
+        "duracao_s": round(duracao, 3),
+        "imoveis_por_s": round(imoveis / duracao, 2) if duracao else 0.0,
+        "cidades_por_min": round(len(resultados) / duracao * 60, 2) if duracao else 0.0,
+        "requisicoes_http": len(servidor.requisicoes) - requisicoes_antes,
+        "comandos_webdriver": contador.total,
+        "comandos_por_tipo": {comando: h.n for comando, h in contador.por_comando().items()},
+        "rss_pico_mb": rss,
+        "rss_pico_filhos_mb": rss_filhos,
+        "fases": fases,
+    }
+
+
+def comparar(resultado, baseline, tolerancia):
+    """Lista as métricas que pioraram além da tolerância em relação à baseline"""
+    regressoes = []
+    for motor, atual in resultado["motores"].items():
+        anterior = baseline.get("motores", {}).get(motor)
+        if not anterior:
+            continue
+        for chave, maior_melhor in METRICAS_COMPARADAS:
+            novo, velho = atual.get(chave), anterior.get(chave)
+            if not novo or not velho:
+                continue
+            variacao = (novo - velho) / velho
+            piorou = variacao < -tolerancia if maior_melhor else variacao > tolerancia
+            marcador = "❌" if piorou else "✅"
+            print(f"   {marcador} {motor:<9} {chave:<20} {velho:>10} -> {novo:>10} ({variacao:+.1%})")
+            if piorou:
+                regressoes.append(f"{motor}.{chave}: {velho} -> {novo} ({variacao:+.1%})")
+    return regressoes
+
+
+def mostrar(motor, metricas):
+    """Resumo legível de um motor"""
+    print(f"\n📊 Motor {motor}:")
+    print(
+        f"   {metricas['imoveis']}/{metricas['imoveis_esperados']} imóveis em {metricas['cidades']} cidades "
+        f"({metricas['cidades_com_erro']} com erro) em {metricas['duracao_s']:.2f}s"
+    )
+    print(f"   {metricas['imoveis_por_s']} imóveis/s, {metricas['cidades_por_min']} cidades/min")
+    print(f"   {metricas['requisicoes_http']} requisições HTTP, {metricas['comandos_webdriver']} comandos WebDriver")
+    print(f"   Pico de memória: {metricas['rss_pico_mb']} MB (filhos: {metricas['rss_pico_filhos_mb']} MB)")
+    for fase, dados in sorted(metricas["fases"].items(), key=lambda item: item[1]["total_s"], reverse=True)[:10]:
+        print(f"   {fase:<24} n={dados['n']:<5} p50={dados['p50_s'] * 1000:8.1f}ms p95={dados['p95_s'] * 1000:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta contra o site local")
+    parser.add_argument("--motor", choices=("http", "selenium", "ambos"), default="ambos")
+    parser.add_argument("--imoveis", type=int, default=95, help="imóveis por cidade")
+    parser.add_argument("--por-pagina", type=int, default=20)
+    parser.add_argument("--latencia", type=float, default=0.02, help="segundos antes de cada resposta do site")
+    parser.add_argument("--falhas", type=float, default=0.0, help="fração de POSTs respondidos com 503")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--timeout-cidade", type=float, default=120)
+    parser.add_argument("--saida", help="arquivo JSON do resultado (padrão: relatorios/benchmark_e2e_<data>.json)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--gravar-baseline", help="grava o resultado também como baseline neste arquivo")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="piora relativa aceita (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    motores = ["http", "selenium"] if args.motor == "ambos" else [args.motor]
+    if "selenium" in motores and not selenium_disponivel():
+        print("⚠️ Chrome não encontrado; benchmark Selenium ignorado")
+        motores.remove("selenium")
+    if not motores:
+        return False
+
+    tarefas = montar_tarefas(CIDADES_BENCHMARK)
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "maquina": {"python": platform.python_version(), "sistema": platform.platform(), "cpus": os.cpu_count()},
+        "parametros": {
+            "cidades": len(tarefas),
+            "imoveis_por_cidade": args.imoveis,
+            "por_pagina": args.por_pagina,
+            "latencia_s": args.latencia,
+            "taxa_falhas": args.falhas,
+            "workers": args.workers,
+        },
+        "motores": {},
+    }
+
+    print(f"🏁 Benchmark: {len(tarefas)} cidades x {args.imoveis} imóveis, latência {args.latencia * 1000:.0f}ms, "
+          f"falhas {args.falhas:.0%}, {args.workers} worker(s)")
+
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="benchmark_e2e_") as temporario:
+        diretorio = Path(temporario)
+        # Screenshots e HTMLs de diagnóstico da busca vão para o diretório temporário
+        os.chdir(diretorio)
+        try:
+            for motor in motores:
+                servidor = ServidorCaixaLocal(
+                    catalogo=CatalogoLocal(args.imoveis, args.por_pagina),
+                    cidades=CIDADES_BENCHMARK,
+                    latencia=args.latencia,
+                    taxa_falhas=args.falhas,
+                )
+                with servidor:
+                    resultado["motores"][motor] = executar_motor(motor, servidor, tarefas, args, diretorio)
+                mostrar(motor, resultado["motores"][motor])
+        finally:
+            os.chdir(diretorio_original)
+
+    saida = Path(args.saida or ScraperConfig().reports_dir / f"benchmark_e2e_{datetime.now():%Y%m%d_%H%M%S}.json")
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n💾 Resultado salvo em {saida}")
+
+    if args.gravar_baseline:
+        Path(args.gravar_baseline).write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Baseline gravada em {args.gravar_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print(f"\n📐 Comparando com {args.baseline} (tolerância {args.tolerancia:.0%}):")
+        regressoes = comparar(resultado, baseline, args.tolerancia)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressão(ões):")
+            for regressao in regressoes:
+                print(f"   - {regressao}")
+            return False
+        print("\n✅ Sem regressões em relação à baseline")
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark da extração de imóveis sobre páginas salvas (só CPU)
+
+Mede, para cada backend de extração e cada página de ``fixtures/``
+(1, 20 e 200 imóveis, página malformada e "Nenhum resultado"), o tempo
+por página e por imóvel e a memória alocada (tracemalloc), sem navegador:
+
+- lxml:      ``extrair_imoveis_do_html`` sobre o HTML
+- js:        ``extrair_imoveis_em_lote`` com os campos brutos que o
+             SCRIPT_EXTRACAO_LOTE devolveria (só a parte em Python)
+- elementos: ``extrair_dados_imovel`` bloco a bloco, sobre elementos lxml
+             no lugar dos WebElement (sem os round trips ao chromedriver)
+- regex:     ``extrair_imoveis_via_regex``, o fallback sobre o HTML
+
+Os tempos complementam o benchmark_e2e.py: aqui fica só o custo de CPU
+do parsing, separado da latência do navegador.
+
+Uso:
+    python scripts/benchmark/benchmark_extracao.py
+    python scripts/benchmark/benchmark_extracao.py --backend regex --backend lxml
+    python scripts/benchmark/benchmark_extracao.py --gravar-baseline scripts/benchmark/baseline_extracao.json
+    python scripts/benchmark/benchmark_extracao.py --baseline scripts/benchmark/baseline_extracao.json
+
+Sai com código 1 se algum backend piorar além da tolerância.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(RAIZ, 'src'))
+
+from selenium.common.exceptions import NoSuchElementException
+
+from scraper_caixa import ScraperConfig
+from scraper_caixa.extractor import extrair_dados_imovel, extrair_imoveis_em_lote, extrair_imoveis_via_regex
+from scraper_caixa.html_parser import (
+    XPATH_IMAGEM,
+    XPATH_LINK,
+    XPATHS_BLOCOS,
+    _parse_documento,
+    extrair_imoveis_do_html,
+    texto_visivel,
+)
+
+DIRETORIO_FIXTURES = Path(__file__).parent / "fixtures"
+
+BACKENDS = ("lxml", "js", "elementos", "regex")
+
+# Métricas comparadas com a baseline (menor é melhor)
+METRICAS_COMPARADAS = ("ms_por_pagina", "pico_kb")
+
+
+class ElementoLxml:
+    """Elemento lxml com a parte da interface de WebElement usada pelo extrator."""
+
+    _XPATHS = {
+        "a[onclick*='detalhe_imovel']": XPATH_LINK,
+        "img.fotoimovel": XPATH_IMAGEM,
+    }
+
+    def __init__(self, elemento) -> None:
+        self._elemento = elemento
+
+    @property
+    def text(self) -> str:
+        return texto_visivel(self._elemento)
+
+    def get_attribute(self, nome: str):
+        return self._elemento.get(nome)
+
+    def find_element(self, by, seletor: str) -> "ElementoLxml":
+        encontrados = self._XPATHS[seletor](self._elemento)
+        if not encontrados:
+            raise NoSuchElementException(seletor)
+        return ElementoLxml(encontrados[0])
+
+
+class DriverLote:
+    """Driver falso: ``execute_script`` devolve os campos já coletados da página."""
+
+    def __init__(self, brutos) -> None:
+        self._brutos = brutos
+
+    def execute_script(self, script, *args):
+        return self._brutos
+
+
+def blocos_da_pagina(html: str):
+    """Blocos de imóvel do primeiro seletor que encontra algo, como na extração real."""
+    documento = _parse_documento(html)
+    if documento is None:
+        return []
+    for _, xpath in XPATHS_BLOCOS:
+        blocos = xpath(documento)
+        if blocos:
+            return blocos
+    return []
+
+
+def campos_brutos(bloco) -> dict:
+    """O que o SCRIPT_EXTRACAO_LOTE devolve para um bloco."""
+    links = XPATH_LINK(bloco)
+    imagens = XPATH_IMAGEM(bloco)
+    return {
+        "texto_link": texto_visivel(links[0]).strip() if links else None,
+        "onclick": links[0].get("onclick", "") if links else "",
+        "url_imagem": imagens[0].get("src", "") if imagens else "",
+        "texto_bloco": texto_visivel(bloco),
+    }
+
+
+def preparar(backend: str, html: str):
+    """
+    Monta a função medida de um backend para uma página.
+
+    O que o navegador faria (parsing do DOM, coleta dos campos pelo
+    script) é preparado aqui, fora da medição.
+
+    Returns:
+        Função sem argumentos que retorna a lista de imóveis extraídos
+    """
+    if backend == "lxml":
+        return lambda: extrair_imoveis_do_html(html)
+    if backend == "regex":
+        return lambda: extrair_imoveis_via_regex(html)
+    if backend == "js":
+        driver = DriverLote([campos_brutos(bloco) for bloco in blocos_da_pagina(html)])
+        return lambda: [dados for dados in extrair_imoveis_em_lote(driver) if dados]
+    if backend == "elementos":
+        elementos = [ElementoLxml(bloco) for bloco in blocos_da_pagina(html)]
+        return lambda: [dados for dados in map(extrair_dados_imovel, elementos) if dados]
+    raise ValueError(f"Backend desconhecido: {backend}")
+
+
+def medir(funcao, tempo_minimo: float, repeticoes_minimas: int):
+    """
+    Executa a função repetidamente e mede tempo e memória.
+
+    Returns:
+        Tupla (imóveis, tempos em segundos, pico alocado em KB, KB retidos no resultado)
+    """
+    imoveis = funcao()  # aquecimento
+    tempos = []
+    inicio = time.perf_counter()
+    while len(tempos) < repeticoes_minimas or time.perf_counter() - inicio < tempo_minimo:
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+
+    # Memória em uma execução separada: o tracemalloc deixa o código bem mais lento
+    tracemalloc.start()
+    try:
+        antes, _ = tracemalloc.get_traced_memory()
+        resultado = funcao()
+        atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return len(imoveis), tempos, (pico - antes) / 1024, (atual - antes) / 1024
+
+
+def comparar(resultado, baseline, tolerancia, folga_ms):
+    """Lista as medições que pioraram além da tolerância em relação à baseline"""
+    regressoes = []
+    for chave, atual in resultado["medicoes"].items():
+        anterior = baseline.get("medicoes", {}).get(chave)
+        if not anterior:
+            continue
+        for metrica in METRICAS_COMPARADAS:
+            novo, velho = atual.get(metrica), anterior.get(metrica)
+            if not novo or not velho:
+                continue
+            variacao = (novo - velho) / velho
+            # Diferenças de poucos microssegundos são ruído da máquina
+            piorou = variacao > tolerancia and not (metrica == "ms_por_pagina" and novo - velho < folga_ms)
+            if piorou:
+                regressoes.append(f"{chave}.{metrica}: {velho} -> {novo} ({variacao:+.1%})")
+            marcador = "❌" if piorou else "✅"
+            print(f"   {marcador} {chave:<34} {metrica:<14} {velho:>10} -> {novo:>10} ({variacao:+.1%})")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark da extração sobre páginas salvas")
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="backend a medir (padrão: todos)")
+    parser.add_argument("--fixtures", default=str(DIRETORIO_FIXTURES), help="diretório das páginas HTML")
+    parser.add_argument("--tempo-minimo", type=float, default=0.5, help="segundos medindo cada caso")
+    parser.add_argument("--repeticoes", type=int, default=5, help="execuções mínimas de cada caso")
+    parser.add_argument("--saida", help="arquivo JSON do resultado (padrão: relatorios/benchmark_extracao_<data>.json)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--gravar-baseline", help="grava o resultado também como baseline neste arquivo")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    parser.add_argument("--folga-ms", type=float, default=0.05, help="piora absoluta de tempo sempre aceita (ms)")
+    args = parser.parse_args()
+
+    paginas = {caminho.stem: caminho.read_text(encoding="utf-8") for caminho in sorted(Path(args.fixtures).glob("*.html"))}
+    if not paginas:
+        print(f"❌ Nenhuma página em {args.fixtures} (gere com gerar_fixtures_extracao.py)")
+        return False
+
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "maquina": {"python": platform.python_version(), "sistema": platform.platform(), "cpus": os.cpu_count()},
+        "parametros": {"tempo_minimo_s": args.tempo_minimo, "repeticoes": args.repeticoes},
+        "medicoes": {},
+    }
+
+    # Os logs do extrator (fallback, blocos sem link) poluiriam a saída a cada repetição
+    logging.disable(logging.CRITICAL)
+    try:
+        print(f"{'backend':<10} {'página':<18} {'KB':>6} {'imóveis':>7} {'ms/página':>10} {'p95 ms':>8} "
+              f"{'µs/imóvel':>10} {'pico KB':>9} {'retido KB':>9}")
+        for backend in args.backend or BACKENDS:
+            for nome, html in paginas.items():
+                imoveis, tempos, pico_kb, retido_kb = medir(preparar(backend, html), args.tempo_minimo, args.repeticoes)
+                tempos.sort()
+                mediana = statistics.median(tempos) * 1000
+                medicao = {
+                    "backend": backend,
+                    "pagina": nome,
+                    "tamanho_kb": round(len(html.encode("utf-8")) / 1024, 1),
+                    "imoveis": imoveis,
+                    "execucoes": len(tempos),
+                    "ms_por_pagina": round(mediana, 4),
+                    "ms_p95": round(tempos[max(0, int(len(tempos) * 0.95) - 1)] * 1000, 4),
+                    "us_por_imovel": round(mediana * 1000 / imoveis, 2) if imoveis else None,
+                    "pico_kb": round(pico_kb, 1),
+                    "retido_kb": round(retido_kb, 1),
+                }
+                resultado["medicoes"][f"{backend}/{nome}"] = medicao
+                print(f"{backend:<10} {nome:<18} {medicao['tamanho_kb']:>6} {imoveis:>7} {mediana:>10.3f} "
+                      f"{medicao['ms_p95']:>8.3f} {medicao['us_por_imovel'] or '-':>10} "
+                      f"{medicao['pico_kb']:>9} {medicao['retido_kb']:>9}")
+    finally:
+        logging.disable(logging.NOTSET)
+
+    saida = Path(args.saida or ScraperConfig().reports_dir / f"benchmark_extracao_{datetime.now():%Y%m%d_%H%M%S}.json")
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n💾 Resultado salvo em {saida}")
+
+    if args.gravar_baseline:
+        Path(args.gravar_baseline).write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Baseline gravada em {args.gravar_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print(f"\n📐 Comparando com {args.baseline} (tolerância {args.tolerancia:.0%}):")
+        regressoes = comparar(resultado, baseline, args.tolerancia, args.folga_ms)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressão(ões):")
+            for regressao in regressoes:
+                print(f"   - {regressao}")
+            return False
+        print("\n✅ Sem regressões em relação à baseline")
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
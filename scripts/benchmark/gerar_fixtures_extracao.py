@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gera as páginas de resultados usadas pelo benchmark de extração
+
+As páginas imitam o ``driver.page_source`` da busca da Caixa depois que a
+lista de imóveis foi carregada: cabeçalho, CSS e scripts inline do site,
+formulário de busca, blocos ``li.group-block-item`` e paginação. Os dados
+são fictícios, mas os blocos seguem a marcação do site (título
+"CIDADE - NOME | R$ VALOR" no link ``detalhe_imovel(ID)``, nomes com
+hífens, linhas de endereço, avaliação e desconto).
+
+Os arquivos gerados ficam versionados em ``scripts/benchmark/fixtures``;
+rode este script só para recriá-los (a saída é determinística).
+
+Uso:
+    python scripts/benchmark/gerar_fixtures_extracao.py
+"""
+
+import random
+from pathlib import Path
+
+DIRETORIO_FIXTURES = Path(__file__).parent / "fixtures"
+
+CIDADES = [
+    ("JOINVILLE", "SANTA CATARINA", "89201-000"),
+    ("FLORIANOPOLIS", "SANTA CATARINA", "88010-000"),
+    ("BALNEARIO CAMBORIU", "SANTA CATARINA", "88330-000"),
+    ("SAO PAULO", "SAO PAULO", "01310-100"),
+    ("BRASILIA", "DISTRITO FEDERAL", "70040-010"),
+    ("RIO DE JANEIRO", "RIO DE JANEIRO", "20040-002"),
+]
+EMPREENDIMENTOS = [
+    "RESIDENCIAL JARDIM DAS FLORES", "CONDOMINIO VILLA VERDE", "EDIFICIO SOLAR DO MAR",
+    "RESIDENCIAL PARQUE - BLOCO B", "CONJ. HAB. SANTA RITA", "CASA", "LOTEAMENTO NOVA ESPERANCA - QD 12",
+]
+RUAS = ["RUA DAS PALMEIRAS", "AV. BRASIL", "RUA XV DE NOVEMBRO", "RUA JOAO PESSOA", "AV. BEIRA-MAR NORTE"]
+BAIRROS = ["CENTRO", "ITAUM", "COSTA E SILVA", "JARDIM - AMERICA", "VILA NOVA"]
+
+# Cabeçalho do site: CSS e scripts inline com muitos "-", "|" e "R$" fora dos
+# blocos de imóvel, como no page_source real
+CABECALHO = """<!DOCTYPE html>
+<html lang="pt-br"><head>
+<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Imóveis à venda - Caixa - Busca de imóveis</title>
+<link rel="stylesheet" href="/sistema/css/bootstrap.min.css">
+<link rel="stylesheet" href="/sistema/css/caixa-imoveis.css">
+<style>
+{estilos}
+</style>
+<script src="/sistema/js/jquery-3.5.1.min.js"></script>
+<script src="https://cdn.perfdrive.com/aperture/aperture.js"></script>
+<script>
+{scripts}
+</script>
+</head>
+<body class="page-busca">
+<header class="header-site">
+  <nav class="nav-main"><ul class="nav-list no-bullets">
+    <li><a href="/sistema/busca-imovel.asp">Buscar imóveis</a></li>
+    <li><a href="/sistema/venda-online.asp">Venda Online - Licitação | Venda Direta</a></li>
+    <li><a href="/sistema/perguntas.asp">Dúvidas - Perguntas frequentes</a></li>
+  </ul></nav>
+</header>
+<form id="frmBusca" name="frmBusca" method="post" onsubmit="return false;">
+  <ul class="form-set no-bullets filtros">
+    <li><label for="cmb_estado">Estado</label>
+      <select id="cmb_estado" name="cmb_estado">{estados}</select></li>
+    <li><label for="cmb_cidade">Cidade</label>
+      <select id="cmb_cidade" name="cmb_cidade"><option value="8690" selected>JOINVILLE</option></select></li>
+    <li><label for="cmb_faixa_vlr">Faixa de valor</label>
+      <select id="cmb_faixa_vlr" name="cmb_faixa_vlr">
+        <option value="1">Até R$ 50.000</option><option value="2">R$ 50.000 - R$ 100.000</option>
+        <option value="3">R$ 100.000 - R$ 150.000</option><option value="7">Acima de R$ 500.000</option>
+      </select></li>
+  </ul>
+</form>
+"""
+
+RODAPE = """
+<footer class="footer-site">
+  <p>CAIXA - Caixa Econômica Federal | SAC 0800 726 0101 - Ouvidoria 0800 725 7474</p>
+  <p>Imóveis vendidos no estado em que se encontram - consulte o edital | Valores em R$</p>
+</footer>
+<script>
+$(function () {{ $('#cmb_estado').on('change', carregaListaCidades); registrarPaginacao({paginas}); }});
+</script>
+</body></html>
+"""
+
+ESTILOS = """
+.group-block-item {{ border-bottom: 1px solid #e5e5e5; padding: 12px 0; }}
+.fotoimovel-col1 {{ float: left; width: 25%; }} .dadosimovel-col2 {{ float: left; width: 75%; }}
+.form-set li {{ margin: 0 0 4px; }} .no-bullets {{ list-style: none; padding-left: 0; }}
+@media (max-width: 767px) {{ .fotoimovel-col1, .dadosimovel-col2 {{ width: 100%; }} }}
+"""
+
+ESTADOS = ("AC AL AM AP BA CE DF ES GO MA MG MS MT PA PB PE PI PR RJ RN RO RR RS SC SE SP TO").split()
+
+
+def _script_site(linhas: int) -> str:
+    """Bloco de JavaScript parecido com o do site (formatação, máscaras, paginação)."""
+    rng = random.Random(linhas)
+    partes = [
+        "function formatarValor(v) { return 'R$ ' + v.toFixed(2).replace('.', ',').replace(/(\\d)(?=(\\d{3})+,)/g, '$1.'); }",
+        "function mascaraCep(c) { return c.substr(0, 5) + '-' + c.substr(5, 3); }",
+        "function detalhe_imovel(id) { $('#hdnimovel').val(id); $('#frmDetalhe').submit(); }",
+    ]
+    for i in range(linhas):
+        a, b = rng.randint(1, 999), rng.randint(1, 99)
+        partes.append(
+            f"var cfg{i} = {{ id: 'campo-{a}', rotulo: 'Opção {a} - {b} | R$ {a}.{b:02d}0,00', "
+            f"largura: {a} - {b}, ativo: {str(i % 2 == 0).lower()} }};"
+        )
+        partes.append(f"if (cfg{i}.largura - {b} > 0 || cfg{i}.ativo) {{ $('#campo-{a}').addClass('col-{b % 12}'); }}")
+    return "\n".join(partes)
+
+
+def _valor(reais: int) -> str:
+    return f"{reais:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def bloco_imovel(rng: random.Random, numero: int) -> str:
+    """Um ``li.group-block-item`` da lista de resultados."""
+    cidade, estado, cep = rng.choice(CIDADES)
+    id_imovel = 8444400000000 + numero * 37
+    tipo = rng.choice(["Apartamento", "Casa", "Terreno"])
+    quartos = rng.randint(1, 4)
+    avaliacao = rng.randint(80, 900) * 1000
+    venda = int(avaliacao * rng.uniform(0.55, 0.95))
+    desconto = round((1 - venda / avaliacao) * 100, 2)
+    nome = f"{rng.choice(EMPREENDIMENTOS)} APTO {rng.randint(1, 20)}0{rng.randint(1, 8)}"
+    return f"""
+<li class="group-block-item">
+  <div class="fotoimovel-col1">
+    <img class="fotoimovel" src="/fotos/F{id_imovel}21.jpg" alt="Foto do imóvel" onerror="this.src='/sistema/img/sem-foto.jpg'">
+  </div>
+  <div class="dadosimovel-col2">
+    <ul class="form-set inside-set no-bullets">
+      <li class="control-item control-span-12_12">
+        <a href="javascript:;" onclick="javascript:detalhe_imovel({id_imovel}); return false;">
+          <strong>{cidade} - {nome} | R$ {_valor(venda)}</strong></a>
+      </li>
+      <li class="control-item control-span-12_12">
+        <span>Valor de avaliação: R$ {_valor(avaliacao)}</span><br>
+        <span>Valor mínimo de venda: R$ {_valor(venda)} - desconto de {str(desconto).replace('.', ',')}%</span>
+      </li>
+      <li class="control-item control-span-12_12">
+        <span>{tipo} - {quartos} quarto(s) - {rng.randint(0, 2)} vaga(s) na garagem</span><br>
+        <span>Endereço: {rng.choice(RUAS)}, N. {rng.randint(1, 3000)}, {rng.choice(BAIRROS)} - CEP: {cep}, {cidade} - {estado}</span>
+      </li>
+      <li class="control-item control-span-12_12">
+        <span>Número do imóvel: {str(id_imovel)[:-1]}-{str(id_imovel)[-1]}</span>
+        <span class="modalidade">Venda Online | Financiamento: {rng.choice(['Sim', 'Não'])}</span>
+      </li>
+    </ul>
+  </div>
+</li>"""
+
+
+def pagina(quantidade: int, semente: int = 1, conteudo: str = "") -> str:
+    """Página de resultados com ``quantidade`` imóveis (ou o ``conteudo`` dado)."""
+    rng = random.Random(semente)
+    estados = "".join(
+        f'<option value="{uf}"{" selected" if uf == "SC" else ""}>{uf}</option>' for uf in ESTADOS
+    )
+    if not conteudo:
+        itens = "".join(bloco_imovel(rng, n) for n in range(1, quantidade + 1))
+        conteudo = f'<ul class="control-group no-bullets">{itens}\n</ul>'
+    paginas = max(1, -(-quantidade // 20))
+    links = " ".join(
+        f'<a href="javascript:;" onclick="carregaListaImoveis({n}); return false;">{n}</a>'
+        for n in range(1, paginas + 1)
+    )
+    return (
+        CABECALHO.format(estilos=ESTILOS.format(), scripts=_script_site(150), estados=estados)
+        + f'<div id="listaimoveispaginacao">\n{conteudo}\n</div>\n<div id="paginacao">{links}</div>'
+        + RODAPE.format(paginas=paginas)
+    )
+
+
+def pagina_malformada() -> str:
+    """Página cortada no meio, com tags sem fechamento e blocos incompletos."""
+    rng = random.Random(7)
+    blocos = [bloco_imovel(rng, n) for n in range(1, 9)]
+    # Bloco sem o link de detalhe e bloco com título fora do padrão
+    blocos[2] = blocos[2].replace("detalhe_imovel", "abrir_imovel")
+    blocos[4] = blocos[4].replace(" | R$ ", " / valor ")
+    # Tags sem fechamento e um "<" solto no texto
+    blocos[5] = blocos[5].replace("</strong></a>", "<strong>").replace("</li>", "", 2)
+    blocos[6] = blocos[6].replace("quarto(s)", "quarto(s) < 3 vaga(s) <b")
+    html = pagina(0, conteudo='<ul class="control-group no-bullets">' + "".join(blocos))
+    # Resposta truncada no meio do último bloco
+    return html[: html.rindex('<span class="modalidade">')]
+
+
+def pagina_sem_resultados() -> str:
+    """Página da busca sem imóveis."""
+    return pagina(0, conteudo=(
+        '<div class="alert-vazio"><p>Nenhum resultado encontrado para os filtros selecionados.</p>'
+        "<p>Altere os filtros - estado, cidade ou faixa de valor - e tente novamente.</p></div>"
+    ))
+
+
+FIXTURES = {
+    "resultados_1.html": lambda: pagina(1, semente=1),
+    "resultados_20.html": lambda: pagina(20, semente=20),
+    "resultados_200.html": lambda: pagina(200, semente=200),
+    "malformada.html": pagina_malformada,
+    "nenhum_resultado.html": pagina_sem_resultados,
+}
+
+
+def main():
+    DIRETORIO_FIXTURES.mkdir(parents=True, exist_ok=True)
+    for nome, gerar in FIXTURES.items():
+        caminho = DIRETORIO_FIXTURES / nome
+        caminho.write_text(gerar(), encoding="utf-8")
+        print(f"💾 {caminho} ({caminho.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,19 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
-from webdriver_manager.chrome import ChromeDriverManager
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 import json
 import os
+import sys
+
+# Adicionar o diretório src ao path para reutilizar o pool de drivers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from scraper_caixa import DriverPool, ScraperConfig
+from scraper_caixa.resolvedor import resolver_chromedriver
 
 # Cidades desejadas com seus estados
 CIDADES_DESEJADAS = {
@@ -24,16 +30,22 @@ CIDADES_DESEJADAS = {
     'SP': ['SAO JOSE DO RIO PRETO', 'BADY BASSIT']
 }
 
-def buscar_codigo_cidade(estado, nome_cidade):
-    """Busca o código de uma cidade específica no site da Caixa"""
+def buscar_codigo_cidade(estado, nome_cidade, driver=None):
+    """Busca o código de uma cidade específica no site da Caixa
+    
+    Aceita um `driver` já aberto (por exemplo, alugado de um DriverPool);
+    nesse caso o navegador não é fechado ao final.
+    """
     print(f"🔍 Buscando código para {nome_cidade}/{estado}...")
     
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--window-size=1920,1080")
+    driver_proprio = driver is None
+    if driver_proprio:
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--window-size=1920,1080")
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+        service = Service(resolver_chromedriver())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
     
     try:
         # Acessar página inicial
@@ -66,7 +78,8 @@ def buscar_codigo_cidade(estado, nome_cidade):
         print(f"❌ Erro ao buscar {nome_cidade}: {e}")
         return None, None
     finally:
-        driver.quit()
+        if driver_proprio:
+            driver.quit()
 
 def buscar_todas_cidades():
     """Busca códigos de todas as cidades desejadas"""
@@ -74,14 +87,15 @@ def buscar_todas_cidades():
     
     cidades_encontradas = {}
     
-    for estado, cidades in CIDADES_DESEJADAS.items():
-        cidades_encontradas[estado] = {}
+    # Um único navegador é reutilizado para todas as buscas
+    with DriverPool(ScraperConfig(headless=True)) as pool, pool.emprestimo() as driver:
+        for estado, cidades in CIDADES_DESEJADAS.items():
+            cidades_encontradas[estado] = {}
         
-        for cidade in cidades:
-            codigo, nome_real = buscar_codigo_cidade(estado, cidade)
-            if codigo and nome_real:
-                cidades_encontradas[estado][codigo] = nome_real
-            time.sleep(1)  # Pausa entre buscas
+            for cidade in cidades:
+                codigo, nome_real = buscar_codigo_cidade(estado, cidade, driver=driver)
+                if codigo and nome_real:
+                    cidades_encontradas[estado][codigo] = nome_real
     
     return cidades_encontradas
 
@@ -9,10 +9,17 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
-from webdriver_manager.chrome import ChromeDriverManager
 import json
+import os
+import sys
 from datetime import datetime
 
+# Adicionar o diretório src ao path para reutilizar o pool de drivers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from scraper_caixa import DriverPool, ScraperConfig
+from scraper_caixa.resolvedor import resolver_chromedriver
+
 # Cidades desejadas que precisamos buscar
 CIDADES_DESEJADAS = {
     'SC': ['JOINVILLE', 'BARRA VELHA', 'BLUMENAU', 'BALNEARIO PICARRAS', 'ITAJAI', 'GOVERNADOR CELSO RAMOS'],
@@ -20,16 +27,22 @@ CIDADES_DESEJADAS = {
     'SP': ['SAO JOSE DO RIO PRETO', 'BADY BASSIT']
 }
 
-def buscar_cidades_estado(estado):
-    """Busca todas as cidades de um estado específico"""
+def buscar_cidades_estado(estado, driver=None):
+    """Busca todas as cidades de um estado específico
+    
+    Aceita um `driver` já aberto (por exemplo, alugado de um DriverPool);
+    nesse caso o navegador não é fechado ao final.
+    """
     print(f"🔍 Buscando cidades de {estado}...")
     
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--window-size=1920,1080")
+    driver_proprio = driver is None
+    if driver_proprio:
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--window-size=1920,1080")
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+        service = Service(resolver_chromedriver())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
     
     try:
         # Acessar página inicial
@@ -59,7 +72,8 @@ def buscar_cidades_estado(estado):
         print(f"❌ Erro ao buscar cidades de {estado}: {e}")
         return {}
     finally:
-        driver.quit()
+        if driver_proprio:
+            driver.quit()
 
 def encontrar_cidades_desejadas(cidades_estado, cidades_desejadas):
     """Encontra as cidades desejadas na lista de cidades do estado"""
@@ -102,28 +116,28 @@ def main():
     
     cidades_encontradas = {}
     
-    for estado, cidades in CIDADES_DESEJADAS.items():
-        print(f"\n📍 PROCESSANDO {estado}")
-        print("-" * 40)
+    # Um único navegador é reutilizado para todas as buscas
+    with DriverPool(ScraperConfig(headless=True)) as pool, pool.emprestimo() as driver:
+        for estado, cidades in CIDADES_DESEJADAS.items():
+            print(f"\n📍 PROCESSANDO {estado}")
+            print("-" * 40)
         
-        # Buscar todas as cidades do estado
-        cidades_estado = buscar_cidades_estado(estado)
+            # Buscar todas as cidades do estado
+            cidades_estado = buscar_cidades_estado(estado, driver=driver)
         
-        if cidades_estado:
-            # Mostrar todas as cidades do estado
-            mostrar_todas_cidades_estado(estado, cidades_estado)
+            if cidades_estado:
+                # Mostrar todas as cidades do estado
+                mostrar_todas_cidades_estado(estado, cidades_estado)
             
-            # Encontrar cidades desejadas
-            print(f"\n🎯 BUSCANDO CIDADES DESEJADAS EM {estado}:")
-            print("-" * 40)
-            encontradas = encontrar_cidades_desejadas(cidades_estado, cidades)
+                # Encontrar cidades desejadas
+                print(f"\n🎯 BUSCANDO CIDADES DESEJADAS EM {estado}:")
+                print("-" * 40)
+                encontradas = encontrar_cidades_desejadas(cidades_estado, cidades)
             
-            if encontradas:
-                cidades_encontradas[estado] = encontradas
-            else:
-                print(f"⚠️ Nenhuma cidade desejada encontrada em {estado}")
-        
-        time.sleep(1)  # Pausa entre estados
+                if encontradas:
+                    cidades_encontradas[estado] = encontradas
+                else:
+                    print(f"⚠️ Nenhuma cidade desejada encontrada em {estado}")
     
     # Mostrar resultado final
     print("\n" + "="*60)
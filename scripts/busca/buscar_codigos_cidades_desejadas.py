@@ -9,10 +9,17 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
-from webdriver_manager.chrome import ChromeDriverManager
 import json
+import os
+import sys
 from datetime import datetime
 
+# Adicionar o diretório src ao path para reutilizar o pool de drivers
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from scraper_caixa import DriverPool, ScraperConfig
+from scraper_caixa.resolvedor import resolver_chromedriver
+
 # Cidades desejadas
 CIDADES_DESEJADAS = {
     'SC': ['JOINVILLE', 'BARRA VELHA', 'BLUMENAU', 'BALNEARIO PICARRAS', 'ITAPEMA', 'SAO FRANCISCO DO SUL', 'GOVERNADOR CELSO RAMOS'],
@@ -20,14 +27,20 @@ CIDADES_DESEJADAS = {
     'MS': ['CAMPO GRANDE', 'TRES LAGOAS']
 }
 
-def buscar_cidades_estado(estado):
-    """Busca todas as cidades de um estado no site da Caixa"""
+def buscar_cidades_estado(estado, driver=None):
+    """Busca todas as cidades de um estado no site da Caixa
+    
+    Aceita um `driver` já aberto (por exemplo, alugado de um DriverPool);
+    nesse caso o navegador não é fechado ao final.
+    """
     print(f"🔍 Buscando cidades de {estado}...")
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--window-size=1920,1080")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver_proprio = driver is None
+    if driver_proprio:
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--window-size=1920,1080")
+        service = Service(resolver_chromedriver())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
     try:
         driver.get("https://venda-imoveis.caixa.gov.br/sistema/busca-imovel.asp?sltTipoBusca=imoveis")
         time.sleep(3)
@@ -47,7 +60,8 @@ def buscar_cidades_estado(estado):
         print(f"❌ Erro ao buscar cidades de {estado}: {e}")
         return {}
     finally:
-        driver.quit()
+        if driver_proprio:
+            driver.quit()
 
 def encontrar_cidades_desejadas(cidades_estado, cidades_desejadas):
     """Encontra as cidades desejadas na lista de cidades do estado"""
@@ -67,14 +81,15 @@ def main():
     print("\n🚀 BUSCANDO CÓDIGOS REAIS DAS CIDADES DESEJADAS...")
     print("="*60)
     cidades_encontradas = {}
-    for estado, cidades in CIDADES_DESEJADAS.items():
-        print(f"\n📍 {estado}:")
-        cidades_estado = buscar_cidades_estado(estado)
-        if cidades_estado:
-            encontradas = encontrar_cidades_desejadas(cidades_estado, cidades)
-            if encontradas:
-                cidades_encontradas[estado] = encontradas
-        time.sleep(1)
+    # Um único navegador é reutilizado para todas as buscas
+    with DriverPool(ScraperConfig(headless=True)) as pool, pool.emprestimo() as driver:
+        for estado, cidades in CIDADES_DESEJADAS.items():
+            print(f"\n📍 {estado}:")
+            cidades_estado = buscar_cidades_estado(estado, driver=driver)
+            if cidades_estado:
+                encontradas = encontrar_cidades_desejadas(cidades_estado, cidades)
+                if encontradas:
+                    cidades_encontradas[estado] = encontradas
     # Salvar resultado
     if cidades_encontradas:
         config = {
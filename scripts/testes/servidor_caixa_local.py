@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor local que imita os endpoints do site de imóveis da Caixa.
+
+Responde com páginas no mesmo formato das gravadas do site real, para
+testar o motor HTTP, o fluxo Selenium (e o parser) sem acessar a internet:
+
+- GET  busca-imovel.asp            -> formulário de busca em passos, com o mesmo
+                                      JavaScript de estados/cidades/paginação
+                                      (define cookie de sessão)
+- POST carregaPesquisaImoveis.asp  -> inputs hdnImov1..N com os IDs por página
+- POST carregaListaImoveis.asp     -> lista de imóveis dos IDs enviados
+- POST carregaListaCidades.asp     -> <option> das cidades do estado
+- GET  detalhe-imovel.asp          -> página de detalhe de um imóvel
+
+Latência e falhas são configuráveis (``latencia``, ``taxa_falhas``), para
+benchmarks (``scripts/benchmark``) próximos das condições do site real.
+
+Uso:
+    python scripts/testes/servidor_caixa_local.py --porta 8765 --imoveis 45 --latencia 0.2
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+CIDADES_PADRAO = {
+    "SC": {"8690": "JOINVILLE", "8621": "FLORIANOPOLIS", "8545": "BLUMENAU"},
+    "DF": {"1809": "BRASILIA", "1835": "TAGUATINGA"},
+}
+
+# Carregador do Radware (aperture.js), presente também nas páginas normais do site:
+# não deve ser tratado como bloqueio
+SCRIPT_APERTURE = '<script src="https://cdn.perfdrive.com/aperture/aperture.js"></script>'
+
+# Formulário de busca em passos: estado -> cidades (XHR) -> "Próximo" -> filtros
+# -> "Próximo" -> resultados (XHR), com links numéricos de paginação
+PAGINA_BUSCA = """<!DOCTYPE html>
+<html><head><meta charset="iso-8859-1"><title>Busca de imóveis</title>
+{aperture}</head>
+<body>
+<form id="frmBusca" onsubmit="return false;">
+  <div id="passo0">
+    <select id="cmb_estado" name="cmb_estado"><option value="">Selecione</option>{estados}</select>
+    <select id="cmb_cidade" name="cmb_cidade"><option value="">Selecione</option></select>
+    <button type="button" id="btn_next0" onclick="proximoPasso()">Próximo</button>
+  </div>
+  <div id="passo1" style="display:none">
+    <select id="cmb_tp_imovel"><option value="">Indiferente</option><option value="1">Casa</option>
+      <option value="2">Apartamento</option><option value="4">Indiferente</option></select>
+    <select id="cmb_quartos"><option value="">Indiferente</option><option value="1">1</option>
+      <option value="2">2</option><option value="3">3</option><option value="4">4+</option></select>
+    <select id="cmb_faixa_vlr"><option value="">Indiferente</option><option value="1">1</option>
+      <option value="2">2</option><option value="3">3</option><option value="4">4</option>
+      <option value="5">5</option><option value="6">6</option><option value="7">7</option></select>
+    <button type="button" id="btn_next1" onclick="pesquisar()">Próximo</button>
+  </div>
+</form>
+<div id="listaimoveispaginacao"></div>
+<div id="listaimoveis"></div>
+<div id="paginacao"></div>
+<script>
+function enviar(url, corpo, concluir) {{
+    var xhr = new XMLHttpRequest();
+    xhr.open('POST', url, true);
+    xhr.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+    xhr.onload = function () {{ concluir(xhr.responseText); }};
+    xhr.send(corpo);
+}}
+function valor(id) {{ return encodeURIComponent(document.getElementById(id).value); }}
+document.getElementById('cmb_estado').onchange = function () {{
+    enviar('carregaListaCidades.asp', 'cmb_estado=' + valor('cmb_estado'), function (html) {{
+        document.getElementById('cmb_cidade').innerHTML = html;
+    }});
+}};
+function proximoPasso() {{ document.getElementById('passo1').style.display = 'block'; }}
+function pesquisar() {{
+    var corpo = 'hdn_estado=' + valor('cmb_estado') + '&hdn_cidade=' + valor('cmb_cidade') +
+        '&hdn_tp_imovel=' + valor('cmb_tp_imovel') + '&hdn_quartos=' + valor('cmb_quartos') +
+        '&hdn_faixa_vlr=' + valor('cmb_faixa_vlr');
+    enviar('carregaPesquisaImoveis.asp', corpo, function (html) {{
+        document.getElementById('listaimoveispaginacao').innerHTML = html;
+        var qtd = parseInt(document.getElementById('hdnQtdPag').value, 10);
+        var links = '';
+        for (var n = 1; n <= qtd; n++) {{
+            links += '<a href="javascript:;" onclick="carregaListaImoveis(' + n + ')">' + n + '</a> ';
+        }}
+        document.getElementById('paginacao').innerHTML = links;
+        if (qtd) {{ carregaListaImoveis(1); }}
+        else {{ document.getElementById('listaimoveis').innerHTML = '<div>Nenhum resultado encontrado</div>'; }}
+    }});
+}}
+function carregaListaImoveis(pagina) {{
+    var ids = document.getElementById('hdnImov' + pagina).value;
+    enviar('carregaListaImoveis.asp', 'hdnImov=' + encodeURIComponent(ids), function (html) {{
+        document.getElementById('listaimoveis').innerHTML = html;
+    }});
+}}
+</script>
+</body></html>"""
+
+PAGINA_BLOQUEIO = """<html><head><title>Radware Bot Manager Captcha</title>
+<script src="https://cdn.perfdrive.com/aperture/aperture.js"></script></head>
+<body>Radware Bot Manager</body></html>"""
+
+
+def gerar_imovel_html(id_imovel: str, numero: int) -> str:
+    """Gera o bloco de um imóvel no formato da lista de resultados."""
+    valor = f"{150000 + numero * 1000:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"""
+<li class="group-block-item">
+  <div class="fotoimovel-col1"><img class="fotoimovel" src="/fotos/F{id_imovel}21.jpg"></div>
+  <div class="dadosimovel-col2">
+    <ul class="form-set inside-set no-bullets">
+      <li><a href="javascript:;" onclick="javascript:detalhe_imovel({id_imovel});">
+        <strong>JOINVILLE - RESIDENCIAL TESTE {numero} APTO {100 + numero} | R$ {valor}</strong></a></li>
+      <li><span>Apartamento - {2 + numero % 2} quarto(s)</span></li>
+      <li><span>Rua das Flores, {numero}, Centro - CEP 89201-000</span></li>
+    </ul>
+  </div>
+</li>"""
+
+
+class CatalogoLocal:
+    """Conjunto fixo de imóveis servido pelo servidor local."""
+
+    def __init__(self, total_imoveis: int = 45, por_pagina: int = 20) -> None:
+        self.ids = [f"{1444400000000 + i}" for i in range(1, total_imoveis + 1)]
+        self.por_pagina = por_pagina
+
+    def paginas(self) -> List[List[str]]:
+        return [self.ids[i:i + self.por_pagina] for i in range(0, len(self.ids), self.por_pagina)]
+
+    def resposta_pesquisa(self) -> str:
+        campos = "\n".join(
+            f'<input type="hidden" name="hdnImov{n}" id="hdnImov{n}" value="{"||".join(ids)}">'
+            for n, ids in enumerate(self.paginas(), 1)
+        )
+        return f'{campos}\n<input type="hidden" id="hdnQtdPag" value="{len(self.paginas())}">'
+
+    def resposta_detalhe(self, id_imovel: str) -> str:
+        if id_imovel not in self.ids:
+            return "<div>Imóvel não encontrado</div>"
+        numero = self.ids.index(id_imovel) + 1
+        return (
+            f'{SCRIPT_APERTURE}<div id="dadosImovel"><h5>RESIDENCIAL TESTE {numero} APTO {100 + numero}</h5>'
+            f"<p>Número do imóvel: {id_imovel}</p>{gerar_imovel_html(id_imovel, numero)}</div>"
+        )
+
+    def resposta_lista(self, ids: List[str]) -> str:
+        if not ids:
+            return "<div>Nenhum resultado encontrado</div>"
+        itens = "".join(gerar_imovel_html(i, self.ids.index(i) + 1) for i in ids if i in self.ids)
+        return f'{SCRIPT_APERTURE}<ul class="control-group no-bullets">{itens}</ul>'
+
+
+class ServidorCaixaLocal:
+    """
+    Servidor HTTP em thread, para uso em scripts de teste.
+
+    Examples:
+        >>> with ServidorCaixaLocal() as servidor:
+        ...     config = ScraperConfig(search_engine="http", site_url=servidor.url)
+    """
+
+    def __init__(
+        self,
+        porta: int = 0,
+        catalogo: Optional[CatalogoLocal] = None,
+        cidades: Optional[Dict[str, Dict[str, str]]] = None,
+        bloquear: bool = False,
+        latencia: float = 0.0,
+        taxa_falhas: float = 0.0,
+        semente: int = 0,
+    ) -> None:
+        """
+        Args:
+            porta: Porta (0: qualquer porta livre)
+            catalogo: Imóveis servidos (os mesmos para todas as cidades)
+            cidades: Estado -> {código: nome}
+            bloquear: Responder tudo com a página de bloqueio do bot manager
+            latencia: Segundos de espera antes de cada resposta
+            taxa_falhas: Fração das requisições POST respondidas com HTTP 503
+            semente: Semente do sorteio das falhas (execuções reprodutíveis)
+        """
+        self.catalogo = catalogo or CatalogoLocal()
+        self.cidades = cidades or CIDADES_PADRAO
+        self.bloquear = bloquear
+        self.latencia = latencia
+        self.taxa_falhas = taxa_falhas
+        self.requisicoes: List[str] = []
+        self.falhas = 0
+        self._sorteio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), self._criar_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._servidor.server_address[1]}/sistema/"
+
+    def iniciar(self) -> "ServidorCaixaLocal":
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self) -> None:
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self) -> "ServidorCaixaLocal":
+        return self.iniciar()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.parar()
+
+    def _falhar(self) -> bool:
+        """Sorteia se a requisição atual deve falhar."""
+        if self.taxa_falhas <= 0:
+            return False
+        with self._trava:
+            falhar = self._sorteio.random() < self.taxa_falhas
+            self.falhas += falhar
+        return falhar
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _responder(self, corpo: str, status: int = 200) -> None:
+                dados = corpo.encode("iso-8859-1", errors="replace")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(dados)))
+                self.send_header("Set-Cookie", "ASPSESSIONIDLOCAL=teste; path=/")
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def _rota(self) -> str:
+                rota = urlparse(self.path).path.rsplit("/", 1)[-1]
+                servidor.requisicoes.append(f"{self.command} {rota}")
+                if servidor.latencia > 0:
+                    time.sleep(servidor.latencia)
+                return rota
+
+            def do_GET(self):
+                rota = self._rota()
+                if servidor.bloquear:
+                    return self._responder(PAGINA_BLOQUEIO)
+                if rota == "busca-imovel.asp":
+                    opcoes = "".join(f'<option value="{uf}">{uf}</option>' for uf in servidor.cidades)
+                    return self._responder(PAGINA_BUSCA.format(estados=opcoes, aperture=SCRIPT_APERTURE))
+                if rota == "detalhe-imovel.asp":
+                    parametros = parse_qs(urlparse(self.path).query)
+                    id_imovel = (parametros.get("hdnimovel") or [""])[0]
+                    return self._responder(servidor.catalogo.resposta_detalhe(id_imovel))
+                self._responder("Not Found", 404)
+
+            def do_POST(self):
+                rota = self._rota()
+                tamanho = int(self.headers.get("Content-Length") or 0)
+                campos = {k: v[0] for k, v in parse_qs(self.rfile.read(tamanho).decode("latin-1")).items()}
+
+                if servidor.bloquear:
+                    return self._responder(PAGINA_BLOQUEIO)
+                if servidor._falhar():
+                    return self._responder("Service Unavailable", 503)
+                if rota == "carregaPesquisaImoveis.asp":
+                    return self._responder(servidor.catalogo.resposta_pesquisa())
+                if rota == "carregaListaImoveis.asp":
+                    ids = [i for i in campos.get("hdnImov", "").split("||") if i]
+                    return self._responder(servidor.catalogo.resposta_lista(ids))
+                if rota == "carregaListaCidades.asp":
+                    cidades = servidor.cidades.get(campos.get("cmb_estado", ""), {})
+                    opcoes = "".join(f'<option value="{c}">{n}</option>' for c, n in cidades.items())
+                    return self._responder(f'<option value="">Selecione</option>{opcoes}')
+                self._responder("Not Found", 404)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita o site da Caixa")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--imoveis", type=int, default=45)
+    parser.add_argument("--por-pagina", type=int, default=20)
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos antes de cada resposta")
+    parser.add_argument("--falhas", type=float, default=0.0, help="fração de POSTs respondidos com 503")
+    args = parser.parse_args()
+
+    servidor = ServidorCaixaLocal(
+        args.porta,
+        CatalogoLocal(args.imoveis, args.por_pagina),
+        latencia=args.latencia,
+        taxa_falhas=args.falhas,
+    )
+    print(f"🌐 Servidor local em {servidor.url} (Ctrl+C para sair)")
+    try:
+        servidor._servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor._servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
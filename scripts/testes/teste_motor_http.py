@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testa o motor de busca HTTP contra o servidor local (sem internet)
+
+Uso:
+    python scripts/testes/teste_motor_http.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from scraper_caixa import CatalogoCidades, HttpSearchEngine, NavigationError, ScraperConfig
+from servidor_caixa_local import CatalogoLocal, ServidorCaixaLocal
+
+FILTROS = {
+    'estado': 'SC',
+    'codigo_cidade': '8690',
+    'nome_cidade': 'JOINVILLE',
+    'tipo_imovel': '4',
+    'faixa_valor': None,
+    'quartos': None,
+}
+
+
+def testar_busca_paginada():
+    """Busca com 3 páginas deve retornar todos os imóveis, na ordem"""
+    with ServidorCaixaLocal(catalogo=CatalogoLocal(total_imoveis=45, por_pagina=20)) as servidor:
+        with HttpSearchEngine(ScraperConfig(search_engine="http", site_url=servidor.url)) as motor:
+            imoveis = motor.buscar(FILTROS)
+
+    assert len(imoveis) == 45, f"esperados 45 imóveis, obtidos {len(imoveis)}"
+    assert [im['pagina'] for im in imoveis].count(3) == 5
+    assert imoveis[0]['id_imovel'] == '1444400000001'
+    assert imoveis[0]['valor'] == '151.000,00', imoveis[0]['valor']
+    assert imoveis[0]['url_imagem'].startswith(servidor.url.split('/sistema')[0])
+    assert servidor.requisicoes[:2] == ['GET busca-imovel.asp', 'POST carregaPesquisaImoveis.asp']
+    assert servidor.requisicoes.count('POST carregaListaImoveis.asp') == 3
+    print(f"✅ Busca paginada: {len(imoveis)} imóveis em 3 páginas")
+
+
+def testar_sem_resultados():
+    """Busca sem imóveis deve retornar lista vazia sem carregar páginas"""
+    with ServidorCaixaLocal(catalogo=CatalogoLocal(total_imoveis=0)) as servidor:
+        with HttpSearchEngine(ScraperConfig(search_engine="http", site_url=servidor.url)) as motor:
+            imoveis = motor.buscar(FILTROS)
+
+    assert imoveis == []
+    assert 'POST carregaListaImoveis.asp' not in servidor.requisicoes
+    print("✅ Busca sem resultados")
+
+
+def testar_bloqueio():
+    """Página do bot manager deve virar NavigationError"""
+    with ServidorCaixaLocal(bloquear=True) as servidor:
+        with HttpSearchEngine(ScraperConfig(search_engine="http", site_url=servidor.url)) as motor:
+            try:
+                motor.buscar(FILTROS)
+            except NavigationError as e:
+                print(f"✅ Bloqueio detectado: {e}")
+                return
+    raise AssertionError("NavigationError não levantado")
+
+
+def testar_catalogo_cidades():
+    """Catálogo deve consultar carregaListaCidades.asp uma vez e depois usar o cache"""
+    with ServidorCaixaLocal() as servidor:
+        config = ScraperConfig(site_url=servidor.url, cache_dir=tempfile.mkdtemp())
+        with CatalogoCidades(config) as catalogo:
+            assert catalogo.codigo_valido('SC', '8690') is None  # ainda sem cache
+            todos = catalogo.atualizar()
+            assert set(todos) == {'SC', 'DF'}
+            assert catalogo.cidades('SC')['8690'] == 'JOINVILLE'
+            assert catalogo.codigo_valido('SC', '8690') is True
+            assert catalogo.codigo_valido('SC', '0000') is False
+
+    assert servidor.requisicoes.count('POST carregaListaCidades.asp') == 2
+    print(f"✅ Catálogo de cidades: {sum(len(c) for c in todos.values())} cidades em cache")
+
+
+def main():
+    print("🧪 Testando motor HTTP contra servidor local...")
+    testes = [testar_busca_paginada, testar_sem_resultados, testar_bloqueio, testar_catalogo_cidades]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except Exception as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e!r}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    return falhas == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -12,7 +12,12 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import os
+import sys
+
+# Caminho do ChromeDriver resolvido com cache (src/scraper_caixa/resolvedor.py)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from scraper_caixa.resolvedor import resolver_chromedriver
 
 def setup_driver():
     """Configura o driver do Chrome com opções de debug"""
@@ -27,7 +32,7 @@ def setup_driver():
     chrome_options.add_argument("--disable-web-security")
     chrome_options.add_argument("--allow-running-insecure-content")
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(resolver_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
 
@@ -12,16 +12,28 @@ __author__ = "Rafael Fontes"
 __email__ = "rafael.a.fontes@hotmail.com"
 
 # Imports principais
+from .cidades import CatalogoCidades
 from .config import ScraperConfig, ESTADOS_CIDADES, TIPOS_IMOVEL
+from .diff import Delta, calcular_delta
 from .driver import configurar_chromedriver
 from .exceptions import (
     ScraperError,
     ChromeDriverError,
     NavigationError,
+    BuscaInterrompida,
     ElementNotFoundError,
     DataExtractionError,
 )
+from .html_parser import extrair_imoveis_do_html
+from .http_engine import HttpSearchEngine
 from .logger import get_logger, setup_logger
+from .metricas_driver import ContadorComandos, instrumentar_driver, obter_contador_comandos
+from .orquestrador import OrquestradorBuscas, ResultadoCidade
+from .pool import DriverPool
+from .rastreamento import Rastreador, obter_rastreador
+from .rate_limit import RateLimiter, obter_rate_limiter
+from .resolvedor import resolver_chromedriver
+from .store import ListingStore
 from .types import FiltrosBusca, DadosImovel, ResultadoBusca
 
 __all__ = [
@@ -31,14 +43,35 @@ __all__ = [
     "ScraperConfig",
     "ESTADOS_CIDADES",
     "TIPOS_IMOVEL",
+    "CatalogoCidades",
     # Driver
     "configurar_chromedriver",
+    "resolver_chromedriver",
+    "DriverPool",
+    "HttpSearchEngine",
+    "RateLimiter",
+    "obter_rate_limiter",
     # Exceptions
     "ScraperError",
     "ChromeDriverError",
     "NavigationError",
+    "BuscaInterrompida",
     "ElementNotFoundError",
     "DataExtractionError",
+    # Armazenamento
+    "ListingStore",
+    "Delta",
+    "calcular_delta",
+    # Execução
+    "OrquestradorBuscas",
+    "ResultadoCidade",
+    "Rastreador",
+    "obter_rastreador",
+    "ContadorComandos",
+    "instrumentar_driver",
+    "obter_contador_comandos",
+    # Extração
+    "extrair_imoveis_do_html",
     # Logger
     "get_logger",
     "setup_logger",
@@ -0,0 +1,196 @@
+"""
+Bloqueio de recursos desnecessários no Chrome.
+
+As páginas de busca só precisam do HTML e das chamadas XHR; fotos dos
+imóveis, fontes, mídia e scripts de terceiros (analytics) são bloqueados
+por preferência do Chrome (imagens) e pelo CDP (``Network.setBlockedURLs``).
+O tráfego de cada página é medido pelo log de performance do ChromeDriver.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .config import ScraperConfig
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Padrões de URL bloqueados por categoria da política (``block_resources``).
+# A categoria "analytics" usa os domínios de ``blocked_domains``.
+EXTENSOES_BLOQUEIO = {
+    "imagens": ("jpg", "jpeg", "png", "gif", "webp", "bmp", "ico", "svg"),
+    "fontes": ("woff", "woff2", "ttf", "otf", "eot"),
+    "midia": ("mp4", "webm", "ogg", "mp3", "wav", "avi"),
+}
+CATEGORIAS_BLOQUEIO = frozenset(EXTENSOES_BLOQUEIO) | {"analytics"}
+
+
+def padroes_bloqueados(config: ScraperConfig) -> List[str]:
+    """
+    Monta os padrões de ``Network.setBlockedURLs`` para a política configurada.
+
+    Args:
+        config: Configuração do scraper (``block_resources`` e ``blocked_domains``)
+
+    Returns:
+        Padrões com curinga ``*`` (XHR e documentos nunca são bloqueados)
+    """
+    padroes: List[str] = []
+    for categoria in config.block_resources:
+        if categoria not in CATEGORIAS_BLOQUEIO:
+            logger.warning(f"Categoria de bloqueio desconhecida: {categoria}")
+            continue
+        if categoria == "analytics":
+            padroes.extend(f"*://*{dominio}/*" for dominio in config.blocked_domains)
+            continue
+        for extensao in EXTENSOES_BLOQUEIO[categoria]:
+            padroes.extend((f"*.{extensao}", f"*.{extensao}?*"))
+    return padroes
+
+
+def aplicar_preferencias(chrome_options: Options, config: ScraperConfig) -> None:
+    """
+    Configura as opções do Chrome para a política de bloqueio.
+
+    Desativa o carregamento de imagens por preferência (o switch
+    ``--disable-images`` não existe no Chrome) e liga o log de performance
+    usado por ``medir_pagina``.
+
+    Args:
+        chrome_options: Opções do Chrome em construção
+        config: Configuração do scraper
+    """
+    if not config.block_resources:
+        return
+    if "imagens" in config.block_resources:
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def aplicar_bloqueio(driver: WebDriver, config: ScraperConfig) -> bool:
+    """
+    Ativa o bloqueio de URLs via CDP no driver.
+
+    Chamar de novo com o mesmo driver não reenvia os comandos.
+
+    Args:
+        driver: Instância do ChromeDriver
+        config: Configuração do scraper
+
+    Returns:
+        True se o bloqueio está ativo no driver
+    """
+    if getattr(driver, "_bloqueio_recursos", None) is not None:
+        return True
+
+    padroes = padroes_bloqueados(config)
+    if not padroes:
+        return False
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes})
+    except Exception as e:
+        logger.warning(f"Falha ao ativar bloqueio de recursos via CDP: {e}")
+        return False
+
+    driver._bloqueio_recursos = TrafegoBloqueio()
+    logger.debug(f"Bloqueio de recursos ativo: {', '.join(config.block_resources)} ({len(padroes)} padrões)")
+    return True
+
+
+class TrafegoBloqueio:
+    """Tráfego acumulado de um driver, por página medida."""
+
+    def __init__(self) -> None:
+        self.paginas: List[Dict[str, Any]] = []
+
+    def registrar(self, etapa: str, eventos: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Resume os eventos de rede de uma página.
+
+        Recursos bloqueados não chegam a ser baixados, então o tamanho deles
+        não é conhecido; a economia aparece comparando ``bytes`` com uma
+        execução sem bloqueio (``block_resources=()``).
+
+        Args:
+            etapa: Nome da página/etapa
+            eventos: Mensagens ``Network.*`` do log de performance
+
+        Returns:
+            Requisições, bytes transferidos e requisições bloqueadas
+        """
+        requisicoes = bytes_transferidos = bloqueadas = 0
+        for evento in eventos:
+            metodo, params = evento.get("method"), evento.get("params", {})
+            if metodo == "Network.requestWillBeSent":
+                requisicoes += 1
+            elif metodo == "Network.loadingFinished":
+                bytes_transferidos += int(params.get("encodedDataLength") or 0)
+            elif metodo == "Network.loadingFailed" and params.get("blockedReason"):
+                bloqueadas += 1
+
+        resumo = {
+            "etapa": etapa,
+            "requisicoes": requisicoes,
+            "bytes": bytes_transferidos,
+            "bloqueadas": bloqueadas,
+        }
+        self.paginas.append(resumo)
+        return resumo
+
+    def relatorio(self) -> str:
+        """Resume o tráfego de todas as páginas medidas."""
+        total = len(self.paginas)
+        bytes_totais = sum(p["bytes"] for p in self.paginas)
+        bloqueadas = sum(p["bloqueadas"] for p in self.paginas)
+        media = bytes_totais / total / 1024 if total else 0.0
+        return (
+            f"{total} páginas, {bytes_totais / 1024:.0f} KB transferidos "
+            f"({media:.0f} KB/página), {bloqueadas} requisições bloqueadas"
+        )
+
+
+def medir_pagina(driver: WebDriver, etapa: str) -> Optional[Dict[str, Any]]:
+    """
+    Registra o tráfego da página atual desde a última medição.
+
+    Lê (e esvazia) o log de performance do ChromeDriver.
+
+    Args:
+        driver: Driver com bloqueio ativo (ver aplicar_bloqueio)
+        etapa: Nome da página/etapa, para o log
+
+    Returns:
+        Resumo da página ou None se o driver não tem bloqueio/log de performance
+    """
+    trafego: Optional[TrafegoBloqueio] = getattr(driver, "_bloqueio_recursos", None)
+    if trafego is None:
+        return None
+
+    try:
+        entradas = driver.get_log("performance")
+    except Exception as e:
+        logger.debug(f"Log de performance indisponível: {e}")
+        return None
+
+    eventos = []
+    for entrada in entradas:
+        try:
+            mensagem = json.loads(entrada["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if mensagem.get("method", "").startswith("Network."):
+            eventos.append(mensagem)
+
+    resumo = trafego.registrar(etapa, eventos)
+    logger.info(
+        f"📦 {etapa}: {resumo['requisicoes']} requisições, {resumo['bytes'] / 1024:.0f} KB, "
+        f"{resumo['bloqueadas']} bloqueadas"
+    )
+    return resumo
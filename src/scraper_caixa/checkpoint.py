@@ -0,0 +1,256 @@
+"""
+Diário de execução para retomar buscas interrompidas.
+
+Cada execução do ``scraper_automatico.py`` grava um arquivo JSONL
+(``cache/execucoes/<run_id>.jsonl``), só com acréscimos, com um registro
+por evento:
+
+- ``inicio``: horário de início da execução;
+- ``pagina``: página de uma cidade já gravada no banco (ListingStore);
+- ``cidade``: cidade concluída, com total de imóveis e última página;
+- ``fim``: execução terminada (relatórios gerados).
+
+Cada registro é escrito com um único ``write`` em modo append seguido de
+``fsync``; uma linha cortada por queda do processo é ignorada na leitura.
+Ao retomar, as cidades concluídas voltam do banco sem nova busca e as
+interrompidas continuam a partir da página seguinte à última gravada.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import ScraperConfig
+from .logger import get_logger
+from .store import ListingStore
+from .types import FiltrosBusca
+
+logger = get_logger(__name__)
+
+ChaveCidade = Tuple[str, str]
+
+
+def _chave(filtros: FiltrosBusca) -> ChaveCidade:
+    return filtros["estado"], str(filtros["codigo_cidade"])
+
+
+class DiarioExecucao:
+    """
+    Diário append-only de uma execução.
+
+    Examples:
+        >>> diario = DiarioExecucao.retomar(config) or DiarioExecucao.novo(config)
+        >>> checkpoint = diario.cidade(filtros)
+        >>> imoveis = buscar_imoveis_com_filtros(filtros, checkpoint=checkpoint)
+        >>> diario.finalizar()
+    """
+
+    def __init__(self, caminho: Path, config: ScraperConfig) -> None:
+        """
+        Abre o diário (criando o arquivo na primeira gravação).
+
+        Args:
+            caminho: Arquivo ``<run_id>.jsonl``
+            config: Configuração do scraper (banco usado ao restaurar imóveis)
+        """
+        self.caminho = Path(caminho)
+        self.config = config
+        self.run_id = self.caminho.stem
+        self.inicio: Optional[str] = None
+        self.finalizado = False
+        self._paginas: Dict[ChaveCidade, Dict[int, int]] = {}
+        self._concluidas: Dict[ChaveCidade, Dict[str, Any]] = {}
+        self._trava = threading.Lock()
+
+        for registro in _ler_registros(self.caminho):
+            self._aplicar(registro)
+
+    @classmethod
+    def novo(cls, config: Optional[ScraperConfig] = None) -> "DiarioExecucao":
+        """
+        Cria o diário de uma nova execução.
+
+        Args:
+            config: Configuração do scraper (usa ``checkpoint_dir``)
+
+        Returns:
+            Diário com o registro de início gravado
+        """
+        config = config or ScraperConfig()
+        Path(config.checkpoint_dir).mkdir(parents=True, exist_ok=True)
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        diario = cls(Path(config.checkpoint_dir) / f"{run_id}.jsonl", config)
+        diario._registrar({"tipo": "inicio", "em": datetime.now().isoformat(timespec="seconds")})
+        logger.info(f"Diário da execução {diario.run_id}: {diario.caminho}")
+        return diario
+
+    @classmethod
+    def retomar(
+        cls, config: Optional[ScraperConfig] = None, run_id: Optional[str] = None
+    ) -> Optional["DiarioExecucao"]:
+        """
+        Abre o diário de uma execução anterior.
+
+        Args:
+            config: Configuração do scraper (usa ``checkpoint_dir``)
+            run_id: Execução a retomar. Se None, a mais recente não finalizada.
+
+        Returns:
+            Diário encontrado ou None
+        """
+        config = config or ScraperConfig()
+        diretorio = Path(config.checkpoint_dir)
+
+        if run_id:
+            caminho = diretorio / f"{run_id}.jsonl"
+            return cls(caminho, config) if caminho.exists() else None
+
+        for caminho in sorted(diretorio.glob("*.jsonl"), reverse=True):
+            diario = cls(caminho, config)
+            if diario.inicio and not diario.finalizado:
+                return diario
+        return None
+
+    def cidade(self, filtros: FiltrosBusca) -> "CheckpointCidade":
+        """Checkpoint de uma cidade desta execução."""
+        return CheckpointCidade(self, filtros)
+
+    def concluida(self, filtros: FiltrosBusca) -> Optional[Dict[str, Any]]:
+        """Registro de conclusão da cidade, ou None se ela não terminou."""
+        return self._concluidas.get(_chave(filtros))
+
+    def paginas_gravadas(self, filtros: FiltrosBusca) -> Dict[int, int]:
+        """Páginas já gravadas da cidade (página -> imóveis)."""
+        return dict(self._paginas.get(_chave(filtros), {}))
+
+    def resumo(self) -> str:
+        """Cidades concluídas e em andamento, para o log."""
+        em_andamento = sum(1 for chave in self._paginas if chave not in self._concluidas)
+        return f"{len(self._concluidas)} cidade(s) concluída(s), {em_andamento} em andamento"
+
+    def finalizar(self) -> None:
+        """Marca a execução como terminada."""
+        self._registrar({"tipo": "fim", "em": datetime.now().isoformat(timespec="seconds")})
+
+    def _registrar(self, registro: Dict[str, Any]) -> None:
+        """Acrescenta um registro ao arquivo (um write + fsync) e ao estado em memória."""
+        linha = (json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._trava:
+            fd = os.open(self.caminho, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, linha)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._aplicar(registro)
+
+    def _aplicar(self, registro: Dict[str, Any]) -> None:
+        tipo = registro.get("tipo")
+        if tipo == "inicio":
+            self.inicio = registro.get("em")
+        elif tipo == "fim":
+            self.finalizado = True
+        elif tipo == "pagina":
+            chave = (registro["estado"], str(registro["codigo_cidade"]))
+            self._paginas.setdefault(chave, {})[int(registro["pagina"])] = int(registro["imoveis"])
+        elif tipo == "cidade":
+            self._concluidas[(registro["estado"], str(registro["codigo_cidade"]))] = registro
+
+
+class CheckpointCidade:
+    """Progresso de uma cidade no diário."""
+
+    def __init__(self, diario: DiarioExecucao, filtros: FiltrosBusca) -> None:
+        self.diario = diario
+        self.filtros = filtros
+        paginas = diario.paginas_gravadas(filtros)
+        # Retoma após a maior página contígua gravada (a gravação é em ordem)
+        ultima = 0
+        while ultima + 1 in paginas:
+            ultima += 1
+        self.pagina_inicial = ultima + 1
+        self.imoveis_anteriores = sum(paginas[n] for n in range(1, ultima + 1))
+        self.erro: Optional[str] = None
+
+    def pagina_gravada(self, numero_pagina: int, quantidade: int) -> None:
+        """Registra uma página já gravada no banco."""
+        self.diario._registrar({
+            "tipo": "pagina",
+            "estado": self.filtros["estado"],
+            "codigo_cidade": str(self.filtros["codigo_cidade"]),
+            "pagina": numero_pagina,
+            "imoveis": quantidade,
+        })
+
+    def interromper(self, erro: str) -> None:
+        """Marca a busca como interrompida: a cidade não será dada como concluída."""
+        self.erro = erro
+
+    def concluir(self, imoveis: int, ultima_pagina: int) -> None:
+        """
+        Registra a cidade como concluída, se a busca não foi interrompida.
+
+        Args:
+            imoveis: Imóveis encontrados nesta busca (as páginas retomadas são somadas)
+            ultima_pagina: Última página alcançada
+        """
+        if self.erro is not None:
+            logger.info(f"{self.filtros['nome_cidade']}/{self.filtros['estado']} interrompida; não marcada como concluída")
+            return
+        self.diario._registrar({
+            "tipo": "cidade",
+            "estado": self.filtros["estado"],
+            "codigo_cidade": str(self.filtros["codigo_cidade"]),
+            "nome_cidade": self.filtros["nome_cidade"],
+            "imoveis": self.imoveis_anteriores + imoveis,
+            "ultima_pagina": max(ultima_pagina, self.pagina_inicial - 1),
+            "em": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    def imoveis_gravados(self, ate_pagina: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Imóveis da cidade gravados no banco durante esta execução.
+
+        Args:
+            ate_pagina: Só as páginas até esta (inclusive). Se None, todas.
+
+        Returns:
+            Imóveis no schema de extrair_dados_imovel, na ordem das páginas
+        """
+        with ListingStore(config=self.diario.config) as store:
+            linhas = store.consultar(
+                estado=self.filtros["estado"],
+                cidade=self.filtros["nome_cidade"],
+                vistos_desde=self.diario.inicio,
+            )
+
+        imoveis = []
+        for linha in linhas:
+            if linha["codigo_cidade"] not in (None, str(self.filtros["codigo_cidade"])):
+                continue
+            try:
+                imovel = json.loads(linha["dados"])
+            except (TypeError, ValueError):
+                continue
+            if ate_pagina is None or int(imovel.get("pagina") or 0) <= ate_pagina:
+                imoveis.append(imovel)
+        imoveis.sort(key=lambda imovel: int(imovel.get("pagina") or 0))
+        return imoveis
+
+
+def _ler_registros(caminho: Path) -> List[Dict[str, Any]]:
+    """Lê os registros do diário, ignorando linhas incompletas."""
+    registros = []
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    registros.append(json.loads(linha))
+                except ValueError:
+                    logger.warning(f"Linha inválida ignorada em {caminho.name}")
+    except FileNotFoundError:
+        pass
+    return registros
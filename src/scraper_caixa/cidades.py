@@ -0,0 +1,192 @@
+"""
+Catálogo de cidades por estado com cache em disco.
+
+As opções de ``cmb_cidade`` vêm de ``carregaListaCidades.asp``. Em vez
+de abrir um Chrome por estado para ler o select, o catálogo consulta o
+endpoint pela sessão HTTP do ``HttpSearchEngine`` e guarda o resultado
+em um arquivo JSON por estado, válido por ``cidades_cache_ttl`` segundos.
+"""
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .config import ScraperConfig
+from .http_engine import HttpSearchEngine
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CatalogoCidades:
+    """
+    Cidades disponíveis por estado, com cache TTL em disco.
+
+    Examples:
+        >>> catalogo = CatalogoCidades()
+        >>> catalogo.cidades("SC")["8690"]
+        'JOINVILLE'
+        >>> catalogo.codigo_valido("SC", "8690")
+        True
+    """
+
+    def __init__(
+        self,
+        config: Optional[ScraperConfig] = None,
+        motor: Optional[HttpSearchEngine] = None,
+    ) -> None:
+        """
+        Inicializa o catálogo (sem acessar a rede).
+
+        Args:
+            config: Configuração do scraper. Se None, usa configuração padrão.
+            motor: Motor HTTP cuja sessão será usada. Se None, cria um quando necessário.
+        """
+        self.config = config or ScraperConfig()
+        self.ttl = float(self.config.cidades_cache_ttl)
+        self.diretorio = Path(self.config.cache_dir)
+        self._motor = motor
+        self._motor_proprio = motor is None
+
+    @property
+    def motor(self) -> HttpSearchEngine:
+        """Motor HTTP usado nas consultas (criado sob demanda)."""
+        if self._motor is None:
+            self._motor = HttpSearchEngine(self.config)
+        return self._motor
+
+    def cidades(self, estado: str, forcar: bool = False) -> Dict[str, str]:
+        """
+        Retorna as cidades do estado, do cache se ainda válido.
+
+        Args:
+            estado: Sigla do estado
+            forcar: Se deve ignorar o cache e consultar o site
+
+        Returns:
+            Dicionário código -> nome da cidade
+
+        Raises:
+            NavigationError: Se a consulta ao site falhar
+        """
+        if not forcar:
+            em_cache = self.em_cache(estado)
+            if em_cache is not None:
+                return em_cache
+
+        inicio = time.monotonic()
+        cidades = self.motor.listar_cidades(estado)
+        logger.info(f"{len(cidades)} cidades de {estado} em {time.monotonic() - inicio:.2f}s")
+
+        if cidades:
+            self._salvar(estado, cidades)
+        return cidades
+
+    def em_cache(self, estado: str) -> Optional[Dict[str, str]]:
+        """
+        Retorna as cidades do estado somente se houver cache válido.
+
+        Args:
+            estado: Sigla do estado
+
+        Returns:
+            Dicionário código -> nome, ou None se não há cache ou expirou
+        """
+        try:
+            with open(self._arquivo(estado), encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - dados.get("atualizado_em", 0) > self.ttl:
+            return None
+        return dados.get("cidades") or None
+
+    def codigo_valido(self, estado: str, codigo_cidade: str) -> Optional[bool]:
+        """
+        Verifica o código da cidade contra o cache, sem acessar a rede.
+
+        Args:
+            estado: Sigla do estado
+            codigo_cidade: Código da cidade (valor de ``cmb_cidade``)
+
+        Returns:
+            True/False se o estado está no cache; None se não há cache válido
+        """
+        cidades = self.em_cache(estado)
+        if cidades is None:
+            return None
+        return codigo_cidade in cidades
+
+    def atualizar(
+        self,
+        estados: Optional[Iterable[str]] = None,
+        max_workers: int = 4,
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Atualiza o cache de vários estados em paralelo na mesma sessão.
+
+        Estados que falharem são registrados no log e ficam de fora do resultado.
+
+        Args:
+            estados: Siglas a atualizar. Se None, usa todos os estados do site.
+            max_workers: Número de requisições simultâneas
+
+        Returns:
+            Dicionário estado -> {código: nome}
+        """
+        estados = list(estados) if estados is not None else list(self.motor.listar_estados())
+        inicio = time.monotonic()
+
+        def _consultar(estado: str) -> Optional[Dict[str, str]]:
+            try:
+                return self.cidades(estado, forcar=True)
+            except Exception as e:
+                logger.warning(f"Falha ao atualizar cidades de {estado}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            resultados = dict(zip(estados, executor.map(_consultar, estados)))
+
+        catalogo = {estado: cidades for estado, cidades in resultados.items() if cidades}
+        logger.info(
+            f"Catálogo atualizado: {len(catalogo)}/{len(estados)} estados, "
+            f"{sum(len(c) for c in catalogo.values())} cidades em {time.monotonic() - inicio:.2f}s"
+        )
+        return catalogo
+
+    def fechar(self) -> None:
+        """Encerra a sessão HTTP, se foi criada pelo catálogo."""
+        if self._motor_proprio and self._motor is not None:
+            self._motor.fechar()
+            self._motor = None
+
+    def __enter__(self) -> "CatalogoCidades":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.fechar()
+
+    def _arquivo(self, estado: str) -> Path:
+        return self.diretorio / f"cidades_{estado.upper()}.json"
+
+    def _salvar(self, estado: str, cidades: Dict[str, str]) -> None:
+        """Grava o cache do estado de forma atômica (arquivo temporário + replace)."""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        dados = {"estado": estado, "atualizado_em": time.time(), "cidades": cidades}
+
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(dados, f, ensure_ascii=False, indent=2)
+            os.replace(temporario, self._arquivo(estado))
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o cache de {estado}: {e}")
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
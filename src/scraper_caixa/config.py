@@ -6,11 +6,18 @@ seguindo as boas práticas de separar configs de código.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 # URLs e constantes
 URL_BASE = "https://venda-imoveis.caixa.gov.br/sistema/busca-imovel.asp?sltTipoBusca=imoveis"
+SITE_URL = "https://venda-imoveis.caixa.gov.br/sistema/"
+
+# Endpoints do backend (relativos a SITE_URL), usados pelo motor HTTP
+ENDPOINT_BUSCA = "busca-imovel.asp"
+ENDPOINT_PESQUISA_IMOVEIS = "carregaPesquisaImoveis.asp"
+ENDPOINT_LISTA_IMOVEIS = "carregaListaImoveis.asp"
+ENDPOINT_LISTA_CIDADES = "carregaListaCidades.asp"
 
 # Configurações do Chrome
 CHROME_OPTIONS = [
@@ -21,7 +28,6 @@ CHROME_OPTIONS = [
     "--disable-blink-features=AutomationControlled",
     "--disable-extensions",
     "--disable-plugins",
-    "--disable-images",
     "--disable-web-security",
     "--allow-running-insecure-content",
     "--disable-features=VizDisplayCompositor",
@@ -33,6 +39,10 @@ CHROME_EXPERIMENTAL_OPTIONS = {
     "useAutomationExtension": False,
 }
 
+# ChromeDriver pré-instalado (usado sem rede) e executáveis do Chrome, em ordem de preferência
+CHROMEDRIVER_PATHS = ("/usr/bin/chromedriver", "/usr/local/bin/chromedriver")
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
@@ -43,6 +53,51 @@ DEFAULT_TIMEOUT = 30  # segundos
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # segundos
 PAGE_LOAD_DELAY = 3  # segundos
+PAGE_LOAD_STRATEGY = "eager"  # "normal", "eager" (DOM pronto) ou "none"
+WAIT_BUDGET = 180  # segundos somando todas as esperas de uma busca
+POLL_INTERVAL = 0.25  # segundos entre verificações de prontidão
+
+# Backend de extração: "lxml" (page_source), "js" (execute_script em lote)
+# ou "elementos" (WebElement a WebElement)
+EXTRACTION_BACKEND = "lxml"
+
+# Motor de busca: "selenium" (formulário no navegador) ou "http" (requests)
+SEARCH_ENGINE = "selenium"
+
+# Paginação: carregar a página N+1 enquanto a página N é extraída
+PREFETCH_PAGES = True
+
+# Páginas em espera entre extração, validação e gravação (0: tudo na mesma thread)
+PIPELINE_QUEUE_SIZE = 4
+
+# Cache do catálogo de cidades (carregaListaCidades.asp)
+CIDADES_CACHE_TTL = 24 * 3600  # segundos
+
+# Limite de taxa para o site da Caixa (token bucket compartilhado)
+RATE_LIMIT_RPS = 2.0  # requisições por segundo (0 desativa)
+RATE_LIMIT_BURST = 4  # requisições seguidas sem espera
+
+# Execução paralela de cidades
+MAX_WORKERS = 1
+CITY_TIMEOUT = 600  # segundos por cidade
+BATCH_BY_STATE = True  # cidades do mesmo estado em sequência, no mesmo navegador
+
+# Bloqueio de recursos no Chrome (categorias: imagens, fontes, midia, analytics)
+BLOCK_RESOURCES = ("imagens", "fontes", "midia", "analytics")
+# Domínios de terceiros bloqueados pela categoria "analytics" (só rastreadores).
+# O aperture.js do Radware (perfdrive.com) fica de fora: é a verificação do bot
+# manager, e sem ele o site pode passar a servir a página de bloqueio.
+BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+)
+
+# Pool de drivers
+POOL_SIZE = 1
+DRIVER_MAX_USES = 20  # empréstimos antes de reciclar o Chrome
 
 # Diretórios
 BASE_DIR = Path(__file__).parent.parent.parent
@@ -50,9 +105,15 @@ DATA_DIR = BASE_DIR / "dados_imoveis"
 SCREENSHOTS_DIR = BASE_DIR / "screenshots"
 REPORTS_DIR = BASE_DIR / "relatorios"
 LOGS_DIR = BASE_DIR / "logs"
+CACHE_DIR = BASE_DIR / "cache"
+RATE_LIMIT_FILE = CACHE_DIR / "rate_limit.sqlite"  # balde compartilhado entre processos
+STORE_FILE = DATA_DIR / "imoveis.sqlite"  # banco persistente de imóveis (ListingStore)
+CHROMEDRIVER_STATE_FILE = CACHE_DIR / "chromedriver.json"  # caminho/versão do driver resolvido
+SNAPSHOT_FILE = DATA_DIR / "snapshot_imoveis.json.gz"  # imóveis da última execução (diff)
+CHECKPOINT_DIR = CACHE_DIR / "execucoes"  # diários para retomar execuções (--resume)
 
 # Criar diretórios se não existirem
-for directory in [DATA_DIR, SCREENSHOTS_DIR, REPORTS_DIR, LOGS_DIR]:
+for directory in [DATA_DIR, SCREENSHOTS_DIR, REPORTS_DIR, LOGS_DIR, CACHE_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
 
@@ -65,14 +126,47 @@ class ScraperConfig:
     max_retries: int = MAX_RETRIES
     retry_delay: int = RETRY_DELAY
     page_load_delay: int = PAGE_LOAD_DELAY
+    page_load_strategy: str = PAGE_LOAD_STRATEGY
+    wait_budget: float = WAIT_BUDGET
+    poll_interval: float = POLL_INTERVAL
     save_screenshots: bool = True
-    save_json: bool = True
-    save_csv: bool = True
+    # Os imóveis são gravados em store_file; CSV/JSON por busca são opcionais
+    save_json: bool = False
+    save_csv: bool = False
+    extraction_backend: str = EXTRACTION_BACKEND
+    search_engine: str = SEARCH_ENGINE
+    site_url: str = SITE_URL
+    prefetch_pages: bool = PREFETCH_PAGES
+    pipeline_queue_size: int = PIPELINE_QUEUE_SIZE
+    cidades_cache_ttl: float = CIDADES_CACHE_TTL
+    
+    # Limite de taxa (None em rate_limit_file: balde só do processo atual)
+    rate_limit_rps: float = RATE_LIMIT_RPS
+    rate_limit_burst: float = RATE_LIMIT_BURST
+    rate_limit_file: Optional[Path] = field(default_factory=lambda: RATE_LIMIT_FILE)
+    
+    # Execução paralela de cidades
+    max_workers: int = MAX_WORKERS
+    city_timeout: float = CITY_TIMEOUT
+    batch_by_state: bool = BATCH_BY_STATE
+    
+    # Bloqueio de recursos (tupla vazia desativa; XHR nunca é bloqueado)
+    block_resources: Tuple[str, ...] = BLOCK_RESOURCES
+    blocked_domains: Tuple[str, ...] = BLOCKED_DOMAINS
+    
+    # Pool de drivers
+    pool_size: int = POOL_SIZE
+    driver_max_uses: int = DRIVER_MAX_USES
     
     # Diretórios de saída
     data_dir: Path = field(default_factory=lambda: DATA_DIR)
     screenshots_dir: Path = field(default_factory=lambda: SCREENSHOTS_DIR)
     reports_dir: Path = field(default_factory=lambda: REPORTS_DIR)
+    cache_dir: Path = field(default_factory=lambda: CACHE_DIR)
+    store_file: Path = field(default_factory=lambda: STORE_FILE)
+    snapshot_file: Path = field(default_factory=lambda: SNAPSHOT_FILE)
+    chromedriver_state_file: Path = field(default_factory=lambda: CHROMEDRIVER_STATE_FILE)
+    checkpoint_dir: Path = field(default_factory=lambda: CHECKPOINT_DIR)
     
 
 # Dicionário de estados e cidades
@@ -0,0 +1,231 @@
+"""
+Detecção de mudanças entre execuções.
+
+Compara os imóveis da execução atual com o snapshot da anterior por
+``id_imovel`` e valor, classificando-os em novos, removidos e com preço
+alterado. O snapshot é guardado em JSON compactado (gzip) com apenas os
+campos necessários para o relatório.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .logger import get_logger
+from .store import valor_numerico
+
+logger = get_logger(__name__)
+
+# Campos guardados no snapshot, na ordem da lista compacta de cada imóvel
+CAMPOS_SNAPSHOT = ("estado", "cidade", "valor", "nome_imovel", "link_direto")
+
+Registro = Dict[str, Any]
+Cidade = Tuple[str, str]
+
+
+@dataclass
+class Delta:
+    """Mudanças entre duas execuções."""
+
+    novos: List[Registro] = field(default_factory=list)
+    removidos: List[Registro] = field(default_factory=list)
+    preco_alterado: List[Tuple[Registro, Registro]] = field(default_factory=list)
+    inalterados: int = 0
+
+    @property
+    def vazio(self) -> bool:
+        """True se nada mudou."""
+        return not (self.novos or self.removidos or self.preco_alterado)
+
+    def resumo(self) -> str:
+        """Uma linha com a contagem de cada tipo de mudança."""
+        return (
+            f"{len(self.novos)} novos, {len(self.preco_alterado)} com preço alterado, "
+            f"{len(self.removidos)} removidos, {self.inalterados} sem alteração"
+        )
+
+    def por_cidade(self) -> Dict[Cidade, "Delta"]:
+        """Agrupa as mudanças por (estado, cidade), para o relatório."""
+        grupos: Dict[Cidade, Delta] = {}
+
+        def _grupo(registro: Registro) -> "Delta":
+            return grupos.setdefault((registro["estado"], registro["cidade"]), Delta())
+
+        for registro in self.novos:
+            _grupo(registro).novos.append(registro)
+        for registro in self.removidos:
+            _grupo(registro).removidos.append(registro)
+        for anterior, atual in self.preco_alterado:
+            _grupo(atual).preco_alterado.append((anterior, atual))
+        return grupos
+
+
+def registro_snapshot(imovel: Dict[str, Any], estado: str, cidade: str) -> Registro:
+    """
+    Reduz um imóvel aos campos do snapshot.
+
+    Args:
+        imovel: Imóvel no schema de extrair_dados_imovel
+        estado: Sigla do estado da busca
+        cidade: Nome da cidade da busca
+
+    Returns:
+        Registro com ``id_imovel`` e os campos de CAMPOS_SNAPSHOT
+    """
+    return {
+        "id_imovel": str(imovel["id_imovel"]),
+        "estado": estado,
+        "cidade": cidade.upper(),
+        "valor": imovel.get("valor") or "",
+        "nome_imovel": imovel.get("nome_imovel") or "",
+        "link_direto": imovel.get("link_direto") or "",
+    }
+
+
+def calcular_delta(
+    anterior: Dict[str, Registro],
+    atual: Iterable[Registro],
+    cidades_processadas: Optional[Set[Cidade]] = None,
+) -> Delta:
+    """
+    Classifica os imóveis da execução atual em relação ao snapshot anterior.
+
+    Usa o snapshot como índice por ``id_imovel`` (uma consulta de dicionário
+    por imóvel), então o custo é O(n) no total de imóveis.
+
+    Args:
+        anterior: Snapshot anterior (id_imovel -> registro)
+        atual: Registros da execução atual (ver registro_snapshot)
+        cidades_processadas: (estado, cidade) buscados com sucesso. Só imóveis
+            dessas cidades podem ser considerados removidos; se None, todas.
+
+    Returns:
+        Delta com novos, removidos e preços alterados
+    """
+    delta = Delta()
+    vistos: Set[str] = set()
+
+    for registro in atual:
+        id_imovel = registro["id_imovel"]
+        if id_imovel in vistos:
+            continue
+        vistos.add(id_imovel)
+
+        antigo = anterior.get(id_imovel)
+        if antigo is None:
+            delta.novos.append(registro)
+        elif _valor_mudou(antigo.get("valor"), registro.get("valor")):
+            delta.preco_alterado.append((antigo, registro))
+        else:
+            delta.inalterados += 1
+
+    for id_imovel, antigo in anterior.items():
+        if id_imovel in vistos:
+            continue
+        if cidades_processadas is None or (antigo["estado"], antigo["cidade"]) in cidades_processadas:
+            delta.removidos.append(antigo)
+
+    return delta
+
+
+def atualizar_snapshot(
+    anterior: Dict[str, Registro],
+    atual: Iterable[Registro],
+    cidades_processadas: Set[Cidade],
+) -> Dict[str, Registro]:
+    """
+    Monta o próximo snapshot.
+
+    Imóveis das cidades processadas são substituídos pelos atuais; os das
+    cidades que falharam continuam como estavam, para não aparecerem como
+    removidos nem como novos na próxima execução.
+
+    Args:
+        anterior: Snapshot anterior
+        atual: Registros da execução atual
+        cidades_processadas: (estado, cidade) buscados com sucesso
+
+    Returns:
+        Novo snapshot (id_imovel -> registro)
+    """
+    snapshot = {
+        id_imovel: registro
+        for id_imovel, registro in anterior.items()
+        if (registro["estado"], registro["cidade"]) not in cidades_processadas
+    }
+    for registro in atual:
+        snapshot[registro["id_imovel"]] = registro
+    return snapshot
+
+
+def carregar_snapshot(caminho: Path) -> Dict[str, Registro]:
+    """
+    Lê o snapshot compactado.
+
+    Args:
+        caminho: Arquivo ``.json.gz``
+
+    Returns:
+        Snapshot (id_imovel -> registro); vazio se o arquivo não existe ou é inválido
+    """
+    try:
+        with gzip.open(caminho, "rt", encoding="utf-8") as f:
+            dados = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Snapshot inválido em {caminho}: {e}")
+        return {}
+
+    return {
+        id_imovel: {"id_imovel": id_imovel, **dict(zip(CAMPOS_SNAPSHOT, valores))}
+        for id_imovel, valores in dados.get("imoveis", {}).items()
+    }
+
+
+def salvar_snapshot(caminho: Path, snapshot: Dict[str, Registro]) -> None:
+    """
+    Grava o snapshot compactado de forma atômica.
+
+    Cada imóvel é guardado como lista na ordem de CAMPOS_SNAPSHOT,
+    sem repetir os nomes dos campos.
+
+    Args:
+        caminho: Arquivo ``.json.gz``
+        snapshot: Snapshot (id_imovel -> registro)
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    dados = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "campos": CAMPOS_SNAPSHOT,
+        "imoveis": {
+            id_imovel: [registro.get(campo, "") for campo in CAMPOS_SNAPSHOT]
+            for id_imovel, registro in snapshot.items()
+        },
+    }
+
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as bruto, gzip.GzipFile(fileobj=bruto, mode="wb") as f:
+            f.write(json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
+
+
+def _valor_mudou(anterior: Any, atual: Any) -> bool:
+    """Compara valores numericamente, caindo para o texto se não forem números."""
+    numero_anterior, numero_atual = valor_numerico(anterior), valor_numerico(atual)
+    if numero_anterior is not None and numero_atual is not None:
+        return numero_anterior != numero_atual
+    return (anterior or "") != (atual or "")
@@ -5,15 +5,14 @@ Responsável por configurar o Selenium WebDriver com opções
 anti-detecção e gerenciamento robusto de erros.
 """
 
-import os
 from typing import Optional
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.remote.webdriver import WebDriver
-from webdriver_manager.chrome import ChromeDriverManager
 
+from .bloqueio import aplicar_bloqueio, aplicar_preferencias
 from .config import (
     CHROME_OPTIONS,
     CHROME_EXPERIMENTAL_OPTIONS,
@@ -22,16 +21,22 @@ from .config import (
 )
 from .exceptions import ChromeDriverError
 from .logger import get_logger
+from .metricas_driver import instrumentar_driver
+from .resolvedor import resolver_chromedriver
 
 logger = get_logger(__name__)
 
 
-def configurar_chrome_options(headless: bool = True) -> Options:
+def configurar_chrome_options(
+    headless: bool = True, config: Optional[ScraperConfig] = None
+) -> Options:
     """
     Configura as opções do Chrome.
     
     Args:
         headless: Se deve executar em modo headless (sem interface gráfica)
+        config: Configuração do scraper (política de bloqueio de recursos).
+            Se None, usa configuração padrão.
         
     Returns:
         Objeto Options configurado
@@ -59,6 +64,14 @@ def configurar_chrome_options(headless: bool = True) -> Options:
     for key, value in CHROME_EXPERIMENTAL_OPTIONS.items():
         chrome_options.add_experimental_option(key, value)
     
+    config = config or ScraperConfig()
+    
+    # "eager"/"none": driver.get não espera subrecursos; a prontidão vem dos probes de waits.py
+    chrome_options.page_load_strategy = config.page_load_strategy
+    
+    # Imagens bloqueadas por preferência e log de performance para medir o tráfego
+    aplicar_preferencias(chrome_options, config)
+    
     return chrome_options
 
 
@@ -88,7 +101,7 @@ def configurar_chromedriver(
     Configura e retorna uma instância do ChromeDriver.
     
     Tenta configurar o ChromeDriver usando múltiplas estratégias:
-    1. ChromeDriverManager (recomendado)
+    1. Driver resolvido por resolver_chromedriver (cache, driver local ou ChromeDriverManager)
     2. ChromeDriver do sistema
     3. Caminho manual para sistemas Unix
     
@@ -111,35 +124,33 @@ def configurar_chromedriver(
     
     logger.info("Iniciando configuração do ChromeDriver...")
     
-    chrome_options = configurar_chrome_options(headless=config.headless)
+    chrome_options = configurar_chrome_options(headless=config.headless, config=config)
     
-    # Tentativa 1: ChromeDriverManager
+    # Tentativa 1: driver resolvido (stat do cache; ChromeDriverManager só se a versão mudou)
     try:
-        logger.info("Tentando ChromeDriverManager...")
-        driver_path = ChromeDriverManager().install()
-        
-        if not os.path.isfile(driver_path):
-            raise ChromeDriverError(f"ChromeDriver não encontrado em: {driver_path}")
-        
-        logger.info(f"ChromeDriver encontrado em: {driver_path}")
+        driver_path = resolver_chromedriver(config)
         
         service = Service(driver_path)
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        instrumentar_driver(driver)
         
         remover_indicadores_automacao(driver)
+        aplicar_bloqueio(driver, config)
         
-        logger.info("✅ ChromeDriver configurado via ChromeDriverManager")
+        logger.info(f"✅ ChromeDriver configurado ({driver_path})")
         return driver
         
     except Exception as e:
-        logger.warning(f"ChromeDriverManager falhou: {e}")
+        logger.warning(f"Driver resolvido falhou: {e}")
     
     # Tentativa 2: ChromeDriver do sistema
     try:
         logger.info("Tentando ChromeDriver do sistema...")
         driver = webdriver.Chrome(options=chrome_options)
+        instrumentar_driver(driver)
         
         remover_indicadores_automacao(driver)
+        aplicar_bloqueio(driver, config)
         
         logger.info("✅ ChromeDriver configurado via sistema")
         return driver
@@ -152,8 +163,10 @@ def configurar_chromedriver(
         logger.info("Tentando caminho manual Unix...")
         service = Service("/usr/bin/chromedriver")
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        instrumentar_driver(driver)
         
         remover_indicadores_automacao(driver)
+        aplicar_bloqueio(driver, config)
         
         logger.info("✅ ChromeDriver configurado via caminho manual")
         return driver
@@ -23,6 +23,12 @@ class NavigationError(ScraperError):
     pass
 
 
+class BuscaInterrompida(NavigationError):
+    """Paginação interrompida: a busca devolveu só as páginas lidas."""
+    
+    pass
+
+
 class ElementNotFoundError(ScraperError):
     """Elemento HTML não encontrado na página."""
     
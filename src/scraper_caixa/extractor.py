@@ -6,9 +6,11 @@ e transformá-los em dados estruturados.
 """
 
 import re
-from typing import Optional, Dict, Any
+from html import unescape
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
 from .logger import get_logger
@@ -16,6 +18,55 @@ from .types import DadosImovel
 
 logger = get_logger(__name__)
 
+# Coleta, em uma única chamada ao chromedriver, os campos brutos de todos
+# os blocos de imóvel da página. Cada item corresponde a um nó do seletor.
+SCRIPT_EXTRACAO_LOTE = """
+var blocos = document.querySelectorAll(arguments[0]);
+var dados = [];
+for (var i = 0; i < blocos.length; i++) {
+    var bloco = blocos[i];
+    var link = bloco.querySelector("a[onclick*='detalhe_imovel']");
+    var img = bloco.querySelector("img.fotoimovel");
+    dados.push({
+        texto_link: link ? (link.innerText || '').trim() : null,
+        onclick: link ? (link.getAttribute('onclick') || '') : '',
+        url_imagem: img ? (img.src || '') : '',
+        texto_bloco: bloco.innerText || ''
+    });
+}
+return dados;
+"""
+
+_PADRAO_TITULO = re.compile(r'([^-]+) - (.+?) \| R\$ (.+)')
+_PADRAO_ID = re.compile(r'detalhe_imovel\((\d+)\)')
+
+# Fallback via regex: regiões em torno dos links detalhe_imovel(ID)
+_MARCADOR_DETALHE = "detalhe_imovel("
+_PADRAO_INICIO_LINK = re.compile(r'<a\s', re.IGNORECASE)
+# Fim do texto do link: </a> ou o fechamento do bloco (links sem </a>)
+_PADRAO_FIM_LINK = re.compile(r'</(?:a|li|div|p|td)\s*>', re.IGNORECASE)
+_PADRAO_TAG = re.compile(r'<[^>]*>')
+_PADRAO_ESPACOS = re.compile(r'[ \t\r\f\v]+')
+TAMANHO_MAXIMO_TAG = 500  # caracteres entre "<a" e o onclick
+TAMANHO_MAXIMO_REGIAO = 4000  # caracteres de um bloco de imóvel a partir do link
+
+# Padrões para extrair endereço
+_PADROES_ENDERECO = [
+    re.compile(r'Endereço[:\s]+([^\n]+)', re.IGNORECASE),
+    re.compile(r'Localização[:\s]+([^\n]+)', re.IGNORECASE),
+    re.compile(r'Bairro[:\s]+([^\n]+)', re.IGNORECASE),
+    re.compile(r'Rua[:\s]+([^\n]+)', re.IGNORECASE),
+    re.compile(r'Av[:\s]+([^\n]+)', re.IGNORECASE),
+]
+
+# Padrões para extrair quartos
+_PADROES_QUARTOS = [
+    re.compile(r'(\d+)\s*quarto', re.IGNORECASE),
+    re.compile(r'(\d+)\s*suíte', re.IGNORECASE),
+    re.compile(r'(\d+)\s*dormitório', re.IGNORECASE),
+    re.compile(r'(\d+)\s*bedroom', re.IGNORECASE),
+]
+
 
 def extrair_dados_imovel(elemento: WebElement) -> Optional[Dict[str, Any]]:
     """
@@ -39,51 +90,128 @@ def extrair_dados_imovel(elemento: WebElement) -> Optional[Dict[str, Any]]:
         )
         texto_completo = link_element.text.strip()
         
-        # Extrair informações usando regex
-        # Padrão: "CIDADE - NOME DO IMÓVEL | R$ VALOR"
-        match = re.search(r'([^-]+) - (.+?) \| R\$ (.+)', texto_completo)
-        
-        if not match:
+        if not _PADRAO_TITULO.search(texto_completo):
             logger.warning(f"Padrão não encontrado no texto: {texto_completo}")
             return None
         
-        cidade = match.group(1).strip()
-        nome_imovel = match.group(2).strip()
-        valor = match.group(3).strip()
-        
-        # Extrair ID do imóvel do onclick
-        onclick = link_element.get_attribute('onclick')
-        id_match = re.search(r'detalhe_imovel\((\d+)\)', onclick)
-        id_imovel = id_match.group(1) if id_match else ''
-        
-        # Gerar link direto para o imóvel
-        link_direto = (
-            f"https://venda-imoveis.caixa.gov.br/sistema/"
-            f"detalhe-imovel.asp?hdnOrigem=index&txtImovel={id_imovel}"
-            if id_imovel else ''
+        return montar_dados_imovel(
+            texto_link=texto_completo,
+            onclick=link_element.get_attribute('onclick') or '',
+            url_imagem=_extrair_url_imagem(elemento),
+            texto_bloco=_texto_elemento(elemento),
         )
         
-        # Extrair URL da imagem
-        url_imagem = _extrair_url_imagem(elemento)
+    except Exception as e:
+        logger.error(f"Erro ao extrair dados do imóvel: {e}", exc_info=True)
+        return None
+
+
+def montar_dados_imovel(
+    texto_link: str,
+    onclick: str = '',
+    url_imagem: str = '',
+    texto_bloco: str = '',
+) -> Optional[Dict[str, Any]]:
+    """
+    Monta o dicionário de um imóvel a partir dos campos brutos da página.
+    
+    Usado tanto pela extração elemento a elemento quanto pela extração
+    em lote, garantindo o mesmo schema e as mesmas regras de parsing.
+    
+    Args:
+        texto_link: Texto do link "CIDADE - NOME DO IMÓVEL | R$ VALOR"
+        onclick: Atributo onclick do link (contém o ID do imóvel)
+        url_imagem: URL da foto do imóvel
+        texto_bloco: Texto visível de todo o bloco do imóvel
         
-        # Extrair informações adicionais
-        endereco, quartos = _extrair_informacoes_adicionais(elemento)
+    Returns:
+        Dicionário com dados do imóvel ou None se o texto não casar com o padrão
+    """
+    texto_completo = (texto_link or '').strip()
+    
+    # Padrão: "CIDADE - NOME DO IMÓVEL | R$ VALOR"
+    match = _PADRAO_TITULO.search(texto_completo)
+    if not match:
+        return None
+    
+    cidade = match.group(1).strip()
+    nome_imovel = match.group(2).strip()
+    valor = match.group(3).strip()
+    
+    # Extrair ID do imóvel do onclick
+    id_match = _PADRAO_ID.search(onclick or '')
+    id_imovel = id_match.group(1) if id_match else ''
+    
+    # Gerar link direto para o imóvel
+    link_direto = (
+        f"https://venda-imoveis.caixa.gov.br/sistema/"
+        f"detalhe-imovel.asp?hdnOrigem=index&txtImovel={id_imovel}"
+        if id_imovel else ''
+    )
+    
+    endereco, quartos = _extrair_endereco_quartos(texto_bloco or '')
+    
+    return {
+        'id_imovel': id_imovel,
+        'cidade': cidade,
+        'nome_imovel': nome_imovel,
+        'valor': valor,
+        'endereco': endereco,
+        'quartos': quartos,
+        'url_imagem': url_imagem or '',
+        'link_direto': link_direto,
+        'texto_completo': texto_completo
+    }
+
+
+def extrair_imoveis_em_lote(
+    driver: WebDriver,
+    seletor: str = ".group-block-item",
+) -> Optional[List[Optional[Dict[str, Any]]]]:
+    """
+    Extrai todos os imóveis da página com uma única chamada ``execute_script``.
+    
+    Em vez de 4 a 6 round trips ao chromedriver por imóvel, um script
+    coleta os campos brutos de todos os blocos e o parsing é feito em
+    Python com as mesmas regras de ``extrair_dados_imovel``.
+    
+    Args:
+        driver: Instância do WebDriver
+        seletor: Seletor CSS dos blocos de imóvel
         
-        return {
-            'id_imovel': id_imovel,
-            'cidade': cidade,
-            'nome_imovel': nome_imovel,
-            'valor': valor,
-            'endereco': endereco,
-            'quartos': quartos,
-            'url_imagem': url_imagem,
-            'link_direto': link_direto,
-            'texto_completo': texto_completo
-        }
+    Returns:
+        Lista alinhada com os blocos encontrados (None nas posições que não
+        casaram com o padrão), ou None se o script falhar. Nesse caso o
+        chamador deve usar a extração elemento a elemento.
         
+    Examples:
+        >>> imoveis = extrair_imoveis_em_lote(driver)
+        >>> if imoveis is None:
+        ...     imoveis = [extrair_dados_imovel(e) for e in elementos]
+    """
+    try:
+        brutos = driver.execute_script(SCRIPT_EXTRACAO_LOTE, seletor)
     except Exception as e:
-        logger.error(f"Erro ao extrair dados do imóvel: {e}", exc_info=True)
+        logger.warning(f"Extração em lote falhou para '{seletor}': {e}")
+        return None
+    
+    if not isinstance(brutos, list):
+        logger.warning(f"Extração em lote retornou formato inesperado: {type(brutos).__name__}")
         return None
+    
+    imoveis = []
+    for bruto in brutos:
+        if not isinstance(bruto, dict) or not bruto.get('texto_link'):
+            imoveis.append(None)
+            continue
+        imoveis.append(montar_dados_imovel(
+            texto_link=bruto.get('texto_link') or '',
+            onclick=bruto.get('onclick') or '',
+            url_imagem=bruto.get('url_imagem') or '',
+            texto_bloco=bruto.get('texto_bloco') or '',
+        ))
+    
+    return imoveis
 
 
 def _extrair_url_imagem(elemento: WebElement) -> str:
@@ -103,53 +231,47 @@ def _extrair_url_imagem(elemento: WebElement) -> str:
         return ''
 
 
-def _extrair_informacoes_adicionais(elemento: WebElement) -> tuple[str, str]:
+def _texto_elemento(elemento: WebElement) -> str:
     """
-    Extrai informações adicionais do imóvel (endereço e quartos).
+    Retorna o texto visível do elemento, ou string vazia se falhar.
     
     Args:
         elemento: Elemento WebElement do Selenium
         
+    Returns:
+        Texto do elemento
+    """
+    try:
+        return elemento.text
+    except Exception as e:
+        logger.debug(f"Erro ao ler texto do elemento: {e}")
+        return ''
+
+
+def _extrair_endereco_quartos(texto_elemento: str) -> tuple[str, str]:
+    """
+    Extrai endereço e quartos do texto visível de um bloco de imóvel.
+    
+    Args:
+        texto_elemento: Texto do bloco do imóvel
+        
     Returns:
         Tupla (endereco, quartos)
     """
     endereco = ''
     quartos = ''
     
-    try:
-        texto_elemento = elemento.text
-        
-        # Padrões para extrair endereço
-        endereco_patterns = [
-            r'Endereço[:\s]+([^\n]+)',
-            r'Localização[:\s]+([^\n]+)',
-            r'Bairro[:\s]+([^\n]+)',
-            r'Rua[:\s]+([^\n]+)',
-            r'Av[:\s]+([^\n]+)'
-        ]
-        
-        for pattern in endereco_patterns:
-            endereco_match = re.search(pattern, texto_elemento, re.IGNORECASE)
-            if endereco_match:
-                endereco = endereco_match.group(1).strip()
-                break
-        
-        # Padrões para extrair quartos
-        quartos_patterns = [
-            r'(\d+)\s*quarto',
-            r'(\d+)\s*suíte',
-            r'(\d+)\s*dormitório',
-            r'(\d+)\s*bedroom'
-        ]
-        
-        for pattern in quartos_patterns:
-            quartos_match = re.search(pattern, texto_elemento, re.IGNORECASE)
-            if quartos_match:
-                quartos = quartos_match.group(1)
-                break
-                
-    except Exception as e:
-        logger.debug(f"Erro ao extrair informações adicionais: {e}")
+    for pattern in _PADROES_ENDERECO:
+        endereco_match = pattern.search(texto_elemento)
+        if endereco_match:
+            endereco = endereco_match.group(1).strip()
+            break
+    
+    for pattern in _PADROES_QUARTOS:
+        quartos_match = pattern.search(texto_elemento)
+        if quartos_match:
+            quartos = quartos_match.group(1)
+            break
     
     return endereco, quartos
 
@@ -158,13 +280,19 @@ def extrair_imoveis_via_regex(html_source: str) -> list[Dict[str, Any]]:
     """
     Extrai imóveis diretamente do HTML usando regex.
     
-    Método de fallback quando os seletores CSS não funcionam.
+    Método de fallback quando os seletores CSS não funcionam. Em vez de
+    aplicar um padrão à página inteira (scripts e CSS incluídos), localiza
+    os links ``detalhe_imovel(ID)`` com uma única varredura e aplica os
+    padrões só dentro de cada região (do link até o link seguinte, com
+    tamanho limitado). O tempo cresce com o número de imóveis, não com o
+    tamanho da página, e o ``id_imovel`` é recuperado do onclick.
     
     Args:
         html_source: Código HTML da página
         
     Returns:
-        Lista de dicionários com dados dos imóveis
+        Lista de dicionários com dados dos imóveis, no mesmo schema de
+        ``montar_dados_imovel`` acrescido de ``numero``
         
     Examples:
         >>> imoveis = extrair_imoveis_via_regex(html)
@@ -173,29 +301,79 @@ def extrair_imoveis_via_regex(html_source: str) -> list[Dict[str, Any]]:
     """
     logger.info("Usando extração via regex como fallback")
     
-    padrao_imoveis = r'([^-]+) - ([^|]+) \| R\$ ([^<]+)'
-    matches = re.findall(padrao_imoveis, html_source)
-    
     imoveis = []
-    for i, match in enumerate(matches, 1):
-        cidade = match[0].strip()
-        nome_imovel = match[1].strip()
-        valor = match[2].strip()
-        
-        imovel = {
-            'numero': i,
-            'cidade': cidade,
-            'nome_imovel': nome_imovel,
-            'valor': valor,
-            'id_imovel': '',
-            'url_imagem': '',
-            'endereco': '',
-            'quartos': '',
-            'link_direto': '',
-            'texto_completo': f"{cidade} - {nome_imovel} | R$ {valor}",
-        }
-        imoveis.append(imovel)
-        logger.debug(f"Imóvel {i}: {nome_imovel} - R$ {valor}")
+    ids_vistos = set()
+    for id_imovel, texto_link, texto_bloco in _regioes_de_imoveis(html_source or ''):
+        if id_imovel in ids_vistos:
+            continue
+        dados = montar_dados_imovel(
+            texto_link=texto_link,
+            onclick=f"detalhe_imovel({id_imovel})",
+            texto_bloco=texto_bloco,
+        )
+        if not dados:
+            continue
+        ids_vistos.add(id_imovel)
+        dados['numero'] = len(imoveis) + 1
+        imoveis.append(dados)
+        logger.debug(f"Imóvel {dados['numero']}: {dados['nome_imovel']} - R$ {dados['valor']}")
     
     return imoveis
 
+
+def _regioes_de_imoveis(html_source: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    Percorre os links ``<a ... onclick="...detalhe_imovel(ID)...">`` do HTML.
+    
+    Args:
+        html_source: Código HTML da página
+        
+    Yields:
+        Tuplas (id_imovel, texto do link, texto do bloco a partir do link)
+    """
+    # Uma varredura (str.find) acha todas as ocorrências do marcador
+    posicoes = []
+    posicao = html_source.find(_MARCADOR_DETALHE)
+    while posicao != -1:
+        posicoes.append(posicao)
+        posicao = html_source.find(_MARCADOR_DETALHE, posicao + len(_MARCADOR_DETALHE))
+    
+    for indice, posicao in enumerate(posicoes):
+        proxima = posicoes[indice + 1] if indice + 1 < len(posicoes) else len(html_source)
+        limite = min(proxima, posicao + TAMANHO_MAXIMO_REGIAO)
+        
+        # "detalhe_imovel(123)" dentro de uma tag <a> (descarta a função do script do site)
+        id_match = _PADRAO_ID.match(html_source, posicao)
+        if not id_match:
+            continue
+        inicio_tag = html_source.rfind('<', max(0, posicao - TAMANHO_MAXIMO_TAG), posicao)
+        if inicio_tag == -1 or not _PADRAO_INICIO_LINK.match(html_source, inicio_tag):
+            continue
+        fim_tag = html_source.find('>', id_match.end(), limite)
+        if fim_tag == -1:
+            continue
+        
+        fim_link = _PADRAO_FIM_LINK.search(html_source, fim_tag, limite)
+        texto_link = _texto_de_html(html_source[fim_tag + 1:fim_link.start() if fim_link else limite], ' ')
+        texto_bloco = _texto_de_html(html_source[fim_tag + 1:limite], '\n')
+        yield id_match.group(1), texto_link, texto_bloco
+
+
+def _texto_de_html(trecho: str, separador: str) -> str:
+    """
+    Texto de um trecho de HTML, sem tags e com espaços normalizados.
+    
+    Args:
+        trecho: Fragmento de HTML
+        separador: Texto entre as linhas (tags e quebras de linha)
+        
+    Returns:
+        Texto com as entidades HTML decodificadas
+    """
+    # A região pode terminar no meio da tag do link seguinte
+    corte = trecho.rfind('<')
+    if corte > trecho.rfind('>'):
+        trecho = trecho[:corte]
+    texto = unescape(_PADRAO_TAG.sub('\n', trecho))
+    linhas = (_PADRAO_ESPACOS.sub(' ', linha).strip() for linha in texto.split('\n'))
+    return separador.join(linha for linha in linhas if linha)
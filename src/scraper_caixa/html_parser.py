@@ -0,0 +1,177 @@
+"""
+Extração de imóveis a partir do HTML da página usando lxml.
+
+Trabalha sobre uma string (``driver.page_source`` ou um HTML salvo),
+sem nenhum round trip ao navegador. Por ser uma função pura, pode ser
+executada em um pool de processos, longe da thread que controla o driver.
+"""
+
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+
+from .config import URL_BASE
+from .extractor import montar_dados_imovel
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _xpath_classe(classe: str) -> str:
+    """Equivalente XPath do seletor CSS ``.classe``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {classe} ')"
+
+
+# Mesmos seletores de extrair_imoveis_da_pagina, traduzidos para XPath
+XPATHS_BLOCOS = [
+    (".group-block-item", etree.XPath(f"//*[{_xpath_classe('group-block-item')}]")),
+    ("li[class*='group-block-item']", etree.XPath("//li[contains(@class, 'group-block-item')]")),
+    (".dadosimovel-col2", etree.XPath(f"//*[{_xpath_classe('dadosimovel-col2')}]")),
+    ("ul[class*='form-set'] li", etree.XPath("//ul[contains(@class, 'form-set')]//li")),
+]
+XPATH_LINK = etree.XPath(".//a[contains(@onclick, 'detalhe_imovel')]")
+XPATH_IMAGEM = etree.XPath(f".//img[{_xpath_classe('fotoimovel')}]")
+
+# Elementos que o navegador renderiza em linha própria (aproximação do innerText)
+_TAGS_BLOCO = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "tr", "ul",
+}
+_TAGS_IGNORADAS = {"script", "style", "noscript", "template"}
+
+
+def extrair_imoveis_do_html(html: str, url_base: str = URL_BASE) -> List[Dict[str, Any]]:
+    """
+    Extrai os imóveis de uma página de resultados a partir do HTML.
+
+    Aplica os mesmos seletores de ``extrair_imoveis_da_pagina`` e retorna
+    o mesmo schema de ``extrair_dados_imovel``, acrescido de ``numero``
+    (posição do bloco na página).
+
+    Args:
+        html: Código HTML da página
+        url_base: URL usada para resolver caminhos relativos das imagens
+
+    Returns:
+        Lista de dicionários com dados dos imóveis (vazia se nada casar)
+
+    Examples:
+        >>> with open("pagina.html", encoding="utf-8") as f:
+        ...     imoveis = extrair_imoveis_do_html(f.read())
+        >>> print(imoveis[0]['nome_imovel'], imoveis[0]['valor'])
+    """
+    documento = _parse_documento(html)
+    if documento is None:
+        return []
+
+    for descricao, xpath in XPATHS_BLOCOS:
+        blocos = xpath(documento)
+        if not blocos:
+            continue
+
+        imoveis = []
+        for i, bloco in enumerate(blocos, 1):
+            dados = _extrair_bloco(bloco, url_base)
+            if dados:
+                dados['numero'] = i
+                imoveis.append(dados)
+
+        logger.debug(f"Seletor {descricao}: {len(blocos)} blocos, {len(imoveis)} imóveis")
+        if imoveis:
+            return imoveis
+
+    return []
+
+
+def _parse_documento(html: str) -> Optional[Any]:
+    """
+    Converte o HTML em árvore lxml.
+
+    Args:
+        html: Código HTML
+
+    Returns:
+        Raiz do documento ou None se o HTML estiver vazio/inválido
+    """
+    if not html or not html.strip():
+        return None
+
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Strings com declaração de encoding precisam ser passadas como bytes
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError as e:
+        logger.warning(f"HTML inválido: {e}")
+        return None
+
+
+def _extrair_bloco(bloco: Any, url_base: str) -> Optional[Dict[str, Any]]:
+    """
+    Extrai os dados de um bloco de imóvel.
+
+    Args:
+        bloco: Elemento lxml do bloco
+        url_base: URL base para resolver a imagem
+
+    Returns:
+        Dicionário com dados do imóvel ou None se o bloco não tiver o link
+    """
+    links = XPATH_LINK(bloco)
+    if not links:
+        return None
+    link = links[0]
+
+    imagens = XPATH_IMAGEM(bloco)
+    src = imagens[0].get("src", "") if imagens else ""
+
+    return montar_dados_imovel(
+        texto_link=texto_visivel(link),
+        onclick=link.get("onclick", ""),
+        url_imagem=urljoin(url_base, src) if src else "",
+        texto_bloco=texto_visivel(bloco),
+    )
+
+
+def texto_visivel(elemento: Any) -> str:
+    """
+    Aproxima o ``innerText`` do navegador para um elemento lxml.
+
+    Ignora scripts e estilos, quebra linha em elementos de bloco e
+    ``<br>``, e colapsa espaços dentro de cada linha.
+
+    Args:
+        elemento: Elemento lxml
+
+    Returns:
+        Texto visível do elemento
+    """
+    partes: List[str] = []
+    _coletar_texto(elemento, partes, incluir_tail=False)
+    linhas = (" ".join(linha.split()) for linha in "".join(partes).split("\n"))
+    return "\n".join(linha for linha in linhas if linha)
+
+
+def _coletar_texto(elemento: Any, partes: List[str], incluir_tail: bool = True) -> None:
+    """Percorre a árvore acumulando texto e quebras de linha."""
+    tag = elemento.tag if isinstance(elemento.tag, str) else ""
+
+    if tag not in _TAGS_IGNORADAS and isinstance(elemento.tag, str):
+        if tag == "br" or tag in _TAGS_BLOCO:
+            partes.append("\n")
+
+        if elemento.text:
+            partes.append(elemento.text)
+        for filho in elemento:
+            _coletar_texto(filho, partes)
+
+        if tag in _TAGS_BLOCO:
+            partes.append("\n")
+
+    # O tail pertence ao pai, então é incluído mesmo para tags ignoradas
+    if incluir_tail and elemento.tail:
+        partes.append(elemento.tail)
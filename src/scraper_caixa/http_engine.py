@@ -0,0 +1,393 @@
+"""
+Motor de busca via HTTP, sem navegador.
+
+O formulário de busca (``cmb_estado``, ``cmb_cidade``, ``cmb_tp_imovel``,
+``cmb_quartos``, ``cmb_faixa_vlr``, ``btn_next0``/``btn_next1``) apenas
+envia parâmetros ao backend da Caixa. Este módulo faz as mesmas
+requisições diretamente com ``requests.Session``:
+
+1. ``GET busca-imovel.asp`` para obter os cookies de sessão;
+2. ``POST carregaPesquisaImoveis.asp`` com os filtros, que devolve os
+   IDs dos imóveis agrupados por página (inputs ``hdnImov1..N``);
+3. ``POST carregaListaImoveis.asp`` para cada página, que devolve o
+   HTML da lista, processado por ``extrair_imoveis_do_html``.
+
+Também expõe as listas de estados e cidades (``carregaListaCidades.asp``),
+usadas pelo catálogo de cidades.
+"""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    ENDPOINT_BUSCA,
+    ENDPOINT_LISTA_CIDADES,
+    ENDPOINT_LISTA_IMOVEIS,
+    ENDPOINT_PESQUISA_IMOVEIS,
+    USER_AGENT,
+    ScraperConfig,
+)
+from .exceptions import NavigationError
+from .html_parser import extrair_imoveis_do_html
+from .logger import get_logger
+from .rastreamento import span
+from .rate_limit import obter_rate_limiter
+from .types import FiltrosBusca
+
+logger = get_logger(__name__)
+
+# Título da página de desafio do bot manager (ver relatorios/resposta_cidades_SC.txt).
+# O aperture.js (cdn.perfdrive.com) também é carregado pelas páginas normais do
+# site, então o domínio dele não indica bloqueio.
+_PADRAO_BLOQUEIO = re.compile(r"<title>\s*Radware Bot Manager", re.IGNORECASE)
+
+_PADRAO_INPUT_PAGINA = re.compile(r"^hdnImov(\d+)$")
+
+
+def pagina_bloqueada(html: str) -> bool:
+    """
+    Indica se a resposta é a página de desafio (CAPTCHA) do bot manager.
+
+    Args:
+        html: Corpo da resposta
+
+    Returns:
+        True se for a página de bloqueio
+    """
+    return bool(html) and _PADRAO_BLOQUEIO.search(html) is not None
+
+
+def montar_parametros_busca(filtros: FiltrosBusca) -> Dict[str, str]:
+    """
+    Converte os filtros da busca nos campos enviados pelo formulário.
+
+    Args:
+        filtros: Filtros da busca (mesmo formato de buscar_imoveis_com_filtros)
+
+    Returns:
+        Dicionário de campos do POST de pesquisa
+    """
+    return {
+        "hdn_estado": filtros.get("estado") or "",
+        "hdn_cidade": filtros.get("codigo_cidade") or "",
+        "hdn_bairro": "",
+        "hdn_tp_venda": "",
+        "hdn_tp_imovel": filtros.get("tipo_imovel") or "",
+        "hdn_area_util": "",
+        "hdn_faixa_vlr": filtros.get("faixa_valor") or "",
+        "hdn_quartos": filtros.get("quartos") or "",
+        "hdn_vg_garagem": "",
+        "strValorSimulador": "",
+        "strAceitaFGTS": "",
+        "strAceitaFinanciamento": "",
+    }
+
+
+def extrair_opcoes(html: str, id_select: Optional[str] = None) -> Dict[str, str]:
+    """
+    Lê as opções (valor -> texto) de um ``<select>`` ou de uma lista de ``<option>``.
+
+    Ignora a opção vazia ("Selecione").
+
+    Args:
+        html: HTML com as opções
+        id_select: ID do select a ler. Se None, lê todas as opções do HTML.
+
+    Returns:
+        Dicionário valor -> texto, na ordem do HTML
+    """
+    if not html or not html.strip():
+        return {}
+
+    documento = lxml.html.document_fromstring(html)
+    caminho = f"//select[@id='{id_select}']//option" if id_select else "//option"
+
+    opcoes = {}
+    for opcao in documento.xpath(caminho):
+        valor = (opcao.get("value") or "").strip()
+        texto = " ".join(opcao.text_content().split())
+        if valor and texto:
+            opcoes[valor] = texto
+    return opcoes
+
+
+def extrair_paginas_de_ids(html: str) -> List[List[str]]:
+    """
+    Lê os grupos de IDs por página da resposta de pesquisa.
+
+    Args:
+        html: Resposta de ``carregaPesquisaImoveis.asp``
+
+    Returns:
+        Lista de páginas, cada uma com a lista de IDs de imóveis
+    """
+    if not html or not html.strip():
+        return []
+
+    documento = lxml.html.fromstring(html)
+    grupos = []
+    for campo in documento.xpath("//input[starts-with(@id, 'hdnImov') or starts-with(@name, 'hdnImov')]"):
+        match = _PADRAO_INPUT_PAGINA.match(campo.get("id") or campo.get("name") or "")
+        if not match:
+            continue
+        ids = [i.strip() for i in (campo.get("value") or "").split("||") if i.strip()]
+        if ids:
+            grupos.append((int(match.group(1)), ids))
+
+    return [ids for _, ids in sorted(grupos)]
+
+
+class HttpSearchEngine:
+    """
+    Executa buscas de imóveis diretamente no backend, sem Selenium.
+
+    Examples:
+        >>> motor = HttpSearchEngine(ScraperConfig(search_engine="http"))
+        >>> imoveis = motor.buscar(filtros)
+        >>> motor.fechar()
+    """
+
+    def __init__(
+        self,
+        config: Optional[ScraperConfig] = None,
+        sessao: Optional[requests.Session] = None,
+    ) -> None:
+        """
+        Inicializa o motor.
+
+        Args:
+            config: Configuração do scraper. Se None, usa configuração padrão.
+            sessao: Sessão HTTP a reutilizar. Se None, cria uma nova.
+        """
+        self.config = config or ScraperConfig()
+        if sessao is None:
+            # Conexões keep-alive suficientes para chamadas em paralelo na mesma sessão
+            sessao = requests.Session()
+            adaptador = HTTPAdapter(pool_maxsize=max(10, self.config.pool_size))
+            sessao.mount("https://", adaptador)
+            sessao.mount("http://", adaptador)
+        self.sessao = sessao
+        self.sessao.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Language": "pt-BR,pt;q=0.9",
+        })
+        self._sessao_iniciada = False
+        self._trava_sessao = threading.Lock()
+        # Uma sessão requests fechada continua aceitando requisições: o
+        # cancelamento é verificado antes e depois de cada uma
+        self._cancelado = threading.Event()
+        self.limitador = obter_rate_limiter(self.config)
+
+    def url(self, endpoint: str) -> str:
+        """Monta a URL absoluta de um endpoint do site."""
+        return urljoin(self.config.site_url, endpoint)
+
+    def buscar(self, filtros: FiltrosBusca, max_paginas: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Executa a busca e retorna os imóveis de todas as páginas.
+
+        Args:
+            filtros: Filtros da busca
+            max_paginas: Limite de páginas. Se None, busca todas.
+
+        Returns:
+            Lista de imóveis no schema de extrair_dados_imovel, com ``pagina``
+
+        Raises:
+            NavigationError: Se o site bloquear a sessão ou responder com erro
+        """
+        todos_imoveis = []
+        for _, imoveis in self.iter_paginas(filtros, max_paginas):
+            todos_imoveis.extend(imoveis)
+        return todos_imoveis
+
+    def iter_paginas(
+        self, filtros: FiltrosBusca, max_paginas: Optional[int] = None, pagina_inicial: int = 1
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Executa a busca e gera os imóveis de cada página assim que ela é lida.
+
+        Args:
+            filtros: Filtros da busca
+            max_paginas: Limite de páginas. Se None, busca todas.
+            pagina_inicial: Primeira página a carregar (as anteriores são puladas)
+
+        Yields:
+            (número da página, imóveis da página)
+
+        Raises:
+            NavigationError: Se o site bloquear a sessão ou responder com erro
+        """
+        paginas = self.pesquisar(filtros)
+        if max_paginas is not None:
+            paginas = paginas[:max_paginas]
+
+        logger.info(f"Busca HTTP: {sum(len(p) for p in paginas)} imóveis em {len(paginas)} página(s)")
+
+        inicio = max(1, pagina_inicial)
+        for numero_pagina, html in enumerate(self._carregar_paginas(paginas[inicio - 1:]), inicio):
+            self._verificar_cancelamento()
+            with span("page_extract", pagina=numero_pagina):
+                imoveis = extrair_imoveis_do_html(html, url_base=self.config.site_url)
+            for imovel in imoveis:
+                imovel["pagina"] = numero_pagina
+                imovel["filtros_usados"] = str(filtros)
+            logger.info(f"Página {numero_pagina}: {len(imoveis)} imóveis")
+            yield numero_pagina, imoveis
+
+    def pesquisar(self, filtros: FiltrosBusca) -> List[List[str]]:
+        """
+        Envia os filtros e retorna os IDs dos imóveis agrupados por página.
+
+        Args:
+            filtros: Filtros da busca
+
+        Returns:
+            Lista de páginas, cada uma com a lista de IDs
+        """
+        with span("submit", cidade=filtros.get("nome_cidade")):
+            self._iniciar_sessao()
+            resposta = self._post(ENDPOINT_PESQUISA_IMOVEIS, montar_parametros_busca(filtros))
+            return extrair_paginas_de_ids(resposta)
+
+    def carregar_pagina(self, ids: List[str]) -> str:
+        """
+        Carrega o HTML da lista de imóveis de uma página.
+
+        Args:
+            ids: IDs dos imóveis da página
+
+        Returns:
+            HTML da lista de imóveis
+        """
+        with span("page_load", imoveis=len(ids)):
+            return self._post(ENDPOINT_LISTA_IMOVEIS, {"hdnImov": "||".join(ids)})
+
+    def _carregar_paginas(self, paginas: List[List[str]]) -> Iterator[str]:
+        """
+        Gera o HTML de cada página, em ordem.
+
+        Com ``prefetch_pages``, a página seguinte é carregada em outra thread
+        (mesma sessão e mesmo limitador) enquanto quem consome o gerador
+        extrai a atual.
+        """
+        if not self.config.prefetch_pages or len(paginas) < 2:
+            for ids in paginas:
+                yield self.carregar_pagina(ids)
+            return
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch-pagina") as executor:
+            proxima = executor.submit(self.carregar_pagina, paginas[0])
+            for indice in range(len(paginas)):
+                html = proxima.result()
+                if indice + 1 < len(paginas):
+                    proxima = executor.submit(self.carregar_pagina, paginas[indice + 1])
+                yield html
+
+    def listar_estados(self) -> Dict[str, str]:
+        """
+        Lê os estados disponíveis no select ``cmb_estado`` da página de busca.
+
+        Returns:
+            Dicionário sigla -> nome do estado
+        """
+        html = self._requisitar("GET", ENDPOINT_BUSCA, params={"sltTipoBusca": "imoveis"})
+        self._sessao_iniciada = True
+        return extrair_opcoes(html, "cmb_estado")
+
+    def listar_cidades(self, estado: str) -> Dict[str, str]:
+        """
+        Lê as cidades de um estado, como o formulário faz ao trocar ``cmb_estado``.
+
+        Args:
+            estado: Sigla do estado
+
+        Returns:
+            Dicionário código -> nome da cidade
+        """
+        self._iniciar_sessao()
+        return extrair_opcoes(self._post(ENDPOINT_LISTA_CIDADES, {"cmb_estado": estado}))
+
+    def fechar(self) -> None:
+        """Encerra a sessão HTTP."""
+        self.sessao.close()
+
+    def cancelar(self) -> None:
+        """
+        Cancela a busca em andamento (chamado de outra thread, ex.: timeout).
+
+        As requisições seguintes, e as respostas que ainda chegarem, levantam
+        NavigationError. O motor não deve ser reutilizado depois disso.
+        """
+        self._cancelado.set()
+        self.fechar()
+
+    @property
+    def cancelado(self) -> bool:
+        """True depois de ``cancelar``."""
+        return self._cancelado.is_set()
+
+    def __enter__(self) -> "HttpSearchEngine":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.fechar()
+
+    def _iniciar_sessao(self) -> None:
+        """Abre a página de busca uma vez para obter os cookies de sessão."""
+        with self._trava_sessao:
+            if self._sessao_iniciada:
+                return
+            self._requisitar("GET", ENDPOINT_BUSCA, params={"sltTipoBusca": "imoveis"})
+            self._sessao_iniciada = True
+
+    def _post(self, endpoint: str, dados: Dict[str, str]) -> str:
+        """Faz um POST no estilo das chamadas AJAX do formulário."""
+        return self._requisitar(
+            "POST",
+            endpoint,
+            data=dados,
+            headers={
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": self.url(ENDPOINT_BUSCA),
+            },
+        )
+
+    def _verificar_cancelamento(self) -> None:
+        """Levanta NavigationError se a busca foi cancelada."""
+        if self._cancelado.is_set():
+            raise NavigationError("Busca HTTP cancelada")
+
+    def _requisitar(self, metodo: str, endpoint: str, **kwargs: Any) -> str:
+        """
+        Executa uma requisição e valida a resposta.
+
+        Raises:
+            NavigationError: Em erro HTTP, falha de rede ou página de bloqueio
+        """
+        url = self.url(endpoint)
+        self._verificar_cancelamento()
+        self.limitador.adquirir()
+        self._verificar_cancelamento()
+        try:
+            resposta = self.sessao.request(metodo, url, timeout=self.config.timeout, **kwargs)
+            resposta.raise_for_status()
+        except requests.RequestException as e:
+            raise NavigationError(f"Falha em {metodo} {url}: {e}") from e
+        self._verificar_cancelamento()
+
+        # As páginas ASP da Caixa são servidas em ISO-8859-1 sem charset explícito
+        if not resposta.encoding or resposta.encoding.lower() == "iso-8859-1":
+            resposta.encoding = resposta.apparent_encoding or resposta.encoding
+
+        texto = resposta.text
+        if pagina_bloqueada(texto):
+            raise NavigationError(f"Requisição bloqueada pelo bot manager: {url}")
+        return texto
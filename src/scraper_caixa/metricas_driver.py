@@ -0,0 +1,215 @@
+"""
+Contagem e latência dos comandos WebDriver.
+
+Todo comando do Selenium (inclusive os de ``WebElement``, que delegam ao
+driver) passa por ``driver.execute``. ``instrumentar_driver`` intercepta
+esse método e registra, para cada comando (``findElement``,
+``getElementAttribute``, ``w3cExecuteScript``...), a quantidade, o tempo
+total e um histograma de latência, atribuindo-o à fase aberta no
+rastreador (``rastreamento``) da thread que o emitiu.
+
+O relatório mostra quantas idas e voltas ao chromedriver cada fase custa,
+para comparar extração em lote, sondagem da paginação etc.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .logger import get_logger
+from .rastreamento import obter_rastreador
+
+logger = get_logger(__name__)
+
+# Limites superiores (ms) das faixas do histograma; a última faixa é "acima"
+FAIXAS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+SEM_FASE = "(sem fase)"
+
+
+class Histograma:
+    """Quantidade e tempo de um comando, com latências agrupadas em FAIXAS_MS."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.total = 0.0  # segundos
+        self.faixas = [0] * (len(FAIXAS_MS) + 1)
+
+    def adicionar(self, duracao: float) -> None:
+        self.n += 1
+        self.total += duracao
+        self.faixas[bisect.bisect_left(FAIXAS_MS, duracao * 1000)] += 1
+
+    def somar(self, outro: "Histograma") -> None:
+        self.n += outro.n
+        self.total += outro.total
+        self.faixas = [a + b for a, b in zip(self.faixas, outro.faixas)]
+
+    def percentil(self, percentil: float) -> str:
+        """Faixa que contém o percentil (por exemplo, "≤25ms")."""
+        if not self.n:
+            return "-"
+        alvo = percentil / 100 * self.n
+        acumulado = 0
+        for indice, quantidade in enumerate(self.faixas):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return _rotulo_faixa(indice)
+        return _rotulo_faixa(len(self.faixas) - 1)
+
+    def barras(self) -> str:
+        """Faixas não vazias em uma linha ("≤1ms 10 | ≤2ms 4 ...")."""
+        return " | ".join(
+            f"{_rotulo_faixa(indice)} {quantidade}" for indice, quantidade in enumerate(self.faixas) if quantidade
+        )
+
+
+class ContadorComandos:
+    """
+    Acumula os comandos WebDriver de todas as threads, por fase e por comando.
+
+    Examples:
+        >>> contador = obter_contador_comandos()
+        >>> instrumentar_driver(driver, contador)
+        >>> ...
+        >>> logger.info(contador.relatorio())
+    """
+
+    def __init__(self) -> None:
+        self._dados: Dict[Tuple[str, str], Histograma] = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, comando: str, duracao: float, fase: Optional[str] = None) -> None:
+        """
+        Registra um comando executado.
+
+        Args:
+            comando: Nome do comando WebDriver
+            duracao: Latência em segundos
+            fase: Fase da busca. Se None, a fase aberta na thread atual.
+        """
+        fase = fase or obter_rastreador().fase_atual() or SEM_FASE
+        with self._trava:
+            histograma = self._dados.get((fase, comando))
+            if histograma is None:
+                histograma = self._dados[(fase, comando)] = Histograma()
+            histograma.adicionar(duracao)
+
+    @property
+    def total(self) -> int:
+        """Comandos registrados."""
+        with self._trava:
+            return sum(h.n for h in self._dados.values())
+
+    def por_comando(self) -> Dict[str, Histograma]:
+        """Histogramas somados por comando (todas as fases)."""
+        return self._agrupar(lambda fase, comando: comando)
+
+    def por_fase(self) -> Dict[str, Histograma]:
+        """Histogramas somados por fase (todos os comandos)."""
+        return self._agrupar(lambda fase, comando: fase)
+
+    def comandos_da_fase(self, fase: str) -> Dict[str, int]:
+        """Quantidade de cada comando emitido na fase."""
+        with self._trava:
+            return {comando: h.n for (f, comando), h in self._dados.items() if f == fase}
+
+    def limpar(self) -> None:
+        """Descarta os comandos registrados."""
+        with self._trava:
+            self._dados = {}
+
+    def relatorio(self, principais: int = 4) -> str:
+        """
+        Tabelas por comando e por fase, e o histograma geral de latência.
+
+        Args:
+            principais: Comandos listados em cada fase
+
+        Returns:
+            Texto com uma linha por comando e por fase
+        """
+        comandos = self.por_comando()
+        if not comandos:
+            return "nenhum comando WebDriver registrado"
+
+        geral = Histograma()
+        for histograma in comandos.values():
+            geral.somar(histograma)
+
+        linhas = [
+            f"{geral.n} comandos WebDriver, {geral.total:.2f}s no chromedriver",
+            f"{'comando':<28} {'n':>6} {'total':>9} {'média':>9} {'p50':>8} {'p95':>8}",
+        ]
+        for comando, h in sorted(comandos.items(), key=lambda item: item[1].n, reverse=True):
+            linhas.append(
+                f"{comando:<28} {h.n:>6} {h.total:>8.2f}s {h.total / h.n * 1000:>7.1f}ms "
+                f"{h.percentil(50):>8} {h.percentil(95):>8}"
+            )
+
+        linhas.append(f"{'fase':<28} {'n':>6} {'total':>9}  principais comandos")
+        for fase, h in sorted(self.por_fase().items(), key=lambda item: item[1].n, reverse=True):
+            mais_usados = sorted(self.comandos_da_fase(fase).items(), key=lambda item: item[1], reverse=True)
+            resumo = ", ".join(f"{comando} {n}" for comando, n in mais_usados[:principais])
+            linhas.append(f"{fase:<28} {h.n:>6} {h.total:>8.2f}s  {resumo}")
+
+        linhas.append(f"latência: {geral.barras()}")
+        return "\n".join(linhas)
+
+    def _agrupar(self, chave) -> Dict[str, Histograma]:
+        grupos: Dict[str, Histograma] = {}
+        with self._trava:
+            for (fase, comando), histograma in self._dados.items():
+                grupos.setdefault(chave(fase, comando), Histograma()).somar(histograma)
+        return grupos
+
+
+_contador = ContadorComandos()
+
+
+def obter_contador_comandos() -> ContadorComandos:
+    """Contador compartilhado pelo processo."""
+    return _contador
+
+
+def instrumentar_driver(driver: WebDriver, contador: Optional[ContadorComandos] = None) -> WebDriver:
+    """
+    Faz o driver registrar cada comando no contador.
+
+    Intercepta ``driver.execute``, então cobre também os comandos de
+    ``WebElement``. Chamar de novo com o mesmo driver apenas troca o
+    contador. Aplicado antes de ``limitar_driver``, a espera do limitador
+    de taxa não entra na latência.
+
+    Args:
+        driver: Instância do WebDriver
+        contador: Contador a usar. Se None, o compartilhado.
+
+    Returns:
+        O próprio driver
+    """
+    ja_instrumentado = getattr(driver, "_contador_comandos", None) is not None
+    driver._contador_comandos = contador or _contador
+    if ja_instrumentado:
+        return driver
+
+    execute_original = driver.execute
+
+    def execute(driver_command: str, params: Optional[dict] = None) -> Any:
+        inicio = time.perf_counter()
+        try:
+            return execute_original(driver_command, params)
+        finally:
+            driver._contador_comandos.registrar(driver_command, time.perf_counter() - inicio)
+
+    driver.execute = execute
+    return driver
+
+
+def _rotulo_faixa(indice: int) -> str:
+    if indice < len(FAIXAS_MS):
+        return f"≤{FAIXAS_MS[indice]}ms"
+    return f">{FAIXAS_MS[-1]}ms"
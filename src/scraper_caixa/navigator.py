@@ -2,10 +2,13 @@
 Módulo para navegação e paginação.
 
 Responsável por navegar entre páginas e detectar botões
-de próxima página.
+de próxima página. A detecção é feita por uma sonda JavaScript
+que devolve o estado da paginação em uma única chamada; as
+estratégias elemento a elemento ficam como fallback.
 """
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -15,6 +18,173 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Sonda de paginação: mesmas estratégias de _encontrar_botao_proximo, em uma chamada.
+# Total de páginas: #hdnQtdPag, inputs hdnImovN (IDs por página) ou maior link numérico.
+_JS_SONDA_PAGINACAO = r"""
+var textosVazio = ['Nenhum resultado', 'nenhum resultado', 'Não foram encontrados'];
+var corpo = document.body ? (document.body.innerText || '') : '';
+for (var i = 0; i < textosVazio.length; i++) {
+    if (corpo.indexOf(textosVazio[i]) !== -1) {
+        return {sem_resultado: true, quantidade: 0, pagina_atual: null, total_paginas: null, proximo: null, texto: ''};
+    }
+}
+
+var quantidade = document.querySelectorAll("a[onclick*='detalhe_imovel']").length;
+
+function inteiro(valor) {
+    var n = parseInt(valor, 10);
+    return isNaN(n) ? null : n;
+}
+function visivel(el) {
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+function valido(el) {
+    if (!visivel(el) || el.disabled) { return false; }
+    if ((el.getAttribute('href') || '') === '#') { return false; }
+    if ((el.className || '').toString().toLowerCase().indexOf('disabled') !== -1) { return false; }
+    var t = (el.textContent || '').trim().toLowerCase();
+    return ['1', 'atual', 'current'].indexOf(t) === -1;
+}
+function ativo(el) {
+    var c = (el.className || '').toString().toLowerCase();
+    return c.indexOf('active') !== -1 || c.indexOf('current') !== -1;
+}
+
+var total = null;
+var qtd = document.getElementById('hdnQtdPag');
+if (qtd) { total = inteiro(qtd.value); }
+if (total === null) {
+    var grupos = document.querySelectorAll("input[id^='hdnImov']");
+    if (grupos.length) { total = grupos.length; }
+}
+
+var atual = null;
+var num = document.getElementById('hdnPagNum');
+if (num) { atual = inteiro(num.value); }
+
+var numericos = [];
+var links = document.querySelectorAll('a');
+for (var j = 0; j < links.length; j++) {
+    var a = links[j];
+    var t = (a.textContent || '').trim();
+    if (!/^\d+$/.test(t)) { continue; }
+    var alvo = ((a.getAttribute('href') || '') + ' ' + (a.getAttribute('onclick') || '') + ' ' + (a.className || '')).toLowerCase();
+    if (alvo.indexOf('pagina') === -1 && alvo.indexOf('page') === -1 && alvo.indexOf('carregalista') === -1) { continue; }
+    numericos.push(a);
+    if (atual === null && ativo(a)) { atual = inteiro(t); }
+}
+if (total === null && numericos.length) {
+    total = 0;
+    for (var k = 0; k < numericos.length; k++) { total = Math.max(total, inteiro(numericos[k].textContent.trim())); }
+    if (atual !== null) { total = Math.max(total, atual); }
+}
+
+var proximo = null;
+if (quantidade) {
+    var candidatos = [];
+    for (var m = 0; m < links.length; m++) {
+        var l = links[m], txt = l.textContent || '';
+        if (txt.indexOf('Próxima') !== -1 || txt.indexOf('Próximo') !== -1 || txt.indexOf('>') !== -1 || txt.indexOf('Seguinte') !== -1) {
+            candidatos.push(l);
+        }
+    }
+    for (var n = 0; n < links.length; n++) {
+        var h = (links[n].getAttribute('href') || '') + ' ' + (links[n].getAttribute('onclick') || '');
+        if (h.indexOf('pagina') !== -1 || h.indexOf('proxima') !== -1) { candidatos.push(links[n]); }
+    }
+    var porClasse = document.querySelectorAll(".proxima, .next, .btn-proximo, .btn-next, [class*='proxima'], [class*='next']");
+    for (var o = 0; o < porClasse.length; o++) { candidatos.push(porClasse[o]); }
+
+    if (atual !== null) {
+        for (var p = 0; p < numericos.length; p++) {
+            if (inteiro(numericos[p].textContent.trim()) === atual + 1 && visivel(numericos[p])) { proximo = numericos[p]; break; }
+        }
+    }
+    for (var q = 0; !proximo && q < candidatos.length; q++) {
+        if (valido(candidatos[q]) && !ativo(candidatos[q])) { proximo = candidatos[q]; }
+    }
+    for (var r = 0; !proximo && r < numericos.length; r++) {
+        if (visivel(numericos[r]) && !ativo(numericos[r]) && valido(numericos[r])) { proximo = numericos[r]; }
+    }
+}
+if (atual !== null && total !== null && atual >= total) { proximo = null; }
+
+return {
+    sem_resultado: false,
+    quantidade: quantidade,
+    pagina_atual: atual,
+    total_paginas: total,
+    proximo: proximo,
+    texto: proximo ? (proximo.textContent || '').trim() : ''
+};
+"""
+
+
+@dataclass
+class EstadoPaginacao:
+    """Estado da paginação da página de resultados atual."""
+
+    quantidade: int = 0
+    pagina_atual: Optional[int] = None
+    total_paginas: Optional[int] = None
+    proximo: Optional[WebElement] = None
+    texto_proximo: str = ""
+    sem_resultado: bool = False
+    via_fallback: bool = False
+
+    @property
+    def tem_resultados(self) -> bool:
+        """True se a página lista imóveis."""
+        return not self.sem_resultado and self.quantidade > 0
+
+
+def sondar_paginacao(driver: WebDriver) -> EstadoPaginacao:
+    """
+    Lê o estado da paginação com um único ``execute_script``.
+
+    Devolve se há resultados, quantos imóveis a página lista, a página
+    atual, o total de páginas e o controle de próxima página. Se a sonda
+    falhar, ou indicar páginas restantes sem achar o controle, usa as
+    estratégias elemento a elemento.
+
+    Args:
+        driver: Instância do WebDriver
+
+    Returns:
+        EstadoPaginacao da página atual
+
+    Examples:
+        >>> estado = sondar_paginacao(driver)
+        >>> if estado.proximo:
+        ...     estado.proximo.click()
+    """
+    try:
+        bruto: Dict[str, Any] = driver.execute_script(_JS_SONDA_PAGINACAO) or {}
+    except Exception as e:
+        logger.warning(f"Sonda de paginação falhou ({e}); usando estratégias por elemento")
+        return _sondar_por_elementos(driver)
+
+    estado = EstadoPaginacao(
+        quantidade=int(bruto.get("quantidade") or 0),
+        pagina_atual=bruto.get("pagina_atual"),
+        total_paginas=bruto.get("total_paginas"),
+        proximo=bruto.get("proximo"),
+        texto_proximo=bruto.get("texto") or "",
+        sem_resultado=bool(bruto.get("sem_resultado")),
+    )
+
+    faltam_paginas = (
+        estado.pagina_atual is not None
+        and estado.total_paginas is not None
+        and estado.pagina_atual < estado.total_paginas
+    )
+    if estado.tem_resultados and estado.proximo is None and faltam_paginas:
+        logger.debug("Sonda não achou o controle de próxima página; usando estratégias por elemento")
+        estado.proximo = _encontrar_botao_proximo(driver)
+        estado.via_fallback = True
+
+    return estado
+
 
 def verificar_proxima_pagina(driver: WebDriver) -> Optional[WebElement]:
     """
@@ -32,29 +202,47 @@ def verificar_proxima_pagina(driver: WebDriver) -> Optional[WebElement]:
         ...     botao.click()
     """
     try:
-        # Verificar se há mensagem de "nenhum resultado"
-        if _tem_mensagem_sem_resultado(driver):
-            logger.info("Detectada mensagem de 'nenhum resultado'")
-            return None
-        
-        # Verificar se há elementos de imóveis na página
-        if not _tem_imoveis_na_pagina(driver):
-            logger.info("Nenhum elemento de imóvel encontrado na página")
-            return None
-        
-        # Procurar botões de navegação
-        botao = _encontrar_botao_proximo(driver)
-        
-        if botao:
-            logger.info(f"Botão de próxima página encontrado: '{botao.text}'")
-        else:
-            logger.info("Nenhum botão de próxima página válido encontrado")
-        
-        return botao
-        
+        estado = sondar_paginacao(driver)
     except Exception as e:
         logger.error(f"Erro ao verificar próxima página: {e}", exc_info=True)
         return None
+    
+    if estado.sem_resultado:
+        logger.info("Detectada mensagem de 'nenhum resultado'")
+    elif not estado.tem_resultados:
+        logger.info("Nenhum elemento de imóvel encontrado na página")
+    elif estado.proximo is not None:
+        logger.info(f"Botão de próxima página encontrado: '{estado.texto_proximo}'")
+    else:
+        logger.info("Nenhum botão de próxima página válido encontrado")
+    
+    return estado.proximo
+
+
+def _sondar_por_elementos(driver: WebDriver) -> EstadoPaginacao:
+    """
+    Estado da paginação pelas estratégias elemento a elemento (fallback).
+    
+    Args:
+        driver: Instância do WebDriver
+        
+    Returns:
+        EstadoPaginacao sem página atual/total
+    """
+    if _tem_mensagem_sem_resultado(driver):
+        return EstadoPaginacao(sem_resultado=True, via_fallback=True)
+    
+    quantidade = _contar_imoveis_na_pagina(driver)
+    if not quantidade:
+        return EstadoPaginacao(via_fallback=True)
+    
+    botao = _encontrar_botao_proximo(driver)
+    return EstadoPaginacao(
+        quantidade=quantidade,
+        proximo=botao,
+        texto_proximo=botao.text if botao is not None else "",
+        via_fallback=True,
+    )
 
 
 def _tem_mensagem_sem_resultado(driver: WebDriver) -> bool:
@@ -76,20 +264,20 @@ def _tem_mensagem_sem_resultado(driver: WebDriver) -> bool:
     return len(mensagens) > 0
 
 
-def _tem_imoveis_na_pagina(driver: WebDriver) -> bool:
+def _contar_imoveis_na_pagina(driver: WebDriver) -> int:
     """
-    Verifica se há elementos de imóveis na página.
+    Conta os elementos de imóveis na página.
     
     Args:
         driver: Instância do WebDriver
         
     Returns:
-        True se há elementos de imóveis
+        Quantidade de links de detalhe de imóvel
     """
     elementos = driver.find_elements(
         By.CSS_SELECTOR, "a[onclick*='detalhe_imovel']"
     )
-    return len(elementos) > 0
+    return len(elementos)
 
 
 def _encontrar_botao_proximo(driver: WebDriver) -> Optional[WebElement]:
@@ -0,0 +1,401 @@
+"""
+Execução paralela de buscas em várias cidades.
+
+Cada worker (thread) usa um recurso exclusivo durante a busca: um
+WebDriver alugado do ``DriverPool`` ou uma sessão ``HttpSearchEngine``
+própria da thread. Falhas e timeouts ficam isolados na cidade em que
+ocorreram e os resultados voltam na ordem das tarefas.
+
+Com ``batch_by_state`` (motor Selenium), as cidades de um mesmo estado
+formam um lote executado em sequência com um único driver: o estado é
+selecionado uma vez e as cidades seguintes reaproveitam a página aberta
+(``SessaoEstado``).
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .checkpoint import DiarioExecucao
+from .config import ScraperConfig
+from .exceptions import BuscaInterrompida
+from .http_engine import HttpSearchEngine
+from .logger import get_logger
+from .metricas_driver import obter_contador_comandos
+from .paginacao import SessaoEstado
+from .pool import DriverPool
+from .rastreamento import obter_rastreador
+from .rate_limit import obter_rate_limiter
+from .types import FiltrosBusca
+
+logger = get_logger(__name__)
+
+# Intervalo (segundos) entre verificações de timeout das cidades em andamento
+_INTERVALO_VIGIA = 1.0
+
+# Imóveis encontrados ou erro de uma cidade de um lote
+SaidaCidade = Tuple[List[Dict[str, Any]], Optional[BaseException]]
+
+
+@dataclass
+class ResultadoCidade:
+    """Resultado da busca em uma cidade."""
+
+    filtros: FiltrosBusca
+    imoveis: List[Dict[str, Any]] = field(default_factory=list)
+    erro: Optional[str] = None
+    duracao: float = 0.0
+    # Paginação interrompida: ``imoveis`` tem só as páginas lidas (e ``erro`` o motivo)
+    interrompida: bool = False
+
+    @property
+    def sucesso(self) -> bool:
+        """True se a busca terminou sem erro (mesmo sem imóveis)."""
+        return self.erro is None
+
+    @property
+    def rotulo(self) -> str:
+        """Identificação "CIDADE/UF" usada nos relatórios."""
+        return f"{self.filtros['nome_cidade']}/{self.filtros['estado']}"
+
+
+class _Execucao:
+    """Estado de uma cidade em andamento (para o vigia de timeout)."""
+
+    def __init__(self) -> None:
+        self.inicio = time.monotonic()
+        self.fim: Optional[float] = None
+        self.recurso: Any = None
+        self.expirada = False
+
+
+class OrquestradorBuscas:
+    """
+    Executa buscas de várias cidades com concorrência limitada.
+
+    Examples:
+        >>> orquestrador = OrquestradorBuscas(ScraperConfig(max_workers=4))
+        >>> for resultado in orquestrador.executar(lista_de_filtros):
+        ...     print(resultado.rotulo, len(resultado.imoveis), resultado.erro)
+    """
+
+    def __init__(
+        self,
+        config: Optional[ScraperConfig] = None,
+        buscar: Optional[Callable[..., List[Dict[str, Any]]]] = None,
+        diario: Optional[DiarioExecucao] = None,
+    ) -> None:
+        """
+        Inicializa o orquestrador.
+
+        Args:
+            config: Configuração do scraper (usa ``max_workers``, ``city_timeout``,
+                ``search_engine`` e ``batch_by_state``). Se None, usa configuração padrão.
+            buscar: Função ``(filtros, recurso, config) -> imóveis``. Padrão: a busca
+                do motor configurado, recebendo o driver ou o motor HTTP como recurso.
+                Com ``diario``, recebe também ``checkpoint=CheckpointCidade`` (se a
+                busca o marcar como interrompido, a cidade volta com erro); em
+                lotes por estado, ``sessao=SessaoEstado``.
+            diario: Diário da execução. As cidades já concluídas nele voltam do
+                banco sem nova busca e as interrompidas continuam da última página.
+        """
+        self.config = config or ScraperConfig()
+        self.max_workers = max(1, self.config.max_workers)
+        self.timeout_cidade = float(self.config.city_timeout)
+        self._buscar = buscar or _busca_padrao
+        self.diario = diario
+        self._local = threading.local()
+        self._motores: List[HttpSearchEngine] = []
+        self._trava = threading.Lock()
+
+    def executar(self, tarefas: List[FiltrosBusca]) -> List[ResultadoCidade]:
+        """
+        Executa as buscas e aguarda todas terminarem.
+
+        Args:
+            tarefas: Filtros de cada cidade
+
+        Returns:
+            Um ResultadoCidade por tarefa, na mesma ordem
+        """
+        inicio = time.monotonic()
+        resultados: Dict[int, ResultadoCidade] = {}
+        execucoes: Dict[int, _Execucao] = {}
+        usar_http = self.config.search_engine == "http"
+
+        # O pool precisa de um navegador por worker; com HTTP ele nunca cria drivers
+        pool = DriverPool(replace(self.config, pool_size=self.max_workers))
+
+        logger.info(
+            f"Iniciando {len(tarefas)} buscas com {self.max_workers} worker(s) "
+            f"(motor {self.config.search_engine}, timeout {self.timeout_cidade:.0f}s por cidade)"
+        )
+
+        if self.diario is not None:
+            logger.info(f"Diário da execução {self.diario.run_id}: {self.diario.resumo()}")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="busca") as executor:
+                futuros: Dict[Future, List[int]] = {}
+                for lote in self._lotes(tarefas, usar_http):
+                    pendentes_lote = []
+                    for indice in lote:
+                        restaurado = self._restaurar(tarefas[indice])
+                        if restaurado is not None:
+                            resultados[indice] = restaurado
+                            continue
+                        execucoes[indice] = _Execucao()
+                        pendentes_lote.append(indice)
+                    if not pendentes_lote:
+                        continue
+                    cidades = [(tarefas[i], execucoes[i]) for i in pendentes_lote]
+                    futuro = executor.submit(self._executar_lote, cidades, pool, usar_http)
+                    futuros[futuro] = pendentes_lote
+
+                pendentes = set(futuros)
+                while pendentes:
+                    concluidos, pendentes = wait(pendentes, timeout=_INTERVALO_VIGIA, return_when=FIRST_COMPLETED)
+                    for futuro in concluidos:
+                        indices = futuros[futuro]
+                        saidas = self._saidas_lote(futuro, len(indices))
+                        for indice, (imoveis, erro) in zip(indices, saidas):
+                            resultados[indice] = self._coletar(tarefas[indice], execucoes[indice], imoveis, erro)
+                    self._vigiar(execucoes, resultados, tarefas)
+        finally:
+            pool.fechar()
+            self._fechar_motores()
+
+        ordenados = [resultados[i] for i in range(len(tarefas))]
+        falhas = sum(1 for r in ordenados if not r.sucesso)
+        logger.info(
+            f"{len(ordenados)} cidades em {time.monotonic() - inicio:.1f}s "
+            f"({falhas} com falha, {sum(len(r.imoveis) for r in ordenados)} imóveis)"
+        )
+        logger.info(f"Limite de taxa: {obter_rate_limiter(self.config).relatorio()}")
+        logger.info(f"Tempo por fase (todas as cidades):\n{obter_rastreador().tabela()}")
+        if not usar_http:
+            logger.info(f"Comandos WebDriver por fase:\n{obter_contador_comandos().relatorio()}")
+        return ordenados
+
+    def _restaurar(self, filtros: FiltrosBusca) -> Optional[ResultadoCidade]:
+        """Resultado de uma cidade já concluída no diário, com os imóveis do banco."""
+        if self.diario is None or self.diario.concluida(filtros) is None:
+            return None
+        imoveis = self.diario.cidade(filtros).imoveis_gravados()
+        logger.info(f"⏭️ {filtros['nome_cidade']}/{filtros['estado']} já concluída: {len(imoveis)} imóveis do banco")
+        return ResultadoCidade(filtros, imoveis=imoveis)
+
+    def _lotes(self, tarefas: List[FiltrosBusca], usar_http: bool) -> List[List[int]]:
+        """
+        Agrupa os índices das tarefas em lotes executados por um mesmo worker.
+
+        Sem ``batch_by_state`` (ou com o motor HTTP, que já reaproveita a
+        sessão da thread), cada cidade é um lote. Com ele, as cidades de um
+        estado formam um lote; se houver menos lotes que workers, os maiores
+        são divididos ao meio (cada parte seleciona o estado uma vez).
+        """
+        if usar_http or not self.config.batch_by_state:
+            return [[indice] for indice in range(len(tarefas))]
+
+        por_estado: Dict[str, List[int]] = {}
+        for indice, filtros in enumerate(tarefas):
+            por_estado.setdefault(filtros["estado"], []).append(indice)
+
+        lotes = list(por_estado.values())
+        while len(lotes) < self.max_workers:
+            maior = max(lotes, key=len, default=[])
+            if len(maior) < 2:
+                break
+            lotes.remove(maior)
+            meio = len(maior) // 2
+            lotes += [maior[:meio], maior[meio:]]
+        return lotes
+
+    def _executar_lote(
+        self,
+        cidades: List[Tuple[FiltrosBusca, _Execucao]],
+        pool: DriverPool,
+        usar_http: bool,
+    ) -> List[SaidaCidade]:
+        """
+        Executa as cidades de um lote em sequência, no worker atual.
+
+        Com Selenium, o mesmo driver atende todo o lote (com uma SessaoEstado
+        quando há mais de uma cidade). Depois de um erro ou timeout ele é
+        descartado e a cidade seguinte aluga outro. Com HTTP, o motor da thread
+        cancelado por timeout é trocado por uma sessão nova.
+        """
+        if usar_http:
+            saidas = []
+            for filtros, execucao in cidades:
+                motor = self._motor_da_thread()
+                saidas.append(self._executar_cidade(filtros, execucao, motor))
+                if execucao.expirada or motor.cancelado:
+                    # Motor cancelado pelo vigia: a próxima cidade abre outra sessão
+                    self._local.motor = None
+            return saidas
+
+        saidas: List[SaidaCidade] = []
+        sessao = SessaoEstado() if len(cidades) > 1 else None
+        driver = None
+        try:
+            for filtros, execucao in cidades:
+                if driver is None:
+                    try:
+                        driver = pool.alugar()
+                    except Exception as e:
+                        saidas.append(([], e))
+                        continue
+                saida = self._executar_cidade(filtros, execucao, driver, sessao)
+                saidas.append(saida)
+                if saida[1] is not None or execucao.expirada:
+                    pool.devolver(driver, descartar=True)
+                    driver = None
+                    if sessao is not None:
+                        sessao.invalidar()
+        finally:
+            if driver is not None:
+                pool.devolver(driver)
+
+        if sessao is not None and sessao.buscas:
+            logger.info(f"Sessão de {cidades[0][0]['estado']}: {sessao.buscas} cidade(s) sem recarregar o formulário")
+        return saidas
+
+    def _executar_cidade(
+        self,
+        filtros: FiltrosBusca,
+        execucao: _Execucao,
+        recurso: Any,
+        sessao: Optional[SessaoEstado] = None,
+    ) -> SaidaCidade:
+        """Executa uma busca no worker atual, com o recurso exclusivo dele."""
+        execucao.inicio = time.monotonic()
+        logger.info(f"🏙️ Buscando em {filtros['nome_cidade']}/{filtros['estado']}...")
+
+        extras: Dict[str, Any] = {}
+        if sessao is not None:
+            extras["sessao"] = sessao
+
+        execucao.recurso = recurso
+        try:
+            anteriores: List[Dict[str, Any]] = []
+            checkpoint = None
+            if self.diario is not None:
+                checkpoint = self.diario.cidade(filtros)
+                extras["checkpoint"] = checkpoint
+                if checkpoint.pagina_inicial > 1:
+                    anteriores = checkpoint.imoveis_gravados(ate_pagina=checkpoint.pagina_inicial - 1)
+            imoveis = anteriores + (self._buscar(filtros, recurso, self.config, **extras) or [])
+            # A busca registra no log e no checkpoint as falhas de paginação e
+            # devolve só as páginas lidas: a cidade não terminou
+            if checkpoint is not None and checkpoint.erro is not None:
+                return imoveis, BuscaInterrompida(f"Busca interrompida: {checkpoint.erro}")
+            return imoveis, None
+        except Exception as e:
+            return [], e
+        finally:
+            execucao.recurso = None
+            execucao.fim = time.monotonic()
+
+    @staticmethod
+    def _saidas_lote(futuro: Future, quantidade: int) -> List[SaidaCidade]:
+        """Saídas das cidades de um lote concluído (o mesmo erro para todas se o lote falhou)."""
+        try:
+            return futuro.result()
+        except Exception as e:
+            return [([], e)] * quantidade
+
+    def _coletar(
+        self,
+        filtros: FiltrosBusca,
+        execucao: _Execucao,
+        imoveis: List[Dict[str, Any]],
+        erro: Optional[BaseException],
+    ) -> ResultadoCidade:
+        """Converte a saída de uma cidade em ResultadoCidade."""
+        duracao = (execucao.fim or time.monotonic()) - execucao.inicio
+        if execucao.expirada:
+            return ResultadoCidade(filtros, erro=f"Timeout de {self.timeout_cidade:.0f}s", duracao=duracao)
+
+        if isinstance(erro, BuscaInterrompida):
+            logger.error(f"❌ {filtros['nome_cidade']}/{filtros['estado']}: {erro} ({len(imoveis)} imóveis lidos)")
+            return ResultadoCidade(filtros, imoveis=imoveis, erro=str(erro), duracao=duracao, interrompida=True)
+
+        if erro is not None:
+            logger.error(f"❌ Erro em {filtros['nome_cidade']}/{filtros['estado']}: {erro}")
+            return ResultadoCidade(filtros, erro=str(erro), duracao=duracao)
+
+        logger.info(f"✅ {filtros['nome_cidade']}/{filtros['estado']}: {len(imoveis)} imóveis em {duracao:.1f}s")
+        return ResultadoCidade(filtros, imoveis=imoveis, duracao=duracao)
+
+    def _vigiar(
+        self,
+        execucoes: Dict[int, _Execucao],
+        resultados: Dict[int, ResultadoCidade],
+        tarefas: List[FiltrosBusca],
+    ) -> None:
+        """
+        Interrompe as cidades que passaram do timeout.
+
+        Threads não podem ser mortas; a busca é abortada encerrando o recurso
+        em uso (``driver.quit()`` ou ``HttpSearchEngine.cancelar()``), o que
+        faz o próximo comando do worker falhar. O driver é então descartado
+        pelo pool e o motor HTTP substituído por uma sessão nova.
+        """
+        agora = time.monotonic()
+        for indice, execucao in execucoes.items():
+            if indice in resultados or execucao.expirada or execucao.fim is not None or execucao.recurso is None:
+                continue
+            if agora - execucao.inicio <= self.timeout_cidade:
+                continue
+
+            execucao.expirada = True
+            filtros = tarefas[indice]
+            logger.error(f"⏱️ {filtros['nome_cidade']}/{filtros['estado']} excedeu {self.timeout_cidade:.0f}s; abortando")
+            _abortar(execucao.recurso)
+
+    def _motor_da_thread(self) -> HttpSearchEngine:
+        """Sessão HTTP exclusiva do worker atual (criada na primeira busca)."""
+        motor = getattr(self._local, "motor", None)
+        if motor is None:
+            motor = HttpSearchEngine(self.config)
+            self._local.motor = motor
+            with self._trava:
+                self._motores.append(motor)
+        return motor
+
+    def _fechar_motores(self) -> None:
+        with self._trava:
+            motores, self._motores = self._motores, []
+        for motor in motores:
+            motor.fechar()
+
+
+def _busca_padrao(
+    filtros: FiltrosBusca,
+    recurso: Any,
+    config: ScraperConfig,
+    checkpoint: Any = None,
+    sessao: Optional[SessaoEstado] = None,
+) -> List[Dict[str, Any]]:
+    """Busca com o motor configurado, usando o driver ou o motor HTTP do worker."""
+    from .scraper import buscar_imoveis_com_filtros, buscar_imoveis_via_http
+
+    if isinstance(recurso, HttpSearchEngine):
+        return buscar_imoveis_via_http(filtros, config=config, motor=recurso, checkpoint=checkpoint)
+    return buscar_imoveis_com_filtros(
+        filtros, driver=recurso, config=config, checkpoint=checkpoint, sessao=sessao
+    )
+
+
+def _abortar(recurso: Any) -> None:
+    """Encerra o driver ou a sessão HTTP de uma busca expirada."""
+    try:
+        if isinstance(recurso, HttpSearchEngine):
+            recurso.cancelar()
+        else:
+            recurso.quit()
+    except Exception as e:
+        logger.debug(f"Erro ao abortar busca expirada: {e}")
@@ -0,0 +1,396 @@
+"""
+Paginação direta dos resultados no navegador.
+
+A lista de resultados guarda os IDs de cada página em inputs ocultos
+``hdnImov1..N``, e os links numéricos chamam uma função JavaScript que
+envia esses IDs a ``carregaListaImoveis.asp``. Em vez de clicar em
+"próxima" e esperar, o paginador:
+
+- baixa o HTML da página N pelo próprio navegador (XHR na sessão da busca),
+  em qualquer ordem, sem alterar o DOM; ou
+- chama a função de troca de página para ir direto à página N, detectando
+  a conclusão pela mudança do marcador da lista (``waits.dom_mudou``).
+
+O total de páginas é conhecido logo após a busca, então a coleta vai até
+a última página real em vez de depender de um limite fixo.
+
+Na busca em lote (``SessaoEstado``), a própria pesquisa de uma nova cidade
+também é feita por XHR (``pesquisar``) na página já aberta, sem recarregar
+o formulário nem selecionar o estado de novo.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .config import ENDPOINT_LISTA_IMOVEIS, ENDPOINT_PESQUISA_IMOVEIS, ScraperConfig
+from .exceptions import NavigationError
+from .html_parser import extrair_imoveis_do_html
+from .http_engine import extrair_paginas_de_ids, montar_parametros_busca, pagina_bloqueada
+from .logger import get_logger
+from .rastreamento import span
+from .rate_limit import RateLimiter
+from .types import FiltrosBusca
+from .waits import WaitEngine, dom_mudou, marcador_resultados
+
+logger = get_logger(__name__)
+
+_JS_DESCOBRIR_PAGINACAO = """
+var grupos = {};
+var campos = document.querySelectorAll("input[id^='hdnImov'], input[name^='hdnImov']");
+for (var i = 0; i < campos.length; i++) {
+    var m = /^hdnImov(\\d+)$/.exec(campos[i].id || campos[i].name || '');
+    if (m && campos[i].value) { grupos[m[1]] = campos[i].value; }
+}
+
+var total = null;
+var qtd = document.getElementById('hdnQtdPag');
+if (qtd && /^\\d+$/.test(qtd.value)) { total = parseInt(qtd.value, 10); }
+if (total === null && Object.keys(grupos).length) { total = Object.keys(grupos).length; }
+
+var modelo = null;
+var links = document.querySelectorAll('a');
+for (var j = 0; j < links.length; j++) {
+    var t = (links[j].textContent || '').trim();
+    if (!/^\\d+$/.test(t)) { continue; }
+    var href = links[j].getAttribute('href') || '';
+    var codigo = links[j].getAttribute('onclick') || (href.indexOf('javascript:') === 0 ? href.substring(11) : '');
+    var chamada = new RegExp('\\\\(\\\\s*[\\'"]?' + t + '[\\'"]?\\\\s*[,)]');
+    if (codigo && chamada.test(codigo)) {
+        modelo = codigo.replace(/^\\s*javascript:/, '').replace(new RegExp('\\\\b' + t + '\\\\b'), '{pagina}');
+        total = Math.max(total || 0, parseInt(t, 10));
+    }
+}
+return {grupos: grupos, total: total, modelo: modelo};
+"""
+
+_JS_INICIAR_DOWNLOAD = """
+var chave = arguments[0];
+window.__paginasBaixadas = window.__paginasBaixadas || {};
+var estado = window.__paginasBaixadas[chave] = {pronto: false, status: 0, html: ''};
+var xhr = new XMLHttpRequest();
+xhr.open('POST', arguments[1], true);
+xhr.timeout = arguments[3];
+xhr.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+xhr.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+xhr.overrideMimeType('text/html; charset=' + (document.characterSet || 'iso-8859-1'));
+xhr.onload = function () { estado.status = xhr.status; estado.html = xhr.responseText; estado.pronto = true; };
+xhr.onerror = xhr.ontimeout = function () { estado.pronto = true; };
+xhr.send(arguments[2]);
+"""
+
+_JS_RECEBER_DOWNLOAD = """
+var chave = arguments[0];
+var concluir = arguments[arguments.length - 1];
+(function esperar() {
+    var baixadas = window.__paginasBaixadas || {};
+    var estado = baixadas[chave];
+    if (!estado) { concluir(null); return; }
+    if (!estado.pronto) { setTimeout(esperar, 20); return; }
+    delete baixadas[chave];
+    concluir({status: estado.status, html: estado.html});
+})();
+"""
+
+ExtrairPagina = Callable[[int], List[Dict[str, Any]]]
+
+
+class SessaoEstado:
+    """
+    Página de busca de um estado mantida aberta entre cidades (busca em lote).
+
+    A primeira cidade de um estado passa pelo formulário completo (carregar
+    a página, selecionar o estado, esperar as cidades); as seguintes, no
+    mesmo driver, são pesquisadas por XHR na página já aberta. A sessão só
+    vale dentro de um empréstimo do pool, que reseta o driver ao devolvê-lo.
+
+    Examples:
+        >>> sessao = SessaoEstado()
+        >>> for filtros in cidades_do_estado:
+        ...     buscar_imoveis_com_filtros(filtros, driver=driver, sessao=sessao)
+    """
+
+    def __init__(self) -> None:
+        self.driver: Optional[WebDriver] = None
+        self.estado: Optional[str] = None
+        self.buscas = 0
+
+    def aberta(self, driver: WebDriver, estado: str) -> bool:
+        """True se o driver já está com a página de busca do estado carregada."""
+        return self.driver is driver and self.estado == estado
+
+    def registrar(self, driver: WebDriver, estado: str) -> None:
+        """Marca a página de busca do estado como aberta no driver."""
+        self.driver = driver
+        self.estado = estado
+
+    def invalidar(self) -> None:
+        """Esquece a página aberta (driver descartado ou página em estado desconhecido)."""
+        self.driver = None
+        self.estado = None
+
+
+class PaginadorDireto:
+    """
+    Coleta todas as páginas de resultados da busca aberta no driver.
+
+    Examples:
+        >>> paginador = PaginadorDireto(driver, esperas, limitador, config)
+        >>> if paginador.preparar():
+        ...     for numero, imoveis in paginador.paginas(extrair_pagina_atual, filtros):
+        ...         ...
+        ... else:
+        ...     ...  # sem mecanismo de salto: usar o clique em "próxima"
+    """
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        esperas: WaitEngine,
+        limitador: RateLimiter,
+        config: Optional[ScraperConfig] = None,
+    ) -> None:
+        """
+        Inicializa o paginador.
+
+        Args:
+            driver: Driver com a página de resultados aberta
+            esperas: Motor de esperas da busca (orçamento compartilhado)
+            limitador: Limitador de taxa do site
+            config: Configuração do scraper. Se None, usa configuração padrão.
+        """
+        self.driver = driver
+        self.esperas = esperas
+        self.limitador = limitador
+        self.config = config or ScraperConfig()
+        self.total_paginas: Optional[int] = None
+        self.grupos: Dict[int, str] = {}
+        self.modelo_salto: Optional[str] = None
+
+    def descobrir(self) -> Optional[int]:
+        """
+        Lê o total de páginas, os IDs por página e a função de troca de página.
+
+        Returns:
+            Total de páginas ou None se não foi possível determinar
+        """
+        try:
+            bruto = self.driver.execute_script(_JS_DESCOBRIR_PAGINACAO) or {}
+        except Exception as e:
+            logger.warning(f"Falha ao descobrir a paginação: {e}")
+            return None
+
+        self.grupos = {int(n): ids for n, ids in (bruto.get("grupos") or {}).items()}
+        self.modelo_salto = bruto.get("modelo")
+        self.total_paginas = bruto.get("total")
+
+        logger.info(
+            f"Paginação: {self.total_paginas or '?'} página(s), "
+            f"{len(self.grupos)} grupo(s) de IDs, salto {'via ' + self.modelo_salto if self.modelo_salto else 'indisponível'}"
+        )
+        return self.total_paginas
+
+    def alcancavel(self, numero: int) -> bool:
+        """True se a página pode ser obtida sem clicar em "próxima"."""
+        return numero in self.grupos or self.modelo_salto is not None
+
+    def iniciar_download(self, numero: int) -> None:
+        """
+        Dispara no navegador o download da lista de uma página, sem esperar.
+
+        A resposta fica guardada na página até ``receber_html``; a página
+        exibida não muda, então os downloads podem ser feitos em qualquer
+        ordem e em paralelo com a extração.
+
+        Args:
+            numero: Número da página (precisa estar em ``grupos``)
+        """
+        self._iniciar_post(f"pagina_{numero}", ENDPOINT_LISTA_IMOVEIS, {"hdnImov": self.grupos[numero]})
+
+    def receber_html(self, numero: int) -> str:
+        """
+        Espera o download iniciado por ``iniciar_download`` e retorna o HTML.
+
+        Args:
+            numero: Número da página
+
+        Returns:
+            HTML da lista de imóveis
+
+        Raises:
+            NavigationError: Se o download não foi iniciado nesta página,
+                em erro HTTP ou página de bloqueio
+        """
+        return self._receber(f"pagina_{numero}", f"Página {numero}", ENDPOINT_LISTA_IMOVEIS)
+
+    def pesquisar(self, filtros: FiltrosBusca) -> int:
+        """
+        Faz a pesquisa dos filtros por XHR na página aberta, sem usar o formulário.
+
+        Envia os mesmos campos do formulário a ``carregaPesquisaImoveis.asp``
+        e lê os grupos de IDs de cada página da resposta. Depois disso,
+        ``paginas(None, filtros)`` baixa todas as páginas, inclusive a 1.
+
+        Args:
+            filtros: Filtros da busca (mesmo formato de buscar_imoveis_com_filtros)
+
+        Returns:
+            Total de páginas (0 se a busca não tem resultados)
+
+        Raises:
+            NavigationError: Em erro HTTP ou página de bloqueio
+        """
+        with span("submit", cidade=filtros["nome_cidade"], via="xhr"):
+            self._iniciar_post("pesquisa", ENDPOINT_PESQUISA_IMOVEIS, montar_parametros_busca(filtros))
+            html = self._receber("pesquisa", "Pesquisa", ENDPOINT_PESQUISA_IMOVEIS)
+
+        paginas = extrair_paginas_de_ids(html)
+        self.grupos = {numero: "||".join(ids) for numero, ids in enumerate(paginas, start=1)}
+        self.total_paginas = len(paginas)
+        self.modelo_salto = None
+        logger.info(f"Pesquisa por XHR: {self.total_paginas} página(s) em {filtros['nome_cidade']}/{filtros['estado']}")
+        return self.total_paginas
+
+    def _iniciar_post(self, chave: str, endpoint: str, campos: Dict[str, str]) -> None:
+        """Dispara um POST (XHR) no navegador; a resposta fica guardada sob ``chave``."""
+        self.limitador.adquirir()
+        self.driver.execute_script(
+            _JS_INICIAR_DOWNLOAD, chave, endpoint, urlencode(campos), int(self.config.timeout * 1000)
+        )
+
+    def _receber(self, chave: str, descricao: str, endpoint: str) -> str:
+        """Espera a resposta do POST iniciado sob ``chave`` e retorna o HTML."""
+        self.driver.set_script_timeout(self.config.timeout + 5)
+        resposta = self.driver.execute_async_script(_JS_RECEBER_DOWNLOAD, chave)
+        if resposta is None:
+            raise NavigationError(f"{descricao}: download não encontrado (a página foi recarregada?)")
+
+        html = resposta.get("html") or ""
+        if resposta.get("status") != 200:
+            raise NavigationError(f"{descricao}: HTTP {resposta.get('status')} em {endpoint}")
+        if pagina_bloqueada(html):
+            raise NavigationError(f"{descricao} bloqueada pelo bot manager")
+        return html
+
+    def baixar_html(self, numero: int) -> str:
+        """
+        Baixa o HTML da lista de uma página pela sessão do navegador.
+
+        Args:
+            numero: Número da página (precisa estar em ``grupos``)
+
+        Returns:
+            HTML da lista de imóveis
+        """
+        self.iniciar_download(numero)
+        return self.receber_html(numero)
+
+    def ir_para(self, numero: int) -> bool:
+        """
+        Exibe a página ``numero`` chamando a função de troca de página do site.
+
+        Args:
+            numero: Número da página
+
+        Returns:
+            True se a lista exibida mudou
+        """
+        if not self.modelo_salto:
+            return False
+
+        marcador_antes = marcador_resultados(self.driver)
+        self.limitador.adquirir()
+        try:
+            self.driver.execute_script(self.modelo_salto.replace("{pagina}", str(numero)))
+        except Exception as e:
+            logger.warning(f"Falha ao saltar para a página {numero}: {e}")
+            return False
+        return self.esperas.tentar(f"pagina_{numero}", dom_mudou(marcador_antes)) is not None
+
+    def preparar(self) -> bool:
+        """
+        Descobre a paginação e confirma que todas as páginas são alcançáveis.
+
+        Returns:
+            True se ``paginas`` pode ser usado; False para cair na navegação
+            por clique (total desconhecido ou páginas inalcançáveis)
+        """
+        total = self.descobrir()
+        if not total:
+            return False
+        if not all(self.alcancavel(n) for n in range(2, total + 1)):
+            logger.info("Nem todas as páginas são alcançáveis diretamente; usando navegação por clique")
+            return False
+        return True
+
+    def paginas(
+        self,
+        extrair_pagina_atual: Optional[ExtrairPagina],
+        filtros: FiltrosBusca,
+        pagina_inicial: int = 1,
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Gera os imóveis de cada página assim que ela é extraída.
+
+        Requer ``preparar()`` ou ``pesquisar()``. A página 1 (já exibida) é
+        extraída do DOM; as demais são baixadas pelo XHR quando há grupo de
+        IDs, ou exibidas pelo salto direto. Sem ``extrair_pagina_atual``
+        (após ``pesquisar``), a página 1 também é baixada. Com ``prefetch_pages``, o download da página seguinte é
+        disparado antes de extrair a atual, então cada página custa perto de
+        max(carregamento, extração) em vez da soma.
+
+        Args:
+            extrair_pagina_atual: Função que extrai os imóveis da página exibida,
+                recebendo o número da página. None: nenhuma página exibida.
+            filtros: Filtros da busca (gravados em ``filtros_usados``)
+            pagina_inicial: Primeira página a gerar (para retomar uma busca)
+
+        Yields:
+            (número da página, imóveis da página)
+
+        Raises:
+            NavigationError: Se uma página não pôde ser baixada nem exibida
+        """
+        total = self.total_paginas or (1 if extrair_pagina_atual is not None else 0)
+        iniciadas = set()
+        primeira = 1 if extrair_pagina_atual is None else 2
+
+        def antecipar(numero: int) -> None:
+            if numero <= total and numero in self.grupos and numero not in iniciadas:
+                try:
+                    self.iniciar_download(numero)
+                    iniciadas.add(numero)
+                except WebDriverException as e:
+                    logger.warning(f"Falha ao antecipar a página {numero}: {e}")
+
+        if self.config.prefetch_pages:
+            antecipar(max(primeira, pagina_inicial))
+        if primeira > 1 and pagina_inicial <= 1:
+            yield 1, extrair_pagina_atual(1)
+
+        for numero in range(max(primeira, pagina_inicial), total + 1):
+            pagina: Optional[List[Dict[str, Any]]] = None
+            if numero in self.grupos:
+                try:
+                    antecipar(numero)
+                    with span("page_load", pagina=numero):
+                        html = self.receber_html(numero)
+                    if self.config.prefetch_pages:
+                        antecipar(numero + 1)
+                    with span("page_extract", pagina=numero):
+                        pagina = extrair_imoveis_do_html(html, url_base=self.config.site_url)
+                except (NavigationError, WebDriverException) as e:
+                    logger.warning(f"Falha ao baixar a página {numero}: {e}")
+                else:
+                    for dados in pagina:
+                        dados["pagina"] = numero
+                        dados["filtros_usados"] = str(filtros)
+            if pagina is None and extrair_pagina_atual is not None and self.ir_para(numero):
+                pagina = extrair_pagina_atual(numero)
+            if pagina is None:
+                raise NavigationError(f"Não foi possível exibir a página {numero} de {total}")
+
+            logger.info(f"✅ Página {numero}/{total}: {len(pagina)} imóveis")
+            yield numero, pagina
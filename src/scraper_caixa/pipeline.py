@@ -0,0 +1,194 @@
+"""
+Pipeline em estágios com filas limitadas.
+
+Cada estágio roda em uma thread própria e recebe os itens do estágio
+anterior por uma ``queue.Queue`` com capacidade fixa: quando um estágio
+lento enche a fila, quem produz espera (backpressure) em vez de acumular
+páginas em memória. A ordem dos itens é preservada (um worker por
+estágio). Ao fechar, os itens já enviados são processados até o fim.
+
+Usado pelas buscas para validar e gravar as páginas enquanto o navegador
+(ou o motor HTTP) continua extraindo as seguintes.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Marca o fim do stream entre os estágios
+_FIM = object()
+
+Funcao = Callable[[Any], Any]
+
+
+@dataclass
+class MetricasEstagio:
+    """Contadores de um estágio."""
+
+    nome: str
+    itens: int = 0
+    ocupado: float = 0.0  # segundos processando itens
+    bloqueado: float = 0.0  # segundos esperando espaço na fila seguinte
+
+    def resumo(self, duracao: float) -> str:
+        """Uma linha com a vazão e a ocupação do estágio."""
+        vazao = self.itens / duracao if duracao > 0 else 0.0
+        ocupacao = self.ocupado / duracao * 100 if duracao > 0 else 0.0
+        return (
+            f"{self.nome}: {self.itens} itens, {vazao:.2f}/s, "
+            f"{self.ocupado:.2f}s ocupado ({ocupacao:.0f}%), {self.bloqueado:.2f}s bloqueado"
+        )
+
+
+class Pipeline:
+    """
+    Encadeia funções em estágios conectados por filas limitadas.
+
+    Cada função recebe o item do estágio anterior e devolve o item do
+    próximo (``None`` descarta o item). O resultado do último estágio é
+    descartado.
+
+    Examples:
+        >>> with Pipeline([("validacao", validar), ("gravacao", gravar)], capacidade=4) as pipeline:
+        ...     for pagina in paginas:
+        ...         pipeline.enviar(pagina)
+    """
+
+    def __init__(self, estagios: Sequence[Tuple[str, Funcao]], capacidade: int = 4) -> None:
+        """
+        Inicializa o pipeline e inicia as threads dos estágios.
+
+        Args:
+            estagios: Pares (nome, função), na ordem de execução
+            capacidade: Itens por fila entre estágios. Com 0 ou menos, os
+                estágios rodam na thread de quem chama ``enviar`` (sem filas).
+        """
+        self.capacidade = capacidade
+        self.metricas = [MetricasEstagio(nome) for nome, _ in estagios]
+        self.metricas_entrada = MetricasEstagio("entrada")
+        self._funcoes = [funcao for _, funcao in estagios]
+        self._erro: Optional[BaseException] = None
+        self._inicio = time.monotonic()
+        self._fechado = False
+
+        self._filas: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+        if capacidade <= 0:
+            return
+
+        self._filas = [queue.Queue(maxsize=capacidade) for _ in estagios]
+        for indice, (nome, _) in enumerate(estagios):
+            thread = threading.Thread(
+                target=self._executar_estagio, args=(indice,), name=f"pipeline-{nome}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def enviar(self, item: Any) -> None:
+        """
+        Envia um item ao primeiro estágio.
+
+        Bloqueia enquanto a primeira fila estiver cheia.
+
+        Args:
+            item: Item a processar
+        """
+        if self._fechado:
+            raise RuntimeError("Pipeline já fechado")
+        self.metricas_entrada.itens += 1
+
+        if not self._filas:
+            for indice, funcao in enumerate(self._funcoes):
+                item = self._aplicar(indice, funcao, item)
+                if item is None:
+                    return
+            return
+
+        inicio = time.monotonic()
+        self._filas[0].put(item)
+        self.metricas_entrada.bloqueado += time.monotonic() - inicio
+
+    def fechar(self) -> None:
+        """
+        Sinaliza o fim do stream e espera os estágios processarem o que já foi enviado.
+
+        Raises:
+            Exception: O primeiro erro de um estágio, depois de esvaziar as filas
+        """
+        if self._fechado:
+            return
+        self._fechado = True
+
+        if self._filas:
+            self._filas[0].put(_FIM)
+            for thread in self._threads:
+                thread.join()
+
+        logger.info(f"Pipeline: {self.relatorio()}")
+        if self._erro is not None:
+            raise self._erro
+
+    def relatorio(self) -> str:
+        """Vazão, ocupação e tempo bloqueado de cada estágio."""
+        duracao = time.monotonic() - self._inicio
+        linhas = [self.metricas_entrada.resumo(duracao)] + [m.resumo(duracao) for m in self.metricas]
+        return "; ".join(linhas)
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.fechar()
+            return
+        # Já saindo com erro: esvaziar sem mascarar a exceção original
+        try:
+            self.fechar()
+        except Exception as e:
+            logger.error(f"Erro em estágio do pipeline durante o encerramento: {e}")
+
+    def _executar_estagio(self, indice: int) -> None:
+        """Laço da thread de um estágio: consome a fila, aplica a função e repassa."""
+        entrada = self._filas[indice]
+        saida = self._filas[indice + 1] if indice + 1 < len(self._filas) else None
+        funcao = self._funcoes[indice]
+        metricas = self.metricas[indice]
+
+        while True:
+            item = entrada.get()
+            if item is _FIM:
+                if saida is not None:
+                    saida.put(_FIM)
+                return
+
+            # Depois de um erro, os itens restantes só são drenados
+            if self._erro is not None:
+                continue
+            resultado = self._aplicar(indice, funcao, item)
+            if resultado is None or saida is None:
+                continue
+
+            inicio = time.monotonic()
+            saida.put(resultado)
+            metricas.bloqueado += time.monotonic() - inicio
+
+    def _aplicar(self, indice: int, funcao: Funcao, item: Any) -> Any:
+        """Executa a função do estágio, medindo o tempo e guardando o primeiro erro."""
+        metricas = self.metricas[indice]
+        inicio = time.monotonic()
+        try:
+            return funcao(item)
+        except Exception as e:
+            logger.error(f"Erro no estágio {metricas.nome} do pipeline: {e}")
+            if self._erro is None:
+                self._erro = e
+            return None
+        finally:
+            metricas.ocupado += time.monotonic() - inicio
+            metricas.itens += 1
@@ -0,0 +1,296 @@
+"""
+Pool de instâncias do ChromeDriver.
+
+Mantém navegadores "aquecidos" que podem ser alugados e devolvidos
+entre buscas, evitando um cold start do Chrome (e a consulta ao
+ChromeDriverManager) a cada cidade processada.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .config import ScraperConfig
+from .driver import configurar_chromedriver
+from .exceptions import ChromeDriverError
+from .logger import get_logger
+from .metricas_driver import instrumentar_driver
+from .rastreamento import span
+from .rate_limit import limitar_driver, obter_rate_limiter
+
+logger = get_logger(__name__)
+
+
+class DriverPool:
+    """
+    Pool thread-safe de WebDrivers reutilizáveis.
+
+    Cada driver é resetado ao ser devolvido (cookies, abas extras e
+    navegação), passa por um health check antes de ser alugado e é
+    reciclado depois de ``max_usos`` empréstimos.
+
+    Examples:
+        >>> with DriverPool(ScraperConfig(pool_size=2)) as pool:
+        ...     with pool.emprestimo() as driver:
+        ...         driver.get(URL_BASE)
+    """
+
+    def __init__(
+        self,
+        config: Optional[ScraperConfig] = None,
+        fabrica: Optional[Callable[[ScraperConfig], WebDriver]] = None,
+    ) -> None:
+        """
+        Inicializa o pool (sem iniciar navegadores).
+
+        Args:
+            config: Configuração do scraper. Se None, usa configuração padrão.
+            fabrica: Função que cria um WebDriver. Padrão: configurar_chromedriver.
+        """
+        self.config = config or ScraperConfig()
+        self.tamanho = max(1, self.config.pool_size)
+        self.max_usos = max(1, self.config.driver_max_uses)
+        self._fabrica = fabrica or configurar_chromedriver
+
+        self._condicao = threading.Condition()
+        self._livres: List[WebDriver] = []
+        self._usos: Dict[int, int] = {}
+        self._total_criados = 0
+        self._fechado = False
+
+        self.estatisticas = {
+            "criados": 0,
+            "reciclados": 0,
+            "descartados": 0,
+            "emprestimos": 0,
+        }
+
+    def aquecer(self, quantidade: Optional[int] = None) -> None:
+        """
+        Inicia navegadores antecipadamente até ``quantidade`` (padrão: tamanho do pool).
+
+        Args:
+            quantidade: Número de instâncias a deixar prontas
+        """
+        alvo = min(quantidade or self.tamanho, self.tamanho)
+        while True:
+            with self._condicao:
+                if self._fechado or self._total_criados >= alvo:
+                    return
+                self._total_criados += 1
+            driver = self._criar_driver_ou_liberar_vaga()
+            with self._condicao:
+                self._livres.append(driver)
+                self._condicao.notify()
+
+    def alugar(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Aluga um driver do pool, criando um novo se houver capacidade.
+
+        Args:
+            timeout: Tempo máximo (segundos) aguardando um driver livre
+
+        Returns:
+            WebDriver pronto para uso
+
+        Raises:
+            ChromeDriverError: Se o pool estiver fechado ou o timeout expirar
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            criar = False
+            with self._condicao:
+                while not self._livres and self._total_criados >= self.tamanho:
+                    if self._fechado:
+                        raise ChromeDriverError("Pool de drivers está fechado")
+                    restante = None if limite is None else limite - time.monotonic()
+                    if restante is not None and restante <= 0:
+                        raise ChromeDriverError("Timeout aguardando driver livre no pool")
+                    self._condicao.wait(restante)
+
+                if self._fechado:
+                    raise ChromeDriverError("Pool de drivers está fechado")
+
+                if self._livres:
+                    driver = self._livres.pop()
+                else:
+                    self._total_criados += 1
+                    criar = True
+
+            if criar:
+                driver = self._criar_driver_ou_liberar_vaga()
+            elif not self._driver_saudavel(driver):
+                logger.warning("Driver do pool falhou no health check; substituindo")
+                self._descartar(driver)
+                continue
+
+            with self._condicao:
+                self.estatisticas["emprestimos"] += 1
+            return driver
+
+    def devolver(self, driver: WebDriver, descartar: bool = False) -> None:
+        """
+        Devolve um driver ao pool.
+
+        O driver é resetado e volta para a fila de livres, ou é encerrado
+        se ``descartar`` for True, se atingiu ``max_usos`` ou se o reset falhar.
+
+        Args:
+            driver: Driver alugado anteriormente
+            descartar: Se deve encerrar o driver em vez de reutilizá-lo
+        """
+        with self._condicao:
+            usos = self._usos.get(id(driver), 0) + 1
+            self._usos[id(driver)] = usos
+            fechado = self._fechado
+
+        if fechado or descartar:
+            self._descartar(driver)
+            return
+
+        if usos >= self.max_usos:
+            logger.info(f"Reciclando driver após {usos} usos")
+            with self._condicao:
+                self.estatisticas["reciclados"] += 1
+            self._descartar(driver)
+            return
+
+        if not self._resetar_driver(driver):
+            self._descartar(driver)
+            return
+
+        with self._condicao:
+            self._livres.append(driver)
+            self._condicao.notify()
+
+    @contextmanager
+    def emprestimo(self, timeout: Optional[float] = None) -> Iterator[WebDriver]:
+        """
+        Context manager que aluga e devolve um driver automaticamente.
+
+        Se o bloco levantar uma exceção, o driver é descartado em vez de
+        voltar ao pool, já que seu estado é desconhecido.
+
+        Args:
+            timeout: Tempo máximo aguardando um driver livre
+
+        Yields:
+            WebDriver alugado
+        """
+        driver = self.alugar(timeout=timeout)
+        falhou = False
+        try:
+            yield driver
+        except BaseException:
+            falhou = True
+            raise
+        finally:
+            self.devolver(driver, descartar=falhou)
+
+    def fechar(self) -> None:
+        """Encerra todos os drivers livres e impede novos empréstimos."""
+        with self._condicao:
+            self._fechado = True
+            livres, self._livres = self._livres, []
+            self._condicao.notify_all()
+
+        for driver in livres:
+            self._descartar(driver)
+
+        logger.info(f"Pool de drivers encerrado: {self.estatisticas}")
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.fechar()
+
+    def _criar_driver(self) -> WebDriver:
+        """Cria um novo driver através da fábrica configurada."""
+        inicio = time.monotonic()
+        with span("driver_start", "driver"):
+            driver = self._fabrica(self.config)
+            driver.set_page_load_timeout(self.config.timeout)
+            instrumentar_driver(driver)
+            limitar_driver(driver, obter_rate_limiter(self.config))
+        with self._condicao:
+            self._usos[id(driver)] = 0
+            self.estatisticas["criados"] += 1
+        logger.info(f"Novo driver criado para o pool em {time.monotonic() - inicio:.2f}s")
+        return driver
+
+    def _criar_driver_ou_liberar_vaga(self) -> WebDriver:
+        """Cria um driver; se falhar, libera a vaga reservada no pool."""
+        try:
+            return self._criar_driver()
+        except Exception:
+            with self._condicao:
+                self._total_criados -= 1
+                self._condicao.notify()
+            raise
+
+    def _descartar(self, driver: WebDriver) -> None:
+        """Encerra um driver e libera sua vaga no pool."""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Erro ao encerrar driver descartado: {e}")
+
+        with self._condicao:
+            self._usos.pop(id(driver), None)
+            self._total_criados -= 1
+            self.estatisticas["descartados"] += 1
+            self._condicao.notify()
+
+    @staticmethod
+    def _driver_saudavel(driver: WebDriver) -> bool:
+        """
+        Verifica se o driver ainda responde.
+
+        Args:
+            driver: Instância do WebDriver
+
+        Returns:
+            True se o navegador responde a comandos
+        """
+        try:
+            return bool(driver.window_handles) and driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _resetar_driver(driver: WebDriver) -> bool:
+        """
+        Limpa o estado deixado pelo empréstimo anterior.
+
+        Fecha abas extras, apaga cookies e storage e navega para about:blank.
+
+        Args:
+            driver: Instância do WebDriver
+
+        Returns:
+            True se o reset foi concluído
+        """
+        try:
+            abas = driver.window_handles
+            for aba in abas[1:]:
+                driver.switch_to.window(aba)
+                driver.close()
+            driver.switch_to.window(abas[0])
+
+            driver.delete_all_cookies()
+            try:
+                driver.execute_script(
+                    "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+                )
+            except Exception:
+                pass
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning(f"Falha ao resetar driver do pool: {e}")
+            return False
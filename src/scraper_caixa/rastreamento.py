@@ -0,0 +1,239 @@
+"""
+Rastreamento das fases de cada busca (spans hierárquicos).
+
+Cada fase (``driver_start``, ``page_load``, ``select_state``,
+``wait_cities``, ``submit``, ``page_extract``, ``validate``...) vira um
+span com início, duração, thread e span pai. Os spans de uma thread se
+aninham pela pilha da thread; os estágios do pipeline aparecem nas
+próprias threads.
+
+Ao fim da execução os spans são exportados no formato Chrome trace-event
+(abrir em ``chrome://tracing`` ou https://ui.perfetto.dev) e resumidos em
+uma tabela com p50/p95 por fase, somando todas as cidades.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Números no nome da fase (pagina_3, btn_next1) são agrupados no resumo
+_PADRAO_NUMERO = re.compile(r"\d+")
+
+
+@dataclass
+class Span:
+    """Uma fase medida."""
+
+    nome: str
+    categoria: str
+    inicio: float  # time.monotonic() no início
+    duracao: float  # segundos
+    thread: str
+    pai: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+class Rastreador:
+    """
+    Coleta spans de todas as threads do processo.
+
+    Examples:
+        >>> rastreador = obter_rastreador()
+        >>> with rastreador.span("page_load", cidade="JOINVILLE/SC"):
+        ...     driver.get(URL)
+        >>> rastreador.exportar_chrome(Path("relatorios/trace.json"))
+        >>> print(rastreador.tabela())
+    """
+
+    def __init__(self) -> None:
+        self._spans: List[Span] = []
+        self._trava = threading.Lock()
+        self._local = threading.local()
+        self._origem = time.monotonic()
+
+    @contextmanager
+    def span(self, nome: str, categoria: str = "busca", **args: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Mede um bloco como span filho do span aberto na thread atual.
+
+        Args:
+            nome: Nome da fase
+            categoria: Categoria (agrupa cores no visualizador de trace)
+            **args: Atributos do span (cidade, página...)
+
+        Yields:
+            Dicionário de atributos, que pode ser completado dentro do bloco
+        """
+        pilha = self._pilha()
+        pai = pilha[-1] if pilha else None
+        pilha.append(nome)
+        inicio = time.monotonic()
+        try:
+            yield args
+        except BaseException as e:
+            args["erro"] = type(e).__name__
+            raise
+        finally:
+            pilha.pop()
+            self._adicionar(Span(nome, categoria, inicio, time.monotonic() - inicio, _thread_atual(), pai, args))
+
+    def registrar(self, nome: str, inicio: float, duracao: float, categoria: str = "busca", **args: Any) -> None:
+        """
+        Registra um span já medido (por exemplo, uma espera do WaitEngine).
+
+        Args:
+            nome: Nome da fase
+            inicio: ``time.monotonic()`` no início
+            duracao: Duração em segundos
+            categoria: Categoria do span
+            **args: Atributos do span
+        """
+        pilha = self._pilha()
+        self._adicionar(Span(nome, categoria, inicio, duracao, _thread_atual(), pilha[-1] if pilha else None, args))
+
+    def fase_atual(self) -> Optional[str]:
+        """Span aberto mais interno da thread atual (None fora de qualquer span)."""
+        pilha = self._pilha()
+        return pilha[-1] if pilha else None
+
+    def spans(self) -> List[Span]:
+        """Cópia dos spans registrados até agora."""
+        with self._trava:
+            return list(self._spans)
+
+    def limpar(self) -> None:
+        """Descarta os spans registrados (início de uma nova execução)."""
+        with self._trava:
+            self._spans = []
+            self._origem = time.monotonic()
+
+    def eventos_chrome(self) -> List[Dict[str, Any]]:
+        """
+        Converte os spans em eventos "complete" (``ph: X``) do Chrome trace.
+
+        Returns:
+            Lista de eventos com tempos em microssegundos desde o início
+        """
+        pid = os.getpid()
+        eventos = []
+        threads: Dict[str, int] = {}
+        for span in sorted(self.spans(), key=lambda s: s.inicio):
+            tid = threads.setdefault(span.thread, len(threads) + 1)
+            eventos.append({
+                "name": span.nome,
+                "cat": span.categoria,
+                "ph": "X",
+                "ts": round((span.inicio - self._origem) * 1e6),
+                "dur": round(span.duracao * 1e6),
+                "pid": pid,
+                "tid": tid,
+                "args": {chave: _serializavel(valor) for chave, valor in span.args.items()},
+            })
+        for nome, tid in threads.items():
+            eventos.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": nome}})
+        return eventos
+
+    def exportar_chrome(self, caminho: Path) -> Path:
+        """
+        Grava os spans em um arquivo JSON de trace-event.
+
+        Args:
+            caminho: Arquivo de destino
+
+        Returns:
+            Caminho gravado
+        """
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        eventos = self.eventos_chrome()
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        logger.info(f"Trace da execução salvo em {caminho} ({sum(e['ph'] == 'X' for e in eventos)} spans)")
+        return caminho
+
+    def resumo(self) -> List[Dict[str, Any]]:
+        """
+        Estatísticas por fase, somando todas as cidades.
+
+        Returns:
+            Uma entrada por fase (nome, categoria, n, total, p50, p95, max),
+            ordenadas pelo tempo total
+        """
+        por_fase: Dict[str, List[Span]] = {}
+        for span in self.spans():
+            por_fase.setdefault(_PADRAO_NUMERO.sub("N", span.nome), []).append(span)
+
+        linhas = []
+        for nome, spans in por_fase.items():
+            duracoes = sorted(span.duracao for span in spans)
+            linhas.append({
+                "fase": nome,
+                "categoria": spans[0].categoria,
+                "n": len(duracoes),
+                "total": sum(duracoes),
+                "p50": _percentil(duracoes, 50),
+                "p95": _percentil(duracoes, 95),
+                "max": duracoes[-1],
+            })
+        linhas.sort(key=lambda linha: linha["total"], reverse=True)
+        return linhas
+
+    def tabela(self) -> str:
+        """Resumo por fase formatado em colunas (segundos)."""
+        linhas = [f"{'fase':<28} {'n':>5} {'total':>9} {'p50':>8} {'p95':>8} {'max':>8}"]
+        for linha in self.resumo():
+            linhas.append(
+                f"{linha['fase']:<28} {linha['n']:>5} {linha['total']:>8.2f}s "
+                f"{linha['p50']:>7.2f}s {linha['p95']:>7.2f}s {linha['max']:>7.2f}s"
+            )
+        return "\n".join(linhas)
+
+    def _pilha(self) -> List[str]:
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    def _adicionar(self, span: Span) -> None:
+        with self._trava:
+            self._spans.append(span)
+
+
+_rastreador = Rastreador()
+
+
+def obter_rastreador() -> Rastreador:
+    """Rastreador compartilhado pelo processo."""
+    return _rastreador
+
+
+def span(nome: str, categoria: str = "busca", **args: Any):
+    """Atalho para ``obter_rastreador().span(...)``."""
+    return _rastreador.span(nome, categoria, **args)
+
+
+def _percentil(valores_ordenados: List[float], percentil: float) -> float:
+    """Percentil pelo método nearest-rank (lista já ordenada e não vazia)."""
+    posicao = max(1, math.ceil(percentil / 100 * len(valores_ordenados)))
+    return valores_ordenados[posicao - 1]
+
+
+def _thread_atual() -> str:
+    return threading.current_thread().name
+
+
+def _serializavel(valor: Any) -> Any:
+    if isinstance(valor, (str, int, float, bool)) or valor is None:
+        return valor
+    return str(valor)
@@ -0,0 +1,247 @@
+"""
+Limitador de taxa (token bucket) para o tráfego enviado ao site da Caixa.
+
+Toda navegação, envio de formulário e requisição HTTP passa por um
+``RateLimiter`` antes de sair. O balde é compartilhado entre threads
+(trava em memória) e, opcionalmente, entre processos através de um
+arquivo SQLite: cada reserva é feita em uma transação ``BEGIN IMMEDIATE``,
+que serializa os processos que usam o mesmo arquivo.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .config import ScraperConfig
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Comandos do WebDriver que geram tráfego para o site
+COMANDOS_LIMITADOS = frozenset({
+    Command.GET,
+    Command.CLICK_ELEMENT,
+    Command.REFRESH,
+    Command.GO_BACK,
+    Command.GO_FORWARD,
+})
+
+
+class RateLimiter:
+    """
+    Token bucket com rajada, compartilhável entre threads e processos.
+
+    A taxa é de ``taxa`` requisições por segundo, com até ``rajada``
+    requisições seguidas sem espera. As reservas podem deixar o saldo
+    negativo: cada chamador reserva sua vez e dorme fora da trava, de
+    modo que os pedidos são atendidos em ordem de chegada.
+
+    Examples:
+        >>> limitador = RateLimiter(taxa=2.0, rajada=4)
+        >>> limitador.adquirir()  # retorna o tempo esperado em segundos
+        0.0
+    """
+
+    def __init__(
+        self,
+        taxa: float,
+        rajada: float = 1.0,
+        arquivo: Optional[Path] = None,
+        nome: str = "caixa",
+    ) -> None:
+        """
+        Inicializa o limitador.
+
+        Args:
+            taxa: Requisições por segundo. Zero ou negativo desativa o limite.
+            rajada: Capacidade do balde (requisições sem espera)
+            arquivo: Banco SQLite para compartilhar o balde entre processos.
+                Se None, o balde vale apenas para o processo atual.
+            nome: Nome do balde dentro do arquivo
+        """
+        self.taxa = float(taxa)
+        self.rajada = max(1.0, float(rajada))
+        self.nome = nome
+        self.arquivo = Path(arquivo) if arquivo else None
+
+        self._trava = threading.Lock()
+        self._tokens = self.rajada
+        self._atualizado = time.time()
+        self._conexao: Optional[sqlite3.Connection] = None
+
+        self.estatisticas = {
+            "requisicoes": 0,
+            "esperas": 0,
+            "espera_total": 0.0,
+            "espera_max": 0.0,
+        }
+
+    @property
+    def ativo(self) -> bool:
+        """True se o limite está ativo (taxa positiva)."""
+        return self.taxa > 0
+
+    def adquirir(self, custo: float = 1.0) -> float:
+        """
+        Aguarda até haver saldo para ``custo`` requisições e o consome.
+
+        Args:
+            custo: Quantidade de tokens consumidos
+
+        Returns:
+            Tempo esperado (segundos)
+        """
+        if not self.ativo:
+            return 0.0
+
+        with self._trava:
+            espera = self._reservar(custo)
+            self.estatisticas["requisicoes"] += 1
+            if espera > 0:
+                self.estatisticas["esperas"] += 1
+                self.estatisticas["espera_total"] += espera
+                self.estatisticas["espera_max"] = max(self.estatisticas["espera_max"], espera)
+
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def relatorio(self) -> str:
+        """
+        Resume as métricas de espera.
+
+        Returns:
+            Texto com requisições, esperas e tempo médio/máximo de espera
+        """
+        e = self.estatisticas
+        media = e["espera_total"] / e["requisicoes"] if e["requisicoes"] else 0.0
+        return (
+            f"{e['requisicoes']} requisições a {self.taxa:g}/s (rajada {self.rajada:g}), "
+            f"{e['esperas']} esperaram: total {e['espera_total']:.2f}s, "
+            f"média {media:.3f}s, máx {e['espera_max']:.2f}s"
+        )
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o arquivo compartilhado."""
+        with self._trava:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
+
+    def _reservar(self, custo: float) -> float:
+        """Reserva ``custo`` tokens e retorna quanto tempo esperar pela vez."""
+        if self.arquivo is None:
+            self._tokens, self._atualizado, espera = self._recalcular(self._tokens, self._atualizado, custo)
+            return espera
+
+        try:
+            return self._reservar_compartilhado(custo)
+        except sqlite3.Error as e:
+            # Sem o arquivo o limite continua valendo dentro do processo
+            logger.warning(f"Falha no balde compartilhado ({self.arquivo}): {e}; usando balde local")
+            self.arquivo = None
+            return self._reservar(custo)
+
+    def _reservar_compartilhado(self, custo: float) -> float:
+        conexao = self._conectar()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            linha = conexao.execute(
+                "SELECT tokens, atualizado FROM baldes WHERE nome = ?", (self.nome,)
+            ).fetchone()
+            tokens, atualizado = linha if linha else (self.rajada, time.time())
+            tokens, atualizado, espera = self._recalcular(tokens, atualizado, custo)
+            conexao.execute(
+                "INSERT OR REPLACE INTO baldes (nome, tokens, atualizado) VALUES (?, ?, ?)",
+                (self.nome, tokens, atualizado),
+            )
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        return espera
+
+    def _recalcular(self, tokens: float, atualizado: float, custo: float) -> Tuple[float, float, float]:
+        """Repõe os tokens pelo tempo decorrido e desconta o custo."""
+        agora = time.time()
+        tokens = min(self.rajada, tokens + max(0.0, agora - atualizado) * self.taxa) - custo
+        espera = -tokens / self.taxa if tokens < 0 else 0.0
+        return tokens, agora, espera
+
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexao is None:
+            self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+            conexao = sqlite3.connect(
+                str(self.arquivo), timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS baldes "
+                "(nome TEXT PRIMARY KEY, tokens REAL NOT NULL, atualizado REAL NOT NULL)"
+            )
+            self._conexao = conexao
+        return self._conexao
+
+
+_limitadores: Dict[Tuple[Any, ...], RateLimiter] = {}
+_trava_limitadores = threading.Lock()
+
+
+def obter_rate_limiter(config: Optional[ScraperConfig] = None) -> RateLimiter:
+    """
+    Retorna o limitador compartilhado para a configuração informada.
+
+    Chamadas com a mesma taxa, rajada e arquivo recebem a mesma
+    instância, de modo que todas as threads do processo dividem o balde.
+
+    Args:
+        config: Configuração do scraper. Se None, usa configuração padrão.
+
+    Returns:
+        RateLimiter compartilhado
+    """
+    config = config or ScraperConfig()
+    arquivo = config.rate_limit_file
+    chave = (config.rate_limit_rps, config.rate_limit_burst, str(arquivo) if arquivo else None)
+
+    with _trava_limitadores:
+        limitador = _limitadores.get(chave)
+        if limitador is None:
+            limitador = RateLimiter(config.rate_limit_rps, config.rate_limit_burst, arquivo)
+            _limitadores[chave] = limitador
+        return limitador
+
+
+def limitar_driver(driver: WebDriver, limitador: RateLimiter) -> WebDriver:
+    """
+    Faz os comandos de navegação do driver passarem pelo limitador.
+
+    Intercepta ``driver.execute`` para os comandos em ``COMANDOS_LIMITADOS``
+    (``get``, cliques, refresh, voltar/avançar). Chamar de novo com o mesmo
+    driver apenas troca o limitador.
+
+    Args:
+        driver: Instância do WebDriver
+        limitador: Limitador a aplicar
+
+    Returns:
+        O próprio driver
+    """
+    ja_limitado = getattr(driver, "_rate_limiter", None) is not None
+    driver._rate_limiter = limitador
+    if ja_limitado:
+        return driver
+
+    execute_original = driver.execute
+
+    def execute(driver_command: str, params: Optional[dict] = None) -> Any:
+        if driver_command in COMANDOS_LIMITADOS:
+            driver._rate_limiter.adquirir()
+        return execute_original(driver_command, params)
+
+    driver.execute = execute
+    return driver
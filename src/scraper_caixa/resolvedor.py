@@ -0,0 +1,210 @@
+"""
+Resolução do binário do ChromeDriver com cache em disco.
+
+``ChromeDriverManager().install()`` consulta versões (e às vezes a rede)
+a cada chamada. O resolvedor guarda o caminho do driver e as versões do
+driver e do Chrome em um arquivo de estado; nas execuções seguintes basta
+um ``stat`` dos binários para confirmar que nada mudou. O webdriver-manager
+só é usado quando não há driver local compatível com o Chrome instalado.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from .config import CHROME_BINARIES, CHROMEDRIVER_PATHS, ScraperConfig
+from .exceptions import ChromeDriverError
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_PADRAO_VERSAO = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+
+# Caminho já resolvido neste processo, por arquivo de estado
+_resolvidos: Dict[str, str] = {}
+_trava = threading.Lock()
+
+
+def resolver_chromedriver(config: Optional[ScraperConfig] = None) -> str:
+    """
+    Retorna o caminho de um ChromeDriver compatível com o Chrome instalado.
+
+    Ordem: caminho em cache (validado por stat e versão), drivers locais
+    (``CHROMEDRIVER_PATHS`` e ``PATH``), webdriver-manager e, sem rede,
+    qualquer driver local mesmo com versão diferente.
+
+    Args:
+        config: Configuração do scraper (usa ``chromedriver_state_file``).
+            Se None, usa configuração padrão.
+
+    Returns:
+        Caminho do executável do ChromeDriver
+
+    Raises:
+        ChromeDriverError: Se nenhum driver for encontrado
+
+    Examples:
+        >>> service = Service(resolver_chromedriver())
+    """
+    config = config or ScraperConfig()
+    arquivo = Path(config.chromedriver_state_file)
+
+    with _trava:
+        caminho = _resolvidos.get(str(arquivo))
+        if caminho and os.access(caminho, os.X_OK):
+            return caminho
+
+        inicio = time.monotonic()
+        estado = _ler_estado(arquivo)
+        chrome, versao_chrome, assinatura_chrome = _versao_chrome(estado)
+
+        caminho, origem = _resolver(estado, versao_chrome)
+        _resolvidos[str(arquivo)] = caminho
+
+        if origem != "cache":
+            _gravar_estado(arquivo, {
+                "driver": caminho,
+                "driver_versao": _versao_binario(caminho),
+                "driver_assinatura": _assinatura(caminho),
+                "chrome": chrome,
+                "chrome_versao": versao_chrome,
+                "chrome_assinatura": assinatura_chrome,
+                "atualizado_em": time.time(),
+            })
+
+        logger.info(
+            f"ChromeDriver resolvido via {origem} em {time.monotonic() - inicio:.2f}s: {caminho} "
+            f"(Chrome {versao_chrome or 'desconhecido'})"
+        )
+        return caminho
+
+
+def _resolver(estado: Dict[str, Any], versao_chrome: Optional[str]) -> Tuple[str, str]:
+    """Escolhe o driver e informa de onde ele veio."""
+    caminho = estado.get("driver")
+    if (
+        caminho
+        and _assinatura(caminho) == estado.get("driver_assinatura")
+        and _compativel(estado.get("driver_versao"), versao_chrome)
+    ):
+        return caminho, "cache"
+
+    locais = _drivers_locais()
+    for caminho in locais:
+        if _compativel(_versao_binario(caminho), versao_chrome):
+            return caminho, "driver local"
+
+    try:
+        caminho = ChromeDriverManager().install()
+        if os.path.isfile(caminho):
+            return caminho, "webdriver-manager"
+    except Exception as e:
+        logger.warning(f"webdriver-manager indisponível: {e}")
+
+    if locais:
+        logger.warning(f"Usando {locais[0]} sem versão compatível com o Chrome {versao_chrome}")
+        return locais[0], "driver local (versão divergente)"
+
+    raise ChromeDriverError("Nenhum ChromeDriver encontrado (local ou via webdriver-manager)")
+
+
+def _drivers_locais() -> List[str]:
+    """Drivers pré-instalados: caminhos conhecidos e o do PATH."""
+    candidatos = list(CHROMEDRIVER_PATHS)
+    no_path = shutil.which("chromedriver")
+    if no_path:
+        candidatos.append(no_path)
+
+    encontrados: List[str] = []
+    for caminho in candidatos:
+        real = os.path.realpath(caminho)
+        if os.access(real, os.X_OK) and real not in encontrados:
+            encontrados.append(real)
+    return encontrados
+
+
+def _versao_chrome(estado: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[List[int]]]:
+    """
+    Localiza o Chrome e sua versão.
+
+    Se o binário tem o mesmo stat registrado no estado, reaproveita a versão
+    em cache sem executar ``--version``.
+    """
+    for nome in CHROME_BINARIES:
+        chrome = shutil.which(nome)
+        if not chrome:
+            continue
+        assinatura = _assinatura(chrome)
+        if chrome == estado.get("chrome") and assinatura == estado.get("chrome_assinatura"):
+            return chrome, estado.get("chrome_versao"), assinatura
+        return chrome, _versao_binario(chrome), assinatura
+    return None, None, None
+
+
+def _versao_binario(caminho: str) -> Optional[str]:
+    """Executa ``<binário> --version`` e extrai o número da versão."""
+    try:
+        saida = subprocess.run(
+            [caminho, "--version"], capture_output=True, text=True, timeout=15
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Falha ao obter versão de {caminho}: {e}")
+        return None
+    encontrado = _PADRAO_VERSAO.search(saida or "")
+    return encontrado.group(0) if encontrado else None
+
+
+def _compativel(versao_driver: Optional[str], versao_chrome: Optional[str]) -> bool:
+    """Driver e Chrome têm a mesma versão principal (sem Chrome, aceita qualquer driver)."""
+    if not versao_driver:
+        return False
+    if not versao_chrome:
+        return True
+    return versao_driver.split(".")[0] == versao_chrome.split(".")[0]
+
+
+def _assinatura(caminho: str) -> Optional[List[int]]:
+    """Tamanho e data de modificação do arquivo (None se não existe)."""
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        return None
+    return [info.st_size, info.st_mtime_ns]
+
+
+def _ler_estado(arquivo: Path) -> Dict[str, Any]:
+    try:
+        with open(arquivo, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_estado(arquivo: Path, estado: Dict[str, Any]) -> None:
+    """Grava o estado de forma atômica (arquivo temporário + replace)."""
+    try:
+        arquivo.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=arquivo.parent, suffix=".tmp")
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar {arquivo}: {e}")
+        return
+
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(estado, f, indent=2)
+        os.replace(temporario, arquivo)
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar {arquivo}: {e}")
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
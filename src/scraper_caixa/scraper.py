@@ -1,22 +1,48 @@
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
 import pandas as pd
+from dataclasses import replace
 from datetime import datetime
 import re
 import os
 import sys
+from urllib.parse import urljoin
 
 # Adicionar diretório utils ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
 
+from .bloqueio import aplicar_bloqueio, medir_pagina
+from .cidades import CatalogoCidades
+from .config import ENDPOINT_BUSCA, ScraperConfig
+from .driver import configurar_chromedriver as _configurar_chromedriver
+from .exceptions import NavigationError
+from .extractor import extrair_imoveis_em_lote, extrair_imoveis_via_regex
+from .html_parser import extrair_imoveis_do_html
+from .metricas_driver import instrumentar_driver
+from .navigator import sondar_paginacao
+from .paginacao import PaginadorDireto
+from .pipeline import Pipeline
+from .rastreamento import span
+from .http_engine import HttpSearchEngine
+from .rate_limit import limitar_driver, obter_rate_limiter
+from .store import ListingStore
+from .waits import (
+    WaitEngine,
+    dom_mudou,
+    formulario_pronto,
+    instalar_contador_xhr,
+    marcador_resultados,
+    opcao_disponivel,
+    resultados_presentes,
+    select_com_opcoes,
+    sem_xhr_pendente,
+    todas,
+    valor_selecionado,
+)
+
 try:
     from config.logging_config import setup_logging, get_logger, log_performance, log_errors
     from utils.retry import retry_selenium_operations, retry_network_operations
@@ -42,82 +68,15 @@ except ImportError as e:
         return decorator
 
 @log_errors
-def configurar_chromedriver(headless=True):
-    """Configura o ChromeDriver de forma robusta para funcionar em diferentes ambientes"""
-    logger.info("🔧 Iniciando configuração do ChromeDriver...")
-    
-    chrome_options = Options()
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    
-    # Opções anti-detecção para contornar Bot Manager
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-plugins")
-    chrome_options.add_argument("--disable-images")
-    chrome_options.add_argument("--disable-javascript")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--disable-ipc-flooding-protection")
-    
-    # User agent mais realista
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36")
-    
-    if headless:
-        chrome_options.add_argument("--headless")
-        logger.info("🔧 Modo headless ativado")
-    
-    # Configuração mais robusta do ChromeDriver
-    try:
-        # Tentar usar ChromeDriverManager primeiro
-        logger.info("🔄 Tentando ChromeDriverManager...")
-        driver_path = ChromeDriverManager().install()
-        logger.info(f"✅ ChromeDriver encontrado em: {driver_path}")
-        
-        # Verificar se o arquivo é executável
-        if not os.path.isfile(driver_path):
-            raise Exception(f"ChromeDriver não encontrado em: {driver_path}")
-            
-        service = Service(driver_path)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Executar script para remover indicadores de automação
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        logger.info("✅ ChromeDriver configurado com sucesso via ChromeDriverManager")
-        
-        return driver
-        
-    except Exception as e:
-        logger.warning(f"⚠️ Erro com ChromeDriverManager: {e}")
-        logger.info("🔄 Tentando configuração alternativa...")
-        
-        try:
-            # Tentar usar ChromeDriver do sistema
-            logger.info("🔄 Tentando ChromeDriver do sistema...")
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            logger.info("✅ ChromeDriver configurado com sucesso via sistema")
-            return driver
-        except Exception as e2:
-            logger.warning(f"⚠️ Erro com Chrome do sistema: {e2}")
-            logger.info("🔄 Tentando configuração manual...")
-            
-            # Última tentativa: usar caminho padrão do sistema
-            try:
-                logger.info("🔄 Tentando caminho manual...")
-                service = Service("/usr/bin/chromedriver")
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-                driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                logger.info("✅ ChromeDriver configurado com sucesso via caminho manual")
-                return driver
-            except Exception as e3:
-                logger.error(f"❌ Falha total ao configurar ChromeDriver: {e3}")
-                raise Exception(f"Não foi possível configurar o ChromeDriver: {e3}")
+def configurar_chromedriver(headless=None, config=None):
+    """Configura o ChromeDriver com a configuração do scraper (ver driver.configurar_chromedriver)
+    
+    `headless`, se informado, substitui `config.headless`.
+    """
+    config = config or ScraperConfig()
+    if headless is not None and headless != config.headless:
+        config = replace(config, headless=headless)
+    return _configurar_chromedriver(config)
 
 URL = "https://venda-imoveis.caixa.gov.br/sistema/busca-imovel.asp?sltTipoBusca=imoveis"
 
@@ -371,10 +330,27 @@ def extrair_dados_imovel(elemento):
         print(f"Erro ao extrair dados do imóvel: {e}")
         return None
 
-def extrair_imoveis_da_pagina(driver, filtros, numero_pagina=1):
-    """Extrai imóveis de uma página específica"""
+def extrair_imoveis_da_pagina(driver, filtros, numero_pagina=1, backend="lxml"):
+    """Extrai imóveis de uma página específica
+    
+    Backends, do mais rápido para o mais lento:
+    - "lxml": lê `driver.page_source` uma vez e faz o parsing em Python
+    - "js": um único execute_script coleta os campos de todos os imóveis
+    - "elementos": WebElement a WebElement
+    Se o backend escolhido não encontrar nada, os seguintes são tentados.
+    """
     print(f"\n📄 Extraindo imóveis da página {numero_pagina}...")
     
+    if backend == "lxml":
+        imoveis = extrair_imoveis_do_html(driver.page_source)
+        if imoveis:
+            for dados in imoveis:
+                dados['pagina'] = numero_pagina
+                dados['filtros_usados'] = str(filtros)
+                print(f"  Imóvel {dados['numero']} (página {numero_pagina}): {dados['nome_imovel']} - R$ {dados['valor']}")
+            return imoveis
+        print("⚠️ Parser lxml não encontrou imóveis, tentando via navegador...")
+    
     seletores_imoveis = [
         ".group-block-item",
         "li[class*='group-block-item']",
@@ -386,6 +362,23 @@ def extrair_imoveis_da_pagina(driver, filtros, numero_pagina=1):
     
     for seletor in seletores_imoveis:
         try:
+            # Extração em lote: um único execute_script para a página inteira
+            lote = extrair_imoveis_em_lote(driver, seletor) if backend != "elementos" else None
+            if lote is not None:
+                print(f"Seletor '{seletor}': {len(lote)} elementos encontrados (extração em lote)")
+                for i, dados in enumerate(lote, 1):
+                    if dados:
+                        dados['numero'] = i
+                        dados['pagina'] = numero_pagina
+                        dados['filtros_usados'] = str(filtros)
+                        imoveis.append(dados)
+                        print(f"  Imóvel {i} (página {numero_pagina}): {dados['nome_imovel']} - R$ {dados['valor']}")
+                
+                if imoveis:
+                    break
+                continue
+            
+            # Fallback: extração elemento a elemento
             elementos = driver.find_elements(By.CSS_SELECTOR, seletor)
             print(f"Seletor '{seletor}': {len(elementos)} elementos encontrados")
             
@@ -409,186 +402,462 @@ def extrair_imoveis_da_pagina(driver, filtros, numero_pagina=1):
     if not imoveis:
         print("Tentando extrair dados diretamente do HTML...")
         
-        page_source = driver.page_source
-        padrao_imoveis = r'([^-]+) - ([^|]+) \| R\$ ([^<]+)'
-        matches = re.findall(padrao_imoveis, page_source)
-        
-        for i, match in enumerate(matches, 1):
-            cidade = match[0].strip()
-            nome_imovel = match[1].strip()
-            valor = match[2].strip()
-            
-            imovel = {
-                'numero': i,
-                'pagina': numero_pagina,
-                'cidade': cidade,
-                'nome_imovel': nome_imovel,
-                'valor': valor,
-                'id_imovel': '',
-                'url_imagem': '',
-                'texto_completo': f"{cidade} - {nome_imovel} | R$ {valor}",
-                'filtros_usados': str(filtros)
-            }
-            imoveis.append(imovel)
-            print(f"  Imóvel {i} (página {numero_pagina}): {nome_imovel} - R$ {valor}")
+        # Regiões em torno dos links detalhe_imovel(ID), não a página inteira
+        for dados in extrair_imoveis_via_regex(driver.page_source):
+            dados['pagina'] = numero_pagina
+            dados['filtros_usados'] = str(filtros)
+            imoveis.append(dados)
+            print(f"  Imóvel {dados['numero']} (página {numero_pagina}): {dados['nome_imovel']} - R$ {dados['valor']}")
     
     return imoveis
 
 def verificar_proxima_pagina(driver):
-    """Verifica se existe uma próxima página e retorna o botão"""
-    try:
-        # Verificar se há mensagem de "nenhum resultado"
-        mensagens_sem_resultado = driver.find_elements(By.XPATH, 
-            "//*[contains(text(), 'Nenhum resultado') or contains(text(), 'nenhum resultado') or contains(text(), 'Não foram encontrados')]")
-        
-        if mensagens_sem_resultado:
-            print("🔍 Detectada mensagem de 'nenhum resultado'")
-            return None
-        
-        # Verificar se há elementos de imóveis na página
-        elementos_imoveis = driver.find_elements(By.CSS_SELECTOR, "a[onclick*='detalhe_imovel']")
-        if not elementos_imoveis:
-            print("🔍 Nenhum elemento de imóvel encontrado na página")
-            return None
-        
-        # Procurar por botões de navegação específicos
-        botoes_proximo = driver.find_elements(By.XPATH, 
-            "//a[contains(text(), 'Próxima') or contains(text(), 'Próximo') or contains(text(), '>') or contains(text(), 'Seguinte')]")
-        
-        # Verificar botões numéricos de paginação
-        botoes_numero = driver.find_elements(By.XPATH, 
-            "//a[contains(@href, 'pagina') or contains(@onclick, 'pagina') or contains(@onclick, 'proxima')]")
-        
-        # Verificar botões de "próxima página" por classe ou ID
-        botoes_proximo_classe = driver.find_elements(By.CSS_SELECTOR, 
-            ".proxima, .next, .btn-proximo, .btn-next, [class*='proxima'], [class*='next']")
-        
-        # Combinar todos os botões encontrados
-        todos_botoes = botoes_proximo + botoes_numero + botoes_proximo_classe
-        
-        # Verificar se há botão válido
-        for botao in todos_botoes:
-            try:
-                if (botao.is_displayed() and 
-                    botao.is_enabled() and 
-                    botao.get_attribute('href') != '#' and
-                    not 'disabled' in botao.get_attribute('class', '').lower()):
-                    
-                    # Verificar se o botão não é o atual
-                    texto_botao = botao.text.strip().lower()
-                    if texto_botao not in ['1', 'atual', 'current']:
-                        print(f"✅ Botão de próxima página encontrado: '{botao.text}'")
-                        return botao
-            except Exception as e:
-                continue
+    """Verifica se existe uma próxima página e retorna o botão (ver navigator.sondar_paginacao)"""
+    return sondar_paginacao(driver).proximo
+
+class GravadorResultados:
+    """Valida e grava os imóveis de uma busca à medida que as páginas chegam
+    
+    Cada página é validada e gravada no banco (ListingStore) assim que é
+    extraída: uma falha no meio da busca não perde as páginas anteriores e
+    a memória não cresce com o total de imóveis. `finalizar` grava o
+    relatório de validação e exibe o resumo por página.
+    
+    Os arquivos CSV/JSON por busca só são gerados se `config.save_csv` /
+    `config.save_json` estiverem ativos (o CSV é escrito página a página).
+    
+    `validar` e `gravar` também servem de estágios de um Pipeline: cada
+    um altera apenas o próprio estado e roda em uma única thread.
+    """
+    
+    def __init__(self, filtros, config=None, ao_gravar=None):
+        self.filtros = filtros
+        self.config = config or ScraperConfig()
+        self.ao_gravar = ao_gravar  # (página, imóveis gravados), após o banco confirmar
+        self.cidade = filtros['nome_cidade'].lower()
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        self.total = 0
+        self.validos = 0
+        self.invalidos = 0
+        self.duplicados = 0
+        self.exemplos_invalidos = []  # primeiros 5, para o relatório de validação
+        self.ids_validos = set()  # duplicatas entre páginas
+        self.paginas = {}  # página -> (quantidade, 3 primeiros imóveis)
+        self.valores = []
+        
+        self.store = None
+        self.arquivo_csv = None
+        self.colunas_csv = None
+        self.registros_json = []
         
-        # Verificar se há paginação numérica ativa
-        paginas_ativas = driver.find_elements(By.XPATH, 
-            "//a[contains(@class, 'pagina') or contains(@class, 'page')]")
+        try:
+            self.validator = DataValidator()
+        except Exception as e:
+            logger.error(f"❌ Erro na validação automática: {e}")
+            logger.info("🔄 Salvando dados sem validação...")
+            self.validator = None
+    
+    def adicionar(self, numero_pagina, imoveis):
+        """Valida e grava os imóveis de uma página; retorna os que foram gravados"""
+        _, imoveis_para_salvar = self.validar((numero_pagina, imoveis))
+        self.gravar((numero_pagina, imoveis_para_salvar))
+        return imoveis_para_salvar
+    
+    def validar(self, pagina):
+        """Estágio de validação: (página, imóveis) -> (página, imóveis válidos)"""
+        numero_pagina, imoveis = pagina
+        self.total += len(imoveis)
+        if imoveis:
+            self.paginas[numero_pagina] = (len(imoveis), imoveis[:3])
+            self.valores.extend(
+                float(im['valor'].replace('.', '').replace(',', '.')) for im in imoveis
+                if im['valor'].replace('.', '').replace(',', '.').replace('R$', '').strip().isdigit()
+            )
+        with span("validate", pagina=numero_pagina, imoveis=len(imoveis)):
+            return numero_pagina, self._validar(imoveis)
+    
+    def gravar(self, pagina):
+        """Estágio de gravação: grava os imóveis válidos de (página, imóveis)"""
+        numero_pagina, imoveis = pagina
+        with span("persist", pagina=numero_pagina, imoveis=len(imoveis)):
+            gravado = self._gravar(imoveis) if imoveis else True
+        if gravado and self.ao_gravar is not None:
+            self.ao_gravar(numero_pagina, len(imoveis))
+    
+    def finalizar(self):
+        """Grava o relatório de validação e os arquivos opcionais e exibe o resumo"""
+        try:
+            if not self.total:
+                print("\n❌ Nenhum imóvel encontrado com os filtros especificados")
+                return
+            
+            logger.info(f"🎉 Total de imóveis encontrados: {self.total} em {max(self.paginas)} página(s)")
+            self._salvar_relatorio_validacao()
+            
+            if self.store is not None:
+                logger.info(f"✅ Imóveis gravados em: {self.config.store_file}")
+            if self.arquivo_csv:
+                logger.info(f"✅ Dados salvos em: {self.arquivo_csv}")
+            if self.registros_json:
+                json_filename = f"imoveis_{self.cidade}_{self.timestamp}.json"
+                pd.DataFrame(self.registros_json).to_json(json_filename, orient='records', force_ascii=False, indent=2)
+                logger.info(f"✅ Dados salvos em JSON: {json_filename}")
+            
+            self._mostrar_resumo()
+        finally:
+            if self.store is not None:
+                self.store.fechar()
+                self.store = None
+    
+    def _validar(self, imoveis):
+        if self.validator is None or not imoveis:
+            return imoveis
         
-        for pagina in paginas_ativas:
-            try:
-                if (pagina.is_displayed() and 
-                    pagina.is_enabled() and
-                    not 'active' in pagina.get_attribute('class', '').lower() and
-                    not 'current' in pagina.get_attribute('class', '').lower()):
-                    
-                    numero_pagina = pagina.text.strip()
-                    if numero_pagina.isdigit():
-                        print(f"✅ Botão de página numérica encontrado: página {numero_pagina}")
-                        return pagina
-            except Exception as e:
+        try:
+            validation_results = self.validator.validate_imoveis_batch(imoveis)
+        except Exception as e:
+            logger.error(f"❌ Erro na validação automática: {e}")
+            logger.info("🔄 Salvando página sem validação...")
+            return imoveis
+        
+        invalidos = validation_results['invalid_imoveis']
+        self.invalidos += len(invalidos)
+        self.exemplos_invalidos.extend(invalidos[:max(0, 5 - len(self.exemplos_invalidos))])
+        self.duplicados += validation_results['validation_summary']['duplicates_removed']
+        
+        validos = []
+        for imovel in validation_results['valid_imoveis']:
+            if imovel['id_imovel'] in self.ids_validos:
+                self.duplicados += 1
                 continue
+            self.ids_validos.add(imovel['id_imovel'])
+            validos.append(imovel)
+        self.validos += len(validos)
+        return validos
+    
+    def _gravar(self, imoveis):
+        # Upsert em lote por id_imovel no banco persistente
+        gravado = True
+        try:
+            if self.store is None:
+                self.store = ListingStore(config=self.config)
+            self.store.upsert(imoveis, self.filtros)
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar imóveis no banco: {e}")
+            gravado = False
+        
+        if self.config.save_csv:
+            primeira = self.arquivo_csv is None
+            df = pd.DataFrame(imoveis, columns=self.colunas_csv)
+            if primeira:
+                self.arquivo_csv = f"imoveis_{self.cidade}_{self.timestamp}.csv"
+                self.colunas_csv = list(df.columns)
+            # BOM só no início do arquivo
+            df.to_csv(
+                self.arquivo_csv,
+                mode='w' if primeira else 'a',
+                header=primeira,
+                index=False,
+                encoding='utf-8-sig' if primeira else 'utf-8',
+            )
+        
+        if self.config.save_json:
+            self.registros_json.extend(imoveis)
+        
+        return gravado
+    
+    def _salvar_relatorio_validacao(self):
+        if self.validator is None:
+            return
         
-        print("🔍 Nenhum botão de próxima página válido encontrado")
-        return None
+        try:
+            quality_score = round(self.validos / self.total * 100, 2)
+            validation_results = {
+                'valid_imoveis': [],
+                'invalid_imoveis': self.exemplos_invalidos,
+                'quality_score': quality_score,
+                'validation_summary': {
+                    'total_imoveis': self.total,
+                    'valid_imoveis': self.validos,
+                    'invalid_imoveis': self.invalidos,
+                    'duplicates_removed': self.duplicados,
+                    'quality_score': quality_score,
+                    'validation_metrics': self.validator.get_validation_metrics(),
+                },
+            }
+            # Nome por cidade: buscas paralelas podem terminar no mesmo segundo
+            validation_report_file = self.validator.save_validation_report(
+                validation_results,
+                f"relatorio_validacao_{self.cidade}_{self.timestamp}.txt",
+            )
+            logger.info(f"📄 Relatório de validação salvo em: {validation_report_file}")
+        except Exception as e:
+            logger.error(f"❌ Erro ao salvar relatório de validação: {e}")
         
-    except Exception as e:
-        print(f"❌ Erro ao verificar próxima página: {e}")
-        return None
+        logger.info(f"✅ {self.validos} imóveis válidos após validação")
+        if not self.validos:
+            logger.warning("⚠️ Nenhum imóvel válido encontrado após validação")
+    
+    def _mostrar_resumo(self):
+        # Mostrar resumo por página
+        print("\n📊 RESUMO POR PÁGINA:")
+        print("-" * 50)
+        for pagina in sorted(self.paginas):
+            quantidade, primeiros = self.paginas[pagina]
+            print(f"📄 Página {pagina}: {quantidade} imóveis")
+            for imovel in primeiros:  # Mostrar apenas os 3 primeiros
+                print(f"    • {imovel['nome_imovel']} - R$ {imovel['valor']}")
+            if quantidade > 3:
+                print(f"    ... e mais {quantidade - 3} imóveis")
+            print()
+        
+        # Mostrar estatísticas
+        print("\n📈 ESTATÍSTICAS:")
+        print("-" * 30)
+        if self.valores:
+            print(f"💰 Valor médio: R$ {sum(self.valores)/len(self.valores):,.2f}")
+            print(f"💰 Valor mínimo: R$ {min(self.valores):,.2f}")
+            print(f"💰 Valor máximo: R$ {max(self.valores):,.2f}")
+
+def salvar_resultados(todos_imoveis, filtros, total_paginas, config=None):
+    """Valida e grava os imóveis encontrados no banco (ListingStore) e exibe o resumo por página
+    
+    Para imóveis já coletados; as buscas gravam página a página com GravadorResultados.
+    """
+    
+    por_pagina = {}
+    for imovel in todos_imoveis:
+        por_pagina.setdefault(imovel['pagina'], []).append(imovel)
+    
+    gravador = GravadorResultados(filtros, config)
+    for pagina in range(1, total_paginas + 1):
+        gravador.adicionar(pagina, por_pagina.get(pagina, []))
+    gravador.finalizar()
+
+def _coletar_paginas(paginas, filtros, config, checkpoint=None):
+    """Consome o stream de páginas gravando cada uma e devolve todos os imóveis
+    
+    Validação e gravação rodam em estágios próprios (Pipeline com filas de
+    `config.pipeline_queue_size` páginas), então a extração da página
+    seguinte não espera a anterior ser validada e gravada.
+    
+    Com `checkpoint` (CheckpointCidade), cada página gravada vai para o diário
+    da execução e a cidade é marcada como concluída se a busca não foi interrompida.
+    """
+    
+    gravador = GravadorResultados(filtros, config, ao_gravar=checkpoint.pagina_gravada if checkpoint else None)
+    todos_imoveis = []
+    ultima_pagina = 0
+    with span("city_search", cidade=f"{filtros['nome_cidade']}/{filtros['estado']}") as atributos:
+        try:
+            with Pipeline(
+                [("validacao", gravador.validar), ("gravacao", gravador.gravar)],
+                capacidade=config.pipeline_queue_size,
+            ) as pipeline:
+                for numero_pagina, imoveis in paginas:
+                    todos_imoveis.extend(imoveis)
+                    ultima_pagina = numero_pagina
+                    pipeline.enviar((numero_pagina, imoveis))
+        finally:
+            with span("finalize"):
+                gravador.finalizar()
+        atributos.update(imoveis=len(todos_imoveis), paginas=ultima_pagina)
+    
+    if checkpoint is not None:
+        checkpoint.concluir(len(todos_imoveis), ultima_pagina)
+    return todos_imoveis
+
+def buscar_imoveis_via_http(filtros, config=None, motor=None, checkpoint=None):
+    """Executa a busca pelo motor HTTP (requests), sem abrir o navegador
+    
+    Se `motor` (HttpSearchEngine) for informado, sua sessão é reutilizada e não é
+    fechada ao final. `checkpoint` segue buscar_imoveis_com_filtros.
+    """
+    
+    config = config or ScraperConfig()
+    paginas = _iter_paginas_http(filtros, config, motor, checkpoint)
+    return _coletar_paginas(paginas, filtros, config, checkpoint)
 
 @log_performance
 @log_errors
-def buscar_imoveis_com_filtros(filtros):
-    """Executa a busca de imóveis com os filtros especificados, navegando por múltiplas páginas"""
+def buscar_imoveis_com_filtros(filtros, driver=None, config=None, checkpoint=None, sessao=None):
+    """Executa a busca de imóveis com os filtros especificados, navegando por múltiplas páginas
+    
+    Coleta o stream de iter_paginas: cada página é validada e gravada assim que
+    é extraída (GravadorResultados) e a lista completa é devolvida ao final.
+    
+    Se `driver` for informado (por exemplo, alugado de um DriverPool), ele é reutilizado
+    e não é fechado ao final; caso contrário um navegador próprio é criado e encerrado.
+    
+    Com `config.search_engine == "http"` a busca é feita sem navegador
+    (ver buscar_imoveis_via_http) e `driver` é ignorado.
+    
+    Com `checkpoint` (CheckpointCidade do diário da execução), a busca começa
+    na página seguinte à última gravada e registra cada página gravada; os
+    imóveis das páginas puladas não fazem parte do retorno.
+    
+    Com `sessao` (SessaoEstado) e um `driver` informado, buscas seguidas de
+    cidades do mesmo estado reaproveitam a página de busca já aberta: só a
+    primeira carrega o formulário e seleciona o estado.
+    """
+    
+    config = config or ScraperConfig()
+    paginas = iter_paginas(filtros, driver=driver, config=config, checkpoint=checkpoint, sessao=sessao)
+    return _coletar_paginas(paginas, filtros, config, checkpoint)
+
+def iter_imoveis(filtros, driver=None, config=None):
+    """Gera os imóveis da busca um a um, assim que cada página é extraída
+    
+    Nada é validado nem gravado: o consumidor decide o que fazer com cada
+    imóvel (ver GravadorResultados para o fluxo padrão).
+    
+    Examples:
+        >>> for imovel in iter_imoveis(filtros):
+        ...     print(imovel['id_imovel'], imovel['valor'])
+    """
+    
+    for _, imoveis in iter_paginas(filtros, driver=driver, config=config):
+        yield from imoveis
+
+def iter_paginas(filtros, driver=None, config=None, checkpoint=None, sessao=None):
+    """Gera (número da página, imóveis da página) assim que cada página é extraída
+    
+    Os erros de navegação são registrados no log (e em `checkpoint`, se
+    informado) e encerram o stream; as páginas já geradas continuam válidas.
+    Os parâmetros seguem buscar_imoveis_com_filtros.
+    """
     
     logger.info(f"🚀 Iniciando busca de imóveis em {filtros['nome_cidade']}/{filtros['estado']}")
     logger.info(f"🔧 Filtros aplicados: {filtros}")
     
-    driver = configurar_chromedriver()
+    config = config or ScraperConfig()
+    
+    # Validar o código da cidade contra o catálogo em cache (sem esperar o DOM)
+    cidade_no_catalogo = CatalogoCidades(config).codigo_valido(filtros['estado'], filtros['codigo_cidade'])
+    if cidade_no_catalogo is False:
+        logger.error(f"⚠️ Cidade {filtros['nome_cidade']} ({filtros['codigo_cidade']}) não consta no catálogo de {filtros['estado']}")
+        return
+    
+    if config.search_engine == "http":
+        yield from _iter_paginas_http(filtros, config, checkpoint=checkpoint)
+    else:
+        yield from _iter_paginas_selenium(filtros, driver, config, cidade_no_catalogo, checkpoint, sessao)
+
+def _iter_paginas_http(filtros, config, motor=None, checkpoint=None):
+    """Páginas da busca pelo motor HTTP (ver iter_paginas)"""
+    
+    pagina_inicial = checkpoint.pagina_inicial if checkpoint else 1
+    motor_proprio = motor is None
+    if motor_proprio:
+        motor = HttpSearchEngine(config)
     
     try:
-        logger.info("🌐 Acessando página de busca...")
-        driver.get(URL)
-        
-        # Aguardar página carregar completamente
-        wait = WebDriverWait(driver, 30)  # Aumentado para 30 segundos
-        
-        # Aguardar e selecionar estado
-        logger.info(f"📍 Selecionando estado: {filtros['estado']}")
-        
-        # Primeiro, aguardar o elemento estar presente na página
-        select_estado_element = wait.until(EC.presence_of_element_located((By.ID, "cmb_estado")))
-        logger.info("✅ Elemento de estado encontrado na página")
-        
-        # Aguardar um pouco para garantir que está totalmente carregado
-        time.sleep(2)
-        
-        # Agora tentar torná-lo clicável
-        try:
-            select_estado_element = wait.until(EC.element_to_be_clickable((By.ID, "cmb_estado")))
-            logger.info("✅ Elemento de estado está clicável")
-        except:
-            logger.warning("⚠️ Elemento não está clicável, tentando continuar mesmo assim...")
-        
-        # Criar o objeto Select
-        select_estado = Select(select_estado_element)
+        yield from motor.iter_paginas(filtros, pagina_inicial=pagina_inicial)
+    except Exception as e:
+        logger.error(f"❌ Erro durante a busca HTTP: {e}")
+        if checkpoint is not None:
+            checkpoint.interromper(str(e))
+    finally:
+        if motor_proprio:
+            motor.fechar()
+
+def _iter_paginas_selenium(filtros, driver, config, cidade_no_catalogo, checkpoint=None, sessao=None):
+    """Páginas da busca pelo formulário no navegador (ver iter_paginas)
+    
+    As esperas são condicionais (WaitEngine) e limitadas pelo orçamento
+    `config.wait_budget`; o tempo gasto em cada etapa é registrado no log.
+    """
+    
+    pagina_inicial = checkpoint.pagina_inicial if checkpoint else 1
+    if pagina_inicial > 1:
+        logger.info(f"⏩ Retomando {filtros['nome_cidade']}/{filtros['estado']} a partir da página {pagina_inicial}")
+    
+    driver_proprio = driver is None
+    if driver_proprio:
+        with span("driver_start", "driver"):
+            driver = configurar_chromedriver(config=config)
+        sessao = None  # a sessão do estado só vale para um driver reaproveitado
+    
+    # Navegações e cliques passam pelo limitador de taxa compartilhado
+    limitador = obter_rate_limiter(config)
+    instrumentar_driver(driver)
+    limitar_driver(driver, limitador)
+    
+    # Fotos, fontes, mídia e analytics não são baixados (XHR continua liberado)
+    aplicar_bloqueio(driver, config)
+    
+    # Permite esperar pelo fim das XHRs (carregador de cidades) em vez do load completo
+    instalar_contador_xhr(driver)
+    
+    esperas = WaitEngine(driver, config)
+    
+    try:
+        # Busca em lote: com a página do estado já aberta neste driver, a cidade
+        # é pesquisada por XHR, sem recarregar o formulário nem trocar o estado
+        if sessao is not None and sessao.aberta(driver, filtros['estado']):
+            ultima_gerada = 0
+            try:
+                paginador = PaginadorDireto(driver, esperas, limitador, config)
+                if not paginador.pesquisar(filtros):
+                    raise NavigationError("pesquisa sem páginas de resultados")
+                for numero_pagina, imoveis_pagina in paginador.paginas(None, filtros, pagina_inicial):
+                    ultima_gerada = numero_pagina
+                    yield numero_pagina, imoveis_pagina
+                sessao.buscas += 1
+                return
+            except (NavigationError, WebDriverException) as e:
+                logger.warning(f"⚠️ Pesquisa na sessão de {filtros['estado']} falhou ({e}); usando o formulário")
+                sessao.invalidar()
+                pagina_inicial = max(pagina_inicial, ultima_gerada + 1)
         
-        # Verificar se há opções disponíveis
-        if len(select_estado.options) <= 1:
-            logger.warning("⚠️ Poucas opções de estado. Aguardando mais tempo...")
-            time.sleep(5)
-            select_estado = Select(driver.find_element(By.ID, "cmb_estado"))
+        logger.info("🌐 Acessando página de busca...")
+        with span("page_load"):
+            with esperas.cronometrar("navegacao"):
+                driver.get(urljoin(config.site_url, ENDPOINT_BUSCA) + "?sltTipoBusca=imoveis")
+            
+            # Aguardar e selecionar estado
+            logger.info(f"📍 Selecionando estado: {filtros['estado']}")
+            
+            # Formulário utilizável: DOM interativo, estados carregados e nenhuma XHR pendente
+            select_estado_element = esperas.aguardar("estados_carregados", formulario_pronto("cmb_estado"))
+            logger.info("✅ Elemento de estado encontrado na página")
         
         # Selecionar o estado
-        select_estado.select_by_value(filtros['estado'])
+        with span("select_state", estado=filtros['estado']):
+            Select(select_estado_element).select_by_value(filtros['estado'])
         logger.info(f"✅ Estado selecionado: {filtros['estado']}")
         
-        # Aguardar carregamento das cidades (pode demorar)
+        # Aguardar carregamento das cidades (o JavaScript popula o select)
         logger.info("⏳ Aguardando carregamento das cidades...")
-        time.sleep(5)  # Aguardar JavaScript carregar as cidades
-        
-        # Aguardar e selecionar cidade
         logger.info(f"🏙️ Selecionando cidade: {filtros['nome_cidade']}")
-        
-        # Aguardar o elemento de cidade estar presente
-        select_cidade_element = wait.until(EC.presence_of_element_located((By.ID, "cmb_cidade")))
-        logger.info("✅ Elemento de cidade encontrado na página")
-        
-        # Aguardar um pouco mais para as cidades carregarem
-        time.sleep(3)
-        
-        # Criar o objeto Select para cidade
-        select_cidade = Select(select_cidade_element)
-        
-        # Verificar se há opções de cidade
-        num_opcoes_cidade = len(select_cidade.options)
-        logger.info(f"📊 Campo de cidade tem {num_opcoes_cidade} opções")
-        
-        if num_opcoes_cidade <= 1:  # Apenas "Selecione"
-            logger.warning("⚠️ Cidades ainda não carregaram. Aguardando mais tempo...")
-            time.sleep(8)  # Aguardar mais tempo
-            # Recarregar o select
-            select_cidade = Select(driver.find_element(By.ID, "cmb_cidade"))
-            num_opcoes_cidade = len(select_cidade.options)
-            logger.info(f"📊 Após espera: {num_opcoes_cidade} opções")
-        
-        # Verificar se a cidade desejada está disponível
-        cidade_encontrada = False
-        for option in select_cidade.options:
-            if option.get_attribute('value') == filtros['codigo_cidade']:
+        with span("wait_cities"):
+            if cidade_no_catalogo:
+                # Código já validado pelo catálogo: basta a opção aparecer no select
+                select_cidade_element = esperas.aguardar(
+                    "cidades_carregadas",
+                    todas(opcao_disponivel("cmb_cidade", filtros['codigo_cidade']), sem_xhr_pendente()),
+                )
+                select_cidade = Select(select_cidade_element)
                 cidade_encontrada = True
-                break
+            else:
+                select_cidade_element = esperas.aguardar(
+                    "cidades_carregadas", todas(select_com_opcoes("cmb_cidade"), sem_xhr_pendente())
+                )
+            
+                # Criar o objeto Select para cidade
+                select_cidade = Select(select_cidade_element)
+            
+                # Verificar se há opções de cidade
+                num_opcoes_cidade = len(select_cidade.options)
+                logger.info(f"📊 Campo de cidade tem {num_opcoes_cidade} opções")
+            
+                # Verificar se a cidade desejada está disponível
+                cidade_encontrada = False
+                for option in select_cidade.options:
+                    if option.get_attribute('value') == filtros['codigo_cidade']:
+                        cidade_encontrada = True
+                        break
         
         if not cidade_encontrada:
             logger.error(f"⚠️ Cidade {filtros['nome_cidade']} não encontrada nas opções disponíveis")
@@ -600,227 +869,161 @@ def buscar_imoveis_com_filtros(filtros):
             raise Exception(f"Cidade {filtros['nome_cidade']} não encontrada")
         
         # Selecionar a cidade
-        select_cidade.select_by_value(filtros['codigo_cidade'])
-        
-        # Verificar se a cidade foi selecionada corretamente
-        cidade_selecionada = select_cidade.first_selected_option.text
-        if filtros['nome_cidade'].upper() not in cidade_selecionada.upper():
-            logger.warning(f"⚠️ Aviso: Selecionou '{cidade_selecionada}' em vez de '{filtros['nome_cidade']}'")
-            logger.info("   Tentando novamente...")
-            time.sleep(2)
+        with span("select_city", cidade=filtros['nome_cidade']):
             select_cidade.select_by_value(filtros['codigo_cidade'])
-            time.sleep(2)
+            
+            # Verificar se a cidade foi selecionada corretamente
+            if esperas.tentar("cidade_selecionada", valor_selecionado("cmb_cidade", filtros['codigo_cidade']), timeout=5) is None:
+                logger.warning(f"⚠️ Aviso: cidade {filtros['nome_cidade']} não ficou selecionada")
+                logger.info("   Tentando novamente...")
+                select_cidade.select_by_value(filtros['codigo_cidade'])
+                esperas.tentar("cidade_selecionada_retry", valor_selecionado("cmb_cidade", filtros['codigo_cidade']), timeout=5)
             cidade_selecionada = select_cidade.first_selected_option.text
-            logger.info(f"   Cidade selecionada após retry: {cidade_selecionada}")
-        else:
-            logger.info(f"✅ Cidade selecionada corretamente: {cidade_selecionada}")
-        
-        # Clicar no primeiro botão "Próximo"
-        logger.info("🔄 Clicando no botão 'Próximo'...")
-        try:
-            btn_next = wait.until(EC.element_to_be_clickable((By.ID, "btn_next0")))
-            btn_next.click()
-            logger.info("✅ Primeiro botão Próximo clicado")
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao clicar no botão: {e}")
-            logger.info("🔄 Tentando com JavaScript...")
-            driver.execute_script("document.getElementById('btn_next0').click();")
-            logger.info("✅ Primeiro botão Próximo clicado via JavaScript")
-        
-        time.sleep(3)
-        
-        # Aplicar filtros adicionais se especificados
-        if filtros['tipo_imovel']:
-            try:
-                select_tipo = wait.until(EC.element_to_be_clickable((By.ID, "cmb_tp_imovel")))
-                select_tipo = Select(select_tipo)
-                select_tipo.select_by_value(filtros['tipo_imovel'])
-                logger.info(f"🏠 Tipo de imóvel: {TIPOS_IMOVEL[filtros['tipo_imovel']]}")
-                time.sleep(1)
-            except Exception as e:
-                logger.warning(f"⚠️ Erro ao selecionar tipo: {e}")
-        
-        if filtros['quartos']:
-            try:
-                select_quartos = wait.until(EC.element_to_be_clickable((By.ID, "cmb_quartos")))
-                select_quartos = Select(select_quartos)
-                select_quartos.select_by_value(filtros['quartos'])
-                logger.info(f"🛏️ Quartos: {QUARTOS[filtros['quartos']]}")
-                time.sleep(1)
-            except Exception as e:
-                logger.warning(f"⚠️ Erro ao selecionar quartos: {e}")
+        logger.info(f"✅ Cidade selecionada: {cidade_selecionada}")
         
-        if filtros['faixa_valor']:
+        with span("submit"):
+            # Clicar no primeiro botão "Próximo"
+            logger.info("🔄 Clicando no botão 'Próximo'...")
             try:
-                select_valor = wait.until(EC.element_to_be_clickable((By.ID, "cmb_faixa_vlr")))
-                select_valor = Select(select_valor)
-                select_valor.select_by_value(filtros['faixa_valor'])
-                logger.info(f"💰 Faixa de valor: {FAIXAS_VALOR[filtros['faixa_valor']]}")
-                time.sleep(1)
+                btn_next = esperas.aguardar("btn_next0", EC.element_to_be_clickable((By.ID, "btn_next0")))
+                btn_next.click()
+                logger.info("✅ Primeiro botão Próximo clicado")
             except Exception as e:
-                logger.warning(f"⚠️ Erro ao selecionar valor: {e}")
-        
-        # Clicar no segundo botão "Próximo"
-        logger.info("🔄 Clicando no segundo botão 'Próximo'...")
-        try:
-            btn_next2 = wait.until(EC.element_to_be_clickable((By.ID, "btn_next1")))
-            btn_next2.click()
-            logger.info("✅ Segundo botão Próximo clicado")
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao clicar no segundo botão: {e}")
-            logger.info("🔄 Tentando com JavaScript...")
-            driver.execute_script("document.getElementById('btn_next1').click();")
-            logger.info("✅ Segundo botão Próximo clicado via JavaScript")
-        
-        logger.info("⏳ Aguardando carregamento dos resultados...")
-        time.sleep(10)
-        
-        # Extrair imóveis de todas as páginas
-        todos_imoveis = []
-        pagina_atual = 1
-        max_paginas = 20  # Aumentado o limite de segurança
-        pagina_anterior = None
-        tentativas_consecutivas = 0
-        
-        while pagina_atual <= max_paginas:
-            logger.info(f"📄 Processando página {pagina_atual}...")
-            
-            # Verificar se a página mudou
-            url_atual = driver.current_url
-            if url_atual == pagina_anterior:
-                tentativas_consecutivas += 1
-                if tentativas_consecutivas >= 2:
-                    logger.warning("⚠️ Página não mudou após tentativas. Parando navegação.")
-                    break
-            else:
-                tentativas_consecutivas = 0
-                pagina_anterior = url_atual
+                logger.warning(f"⚠️ Erro ao clicar no botão: {e}")
+                logger.info("🔄 Tentando com JavaScript...")
+                limitador.adquirir()
+                driver.execute_script("document.getElementById('btn_next0').click();")
+                logger.info("✅ Primeiro botão Próximo clicado via JavaScript")
             
-            # Extrair imóveis da página atual
-            imoveis_pagina = extrair_imoveis_da_pagina(driver, filtros, pagina_atual)
-            
-            if imoveis_pagina:
-                todos_imoveis.extend(imoveis_pagina)
-                logger.info(f"✅ {len(imoveis_pagina)} imóveis encontrados na página {pagina_atual}")
-            else:
-                logger.warning(f"⚠️ Nenhum imóvel encontrado na página {pagina_atual}")
-                # Se não há imóveis e não há botão próximo, parar
-                botao_proximo = verificar_proxima_pagina(driver)
-                if not botao_proximo:
-                    logger.info("🏁 Nenhum imóvel encontrado e não há próxima página")
-                    break
+            # Aplicar filtros adicionais se especificados
+            if filtros['tipo_imovel']:
+                try:
+                    select_tipo = esperas.aguardar("filtro_tipo", EC.element_to_be_clickable((By.ID, "cmb_tp_imovel")))
+                    select_tipo = Select(select_tipo)
+                    select_tipo.select_by_value(filtros['tipo_imovel'])
+                    logger.info(f"🏠 Tipo de imóvel: {TIPOS_IMOVEL[filtros['tipo_imovel']]}")
+                except Exception as e:
+                    logger.warning(f"⚠️ Erro ao selecionar tipo: {e}")
             
-            # Verificar se há próxima página
-            botao_proximo = verificar_proxima_pagina(driver)
+            if filtros['quartos']:
+                try:
+                    select_quartos = esperas.aguardar("filtro_quartos", EC.element_to_be_clickable((By.ID, "cmb_quartos")))
+                    select_quartos = Select(select_quartos)
+                    select_quartos.select_by_value(filtros['quartos'])
+                    logger.info(f"🛏️ Quartos: {QUARTOS[filtros['quartos']]}")
+                except Exception as e:
+                    logger.warning(f"⚠️ Erro ao selecionar quartos: {e}")
             
-            if botao_proximo:
+            if filtros['faixa_valor']:
                 try:
-                    print(f"🔄 Navegando para página {pagina_atual + 1}...")
-                    
-                    # Salvar URL atual para verificar se mudou
-                    url_antes = driver.current_url
-                    
-                    # Tentar clicar no botão
-                    driver.execute_script("arguments[0].click();", botao_proximo)
-                    time.sleep(5)  # Aguardar carregamento da nova página
-                    
-                    # Verificar se a URL mudou
-                    url_depois = driver.current_url
-                    if url_depois != url_antes:
-                        pagina_atual += 1
-                        print(f"✅ Navegação bem-sucedida para página {pagina_atual}")
-                    else:
-                        print("⚠️ URL não mudou após clique. Tentando novamente...")
-                        time.sleep(3)
-                        driver.execute_script("arguments[0].click();", botao_proximo)
-                        time.sleep(5)
-                        
-                        if driver.current_url == url_antes:
-                            print("❌ Falha na navegação. Parando.")
-                            break
-                        else:
-                            pagina_atual += 1
-                            
+                    select_valor = esperas.aguardar("filtro_valor", EC.element_to_be_clickable((By.ID, "cmb_faixa_vlr")))
+                    select_valor = Select(select_valor)
+                    select_valor.select_by_value(filtros['faixa_valor'])
+                    logger.info(f"💰 Faixa de valor: {FAIXAS_VALOR[filtros['faixa_valor']]}")
                 except Exception as e:
-                    print(f"❌ Erro ao navegar para próxima página: {e}")
-                    break
-            else:
-                print(f"🏁 Última página alcançada (página {pagina_atual})")
-                break
-        
-        # Salvar resultados
-        if todos_imoveis:
-            logger.info(f"🎉 Total de imóveis encontrados: {len(todos_imoveis)} em {pagina_atual} página(s)")
+                    logger.warning(f"⚠️ Erro ao selecionar valor: {e}")
             
-            # Validar dados automaticamente
+            # Clicar no segundo botão "Próximo"
+            logger.info("🔄 Clicando no segundo botão 'Próximo'...")
             try:
-                logger.info("🔍 Iniciando validação automática dos dados...")
-                validator = DataValidator()
-                validation_results = validator.validate_imoveis_batch(todos_imoveis)
-                
-                # Salvar relatório de validação
-                validation_report_file = validator.save_validation_report(validation_results)
-                logger.info(f"📄 Relatório de validação salvo em: {validation_report_file}")
-                
-                # Usar apenas imóveis válidos para salvar
-                imoveis_validos = validation_results['valid_imoveis']
-                logger.info(f"✅ {len(imoveis_validos)} imóveis válidos após validação")
-                
-                if imoveis_validos:
-                    df = pd.DataFrame(imoveis_validos)
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    
-                    filename = f"imoveis_{filtros['nome_cidade'].lower()}_{timestamp}.csv"
-                    df.to_csv(filename, index=False, encoding='utf-8-sig')
-                    logger.info(f"✅ Dados válidos salvos em: {filename}")
-                    
-                    json_filename = f"imoveis_{filtros['nome_cidade'].lower()}_{timestamp}.json"
-                    df.to_json(json_filename, orient='records', force_ascii=False, indent=2)
-                    logger.info(f"✅ Dados válidos salvos em JSON: {json_filename}")
-                else:
-                    logger.warning("⚠️ Nenhum imóvel válido encontrado após validação")
-                    
+                btn_next2 = esperas.aguardar("btn_next1", EC.element_to_be_clickable((By.ID, "btn_next1")))
+                btn_next2.click()
+                logger.info("✅ Segundo botão Próximo clicado")
             except Exception as e:
-                logger.error(f"❌ Erro na validação automática: {e}")
-                logger.info("🔄 Salvando dados sem validação...")
+                logger.warning(f"⚠️ Erro ao clicar no segundo botão: {e}")
+                logger.info("🔄 Tentando com JavaScript...")
+                limitador.adquirir()
+                driver.execute_script("document.getElementById('btn_next1').click();")
+                logger.info("✅ Segundo botão Próximo clicado via JavaScript")
+            
+            logger.info("⏳ Aguardando carregamento dos resultados...")
+            esperas.tentar("resultados", resultados_presentes())
+        if sessao is not None:
+            sessao.registrar(driver, filtros['estado'])
+        
+        # Extrair imóveis de todas as páginas, entregando cada uma assim que é lida
+        imoveis_encontrados = 0
+        
+        def extrair_pagina_exibida(numero):
+            with span("page_extract", pagina=numero):
+                imoveis = extrair_imoveis_da_pagina(driver, filtros, numero, config.extraction_backend)
+            medir_pagina(driver, f"{filtros['nome_cidade']} página {numero}")
+            return imoveis
+        
+        # Com o total de páginas e os IDs de cada uma, buscar as páginas direto
+        # em vez de clicar em "próxima" e esperar a troca
+        paginador = PaginadorDireto(driver, esperas, limitador, config)
+        if paginador.preparar():
+            for numero_pagina, imoveis_pagina in paginador.paginas(extrair_pagina_exibida, filtros, pagina_inicial):
+                imoveis_encontrados += len(imoveis_pagina)
+                yield numero_pagina, imoveis_pagina
+        else:
+            pagina_atual = 1
+            max_paginas = 20  # Limite de segurança da navegação por clique (total desconhecido)
+            
+            while pagina_atual <= max_paginas:
+                logger.info(f"📄 Processando página {pagina_atual}...")
                 
-                # Fallback: salvar dados originais
-                df = pd.DataFrame(todos_imoveis)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                # Extrair imóveis da página atual
+                imoveis_pagina = extrair_pagina_exibida(pagina_atual)
                 
-                filename = f"imoveis_{filtros['nome_cidade'].lower()}_{timestamp}.csv"
-                df.to_csv(filename, index=False, encoding='utf-8-sig')
-                logger.info(f"✅ Dados salvos em: {filename}")
+                # Estado da paginação (resultados, página atual/total e botão) em uma chamada
+                paginacao = sondar_paginacao(driver)
+                botao_proximo = paginacao.proximo
+                if paginacao.total_paginas:
+                    logger.info(f"📑 Página {paginacao.pagina_atual or pagina_atual} de {paginacao.total_paginas}")
                 
-                json_filename = f"imoveis_{filtros['nome_cidade'].lower()}_{timestamp}.json"
-                df.to_json(json_filename, orient='records', force_ascii=False, indent=2)
-                logger.info(f"✅ Dados salvos em JSON: {json_filename}")
-            
-            # Mostrar resumo por página
-            print("\n📊 RESUMO POR PÁGINA:")
-            print("-" * 50)
-            for pagina in range(1, pagina_atual + 1):
-                imoveis_pagina = [im for im in todos_imoveis if im['pagina'] == pagina]
                 if imoveis_pagina:
-                    print(f"📄 Página {pagina}: {len(imoveis_pagina)} imóveis")
-                    for imovel in imoveis_pagina[:3]:  # Mostrar apenas os 3 primeiros
-                        print(f"    • {imovel['nome_imovel']} - R$ {imovel['valor']}")
-                    if len(imoveis_pagina) > 3:
-                        print(f"    ... e mais {len(imoveis_pagina) - 3} imóveis")
-                    print()
-            
-            # Mostrar estatísticas
-            print("\n📈 ESTATÍSTICAS:")
-            print("-" * 30)
-            valores = [float(im['valor'].replace('.', '').replace(',', '.')) for im in todos_imoveis if im['valor'].replace('.', '').replace(',', '.').replace('R$', '').strip().isdigit()]
-            if valores:
-                print(f"💰 Valor médio: R$ {sum(valores)/len(valores):,.2f}")
-                print(f"💰 Valor mínimo: R$ {min(valores):,.2f}")
-                print(f"💰 Valor máximo: R$ {max(valores):,.2f}")
-            
-        else:
-            print("\n❌ Nenhum imóvel encontrado com os filtros especificados")
-            
+                    imoveis_encontrados += len(imoveis_pagina)
+                    logger.info(f"✅ {len(imoveis_pagina)} imóveis encontrados na página {pagina_atual}")
+                    # Páginas já gravadas numa execução anterior só são atravessadas
+                    if pagina_atual >= pagina_inicial:
+                        yield pagina_atual, imoveis_pagina
+                else:
+                    logger.warning(f"⚠️ Nenhum imóvel encontrado na página {pagina_atual}")
+                    # Se não há imóveis e não há botão próximo, parar
+                    if not botao_proximo:
+                        logger.info("🏁 Nenhum imóvel encontrado e não há próxima página")
+                        break
+                
+                if botao_proximo:
+                    try:
+                        print(f"🔄 Navegando para página {pagina_atual + 1}...")
+                        
+                        # Guardar a assinatura da lista atual para detectar a troca de página
+                        marcador_antes = marcador_resultados(driver)
+                        etapa = f"pagina_{pagina_atual + 1}"
+                        
+                        # Tentar clicar no botão (clique via JS não passa pelo limitador do driver)
+                        limitador.adquirir()
+                        driver.execute_script("arguments[0].click();", botao_proximo)
+                        
+                        if esperas.tentar(etapa, dom_mudou(marcador_antes)) is not None:
+                            pagina_atual += 1
+                            print(f"✅ Navegação bem-sucedida para página {pagina_atual}")
+                        else:
+                            print("⚠️ Conteúdo não mudou após clique. Tentando novamente...")
+                            limitador.adquirir()
+                            driver.execute_script("arguments[0].click();", botao_proximo)
+                            
+                            if esperas.tentar(f"{etapa}_retry", dom_mudou(marcador_antes)) is None:
+                                print("❌ Falha na navegação. Parando.")
+                                if checkpoint is not None:
+                                    checkpoint.interromper(f"falha ao navegar para a página {pagina_atual + 1}")
+                                break
+                            else:
+                                pagina_atual += 1
+                                
+                    except Exception as e:
+                        print(f"❌ Erro ao navegar para próxima página: {e}")
+                        if checkpoint is not None:
+                            checkpoint.interromper(str(e))
+                        break
+                else:
+                    print(f"🏁 Última página alcançada (página {pagina_atual})")
+                    break
+        
+        if not imoveis_encontrados:
             # Salvar HTML para análise
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             html_filename = f"pagina_sem_resultados_{filtros['nome_cidade'].lower()}_{timestamp}.html"
@@ -834,37 +1037,26 @@ def buscar_imoveis_com_filtros(filtros):
         driver.save_screenshot(screenshot_filename)
         print(f"📸 Screenshot salvo: {screenshot_filename}")
         
-        return todos_imoveis
-        
     except Exception as e:
         print(f"❌ Erro durante a execução: {e}")
-        return []
+        if checkpoint is not None:
+            checkpoint.interromper(str(e))
+        if sessao is not None:
+            sessao.invalidar()
         
     finally:
-        print("Fechando navegador...")
-        driver.quit()
+        esperas.registrar_relatorio()
+        if driver_proprio:
+            print("Fechando navegador...")
+            driver.quit()
 
 def buscar_estados_disponiveis():
-    """Busca automaticamente todos os estados disponíveis no site da Caixa"""
+    """Busca automaticamente todos os estados disponíveis no site da Caixa (via HTTP, sem navegador)"""
     print("🔍 Buscando estados disponíveis no site da Caixa...")
     
-    driver = configurar_chromedriver(headless=True) # Executar sem interface gráfica para CI/CD
-    
     try:
-        # Acessar página inicial
-        driver.get(URL)
-        time.sleep(3)
-        
-        # Encontrar o select de estados
-        select_estado = Select(driver.find_element(By.ID, "cmb_estado"))
-        
-        # Extrair todas as opções de estado
-        estados_disponiveis = {}
-        for option in select_estado.options:
-            if option.get_attribute("value") and option.get_attribute("value") != "":
-                sigla = option.get_attribute("value")
-                nome = option.text.strip()
-                estados_disponiveis[sigla] = nome
+        with HttpSearchEngine() as motor:
+            estados_disponiveis = motor.listar_estados()
         
         print(f"✅ Encontrados {len(estados_disponiveis)} estados disponíveis:")
         for sigla, nome in estados_disponiveis.items():
@@ -875,35 +1067,21 @@ def buscar_estados_disponiveis():
     except Exception as e:
         print(f"❌ Erro ao buscar estados: {e}")
         return {}
-    finally:
-        driver.quit()
 
-def buscar_cidades_por_estado(estado_sigla):
-    """Busca as cidades disponíveis para um estado específico"""
+def buscar_cidades_por_estado(estado_sigla, catalogo=None):
+    """Busca as cidades disponíveis para um estado específico
+    
+    Usa o catálogo de cidades (carregaListaCidades.asp com cache em disco)
+    em vez de abrir um navegador para ler o select.
+    """
     print(f"🔍 Buscando cidades disponíveis para {estado_sigla}...")
     
-    driver = configurar_chromedriver(headless=True) # Executar sem interface gráfica para CI/CD
+    catalogo_proprio = catalogo is None
+    if catalogo_proprio:
+        catalogo = CatalogoCidades()
     
     try:
-        # Acessar página inicial
-        driver.get(URL)
-        time.sleep(3)
-        
-        # Selecionar estado
-        select_estado = Select(driver.find_element(By.ID, "cmb_estado"))
-        select_estado.select_by_value(estado_sigla)
-        time.sleep(2)
-        
-        # Encontrar o select de cidades
-        select_cidade = Select(driver.find_element(By.ID, "cmb_cidade"))
-        
-        # Extrair todas as opções de cidade
-        cidades_disponiveis = {}
-        for option in select_cidade.options:
-            if option.get_attribute("value") and option.get_attribute("value") != "":
-                codigo = option.get_attribute("value")
-                nome = option.text.strip()
-                cidades_disponiveis[codigo] = nome
+        cidades_disponiveis = catalogo.cidades(estado_sigla)
         
         print(f"✅ Encontradas {len(cidades_disponiveis)} cidades para {estado_sigla}:")
         for codigo, nome in cidades_disponiveis.items():
@@ -915,7 +1093,8 @@ def buscar_cidades_por_estado(estado_sigla):
         print(f"❌ Erro ao buscar cidades para {estado_sigla}: {e}")
         return {}
     finally:
-        driver.quit()
+        if catalogo_proprio:
+            catalogo.fechar()
 
 def atualizar_estados_cidades():
     """Atualiza o dicionário ESTADOS_CIDADES com dados reais do site"""
@@ -928,13 +1107,12 @@ def atualizar_estados_cidades():
         print("❌ Não foi possível buscar estados. Usando lista padrão.")
         return
     
-    # Para cada estado, buscar suas cidades
-    novos_estados_cidades = {}
-    for sigla, nome in estados_disponiveis.items():
-        print(f"\n📍 Buscando cidades para {sigla} ({nome})...")
-        cidades = buscar_cidades_por_estado(sigla)
-        if cidades:
-            novos_estados_cidades[sigla] = cidades
+    # Buscar as cidades de todos os estados em paralelo, na mesma sessão HTTP
+    with CatalogoCidades() as catalogo:
+        novos_estados_cidades = catalogo.atualizar(estados_disponiveis)
+    
+    for sigla, cidades in novos_estados_cidades.items():
+        print(f"📍 {sigla} ({estados_disponiveis[sigla]}): {len(cidades)} cidades")
     
     # Atualizar o dicionário global
     global ESTADOS_CIDADES
@@ -0,0 +1,225 @@
+"""
+Armazenamento persistente dos imóveis em SQLite.
+
+Substitui os arquivos ``imoveis_<cidade>_<timestamp>.csv/.json`` gerados
+a cada busca: os imóveis ficam em uma tabela ``listings`` com chave
+``id_imovel``, atualizada por upsert em lote. O banco usa WAL, de modo
+que leituras não bloqueiam as gravações das buscas em andamento.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import ScraperConfig
+from .logger import get_logger
+from .types import FiltrosBusca
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id_imovel     TEXT PRIMARY KEY,
+    estado        TEXT NOT NULL,
+    cidade        TEXT NOT NULL,
+    codigo_cidade TEXT,
+    nome_imovel   TEXT,
+    endereco      TEXT,
+    quartos       TEXT,
+    valor         REAL,
+    valor_texto   TEXT,
+    link_direto   TEXT,
+    url_imagem    TEXT,
+    dados         TEXT,
+    first_seen    TEXT NOT NULL,
+    last_seen     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_listings_estado_cidade ON listings (estado, cidade);
+CREATE INDEX IF NOT EXISTS idx_listings_valor ON listings (valor);
+CREATE INDEX IF NOT EXISTS idx_listings_first_seen ON listings (first_seen);
+CREATE INDEX IF NOT EXISTS idx_listings_last_seen ON listings (last_seen);
+"""
+
+_UPSERT = """
+INSERT INTO listings (
+    id_imovel, estado, cidade, codigo_cidade, nome_imovel, endereco, quartos,
+    valor, valor_texto, link_direto, url_imagem, dados, first_seen, last_seen
+) VALUES (
+    :id_imovel, :estado, :cidade, :codigo_cidade, :nome_imovel, :endereco, :quartos,
+    :valor, :valor_texto, :link_direto, :url_imagem, :dados, :visto_em, :visto_em
+)
+ON CONFLICT (id_imovel) DO UPDATE SET
+    estado = excluded.estado,
+    cidade = excluded.cidade,
+    codigo_cidade = excluded.codigo_cidade,
+    nome_imovel = excluded.nome_imovel,
+    endereco = excluded.endereco,
+    quartos = excluded.quartos,
+    valor = excluded.valor,
+    valor_texto = excluded.valor_texto,
+    link_direto = excluded.link_direto,
+    url_imagem = excluded.url_imagem,
+    dados = excluded.dados,
+    last_seen = excluded.last_seen
+"""
+
+
+def valor_numerico(valor: Any) -> Optional[float]:
+    """
+    Converte um valor no formato brasileiro ("R$ 151.000,00") em float.
+
+    Args:
+        valor: Texto do valor
+
+    Returns:
+        Valor numérico ou None se não for possível converter
+    """
+    if valor is None:
+        return None
+    texto = str(valor).replace("R$", "").strip().replace(".", "").replace(",", ".")
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+class ListingStore:
+    """
+    Tabela ``listings`` em SQLite (modo WAL) com upsert por ``id_imovel``.
+
+    Examples:
+        >>> with ListingStore() as store:
+        ...     store.upsert(imoveis, filtros)
+        ...     baratos = store.consultar(estado="SC", valor_max=200000)
+    """
+
+    def __init__(self, caminho: Optional[Path] = None, config: Optional[ScraperConfig] = None) -> None:
+        """
+        Abre (ou cria) o banco.
+
+        Args:
+            caminho: Arquivo do banco. Se None, usa ``config.store_file``.
+            config: Configuração do scraper. Se None, usa configuração padrão.
+        """
+        config = config or ScraperConfig()
+        self.caminho = Path(caminho or config.store_file)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(
+            str(self.caminho), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conexao.row_factory = sqlite3.Row
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(_SCHEMA)
+
+    def upsert(self, imoveis: Iterable[Dict[str, Any]], filtros: FiltrosBusca) -> int:
+        """
+        Insere ou atualiza os imóveis de uma busca em uma única transação.
+
+        Imóveis sem ``id_imovel`` são ignorados. ``first_seen`` é mantido
+        para imóveis já conhecidos e ``last_seen`` recebe o horário atual.
+
+        Args:
+            imoveis: Imóveis no schema de extrair_dados_imovel
+            filtros: Filtros da busca (definem estado, cidade e código)
+
+        Returns:
+            Quantidade de imóveis gravados
+        """
+        visto_em = datetime.now().isoformat(timespec="seconds")
+        linhas = [self._linha(imovel, filtros, visto_em) for imovel in imoveis if imovel.get("id_imovel")]
+        if not linhas:
+            return 0
+
+        with self._trava:
+            self._conexao.execute("BEGIN IMMEDIATE")
+            try:
+                self._conexao.executemany(_UPSERT, linhas)
+                self._conexao.execute("COMMIT")
+            except BaseException:
+                self._conexao.execute("ROLLBACK")
+                raise
+
+        logger.info(f"{len(linhas)} imóveis gravados em {self.caminho.name} ({filtros.get('nome_cidade')}/{filtros.get('estado')})")
+        return len(linhas)
+
+    def consultar(
+        self,
+        estado: Optional[str] = None,
+        cidade: Optional[str] = None,
+        valor_min: Optional[float] = None,
+        valor_max: Optional[float] = None,
+        vistos_desde: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Consulta imóveis usando os índices da tabela.
+
+        Args:
+            estado: Sigla do estado
+            cidade: Nome da cidade (como em ``filtros['nome_cidade']``)
+            valor_min: Valor mínimo
+            valor_max: Valor máximo
+            vistos_desde: Data/hora ISO; retorna só imóveis com ``last_seen`` a partir dela
+
+        Returns:
+            Lista de imóveis (colunas da tabela), ordenada por valor
+        """
+        condicoes, parametros = [], []
+        for coluna, operador, valor in (
+            ("estado", "=", estado),
+            ("cidade", "=", cidade.upper() if cidade else None),
+            ("valor", ">=", valor_min),
+            ("valor", "<=", valor_max),
+            ("last_seen", ">=", vistos_desde),
+        ):
+            if valor is not None:
+                condicoes.append(f"{coluna} {operador} ?")
+                parametros.append(valor)
+
+        sql = "SELECT * FROM listings"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += " ORDER BY valor"
+
+        with self._trava:
+            return [dict(linha) for linha in self._conexao.execute(sql, parametros)]
+
+    def contar(self) -> int:
+        """Retorna o total de imóveis no banco."""
+        with self._trava:
+            return self._conexao.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._trava:
+            self._conexao.close()
+
+    def __enter__(self) -> "ListingStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.fechar()
+
+    @staticmethod
+    def _linha(imovel: Dict[str, Any], filtros: FiltrosBusca, visto_em: str) -> Dict[str, Any]:
+        """Converte um imóvel nos parâmetros do upsert."""
+        return {
+            "id_imovel": str(imovel["id_imovel"]),
+            "estado": filtros.get("estado") or imovel.get("estado") or "",
+            "cidade": (filtros.get("nome_cidade") or imovel.get("cidade") or "").upper(),
+            "codigo_cidade": filtros.get("codigo_cidade"),
+            "nome_imovel": imovel.get("nome_imovel"),
+            "endereco": imovel.get("endereco"),
+            "quartos": imovel.get("quartos"),
+            "valor": valor_numerico(imovel.get("valor")),
+            "valor_texto": imovel.get("valor"),
+            "link_direto": imovel.get("link_direto"),
+            "url_imagem": imovel.get("url_imagem"),
+            "dados": json.dumps(imovel, ensure_ascii=False, default=str),
+            "visto_em": visto_em,
+        }
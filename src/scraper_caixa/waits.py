@@ -0,0 +1,421 @@
+"""
+Motor de esperas condicionais.
+
+Substitui pausas fixas (``time.sleep``) por esperas baseadas em
+predicados de prontidão sobre o DOM, usando ``WebDriverWait`` com um
+orçamento global de tempo e registro do tempo gasto em cada etapa.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+from .config import ScraperConfig
+from .exceptions import TimeoutError as ScraperTimeoutError
+from .logger import get_logger
+from .rastreamento import obter_rastreador
+
+logger = get_logger(__name__)
+
+Condicao = Callable[[WebDriver], Any]
+
+# Seletores que indicam que a área de resultados foi renderizada
+SELETOR_RESULTADOS = ".group-block-item, a[onclick*='detalhe_imovel']"
+TEXTOS_SEM_RESULTADO = ("Nenhum resultado", "nenhum resultado", "Não foram encontrados")
+
+_JS_SELECT_COM_OPCOES = """
+var s = document.getElementById(arguments[0]);
+return (s && s.options && s.options.length >= arguments[1]) ? s : null;
+"""
+
+_JS_OPCAO_DISPONIVEL = """
+var s = document.getElementById(arguments[0]);
+if (!s || !s.options) { return null; }
+for (var i = 0; i < s.options.length; i++) {
+    if (s.options[i].value === arguments[1]) { return s; }
+}
+return null;
+"""
+
+_JS_VALOR_SELECIONADO = """
+var s = document.getElementById(arguments[0]);
+return !!(s && s.value === arguments[1]);
+"""
+
+_JS_RESULTADOS_PRESENTES = """
+if (document.querySelector(arguments[0])) { return true; }
+var texto = document.body ? (document.body.innerText || '') : '';
+for (var i = 0; i < arguments[1].length; i++) {
+    if (texto.indexOf(arguments[1][i]) !== -1) { return true; }
+}
+return false;
+"""
+
+_JS_MARCADOR_RESULTADOS = """
+var itens = document.querySelectorAll(arguments[0]);
+if (!itens.length) { return ''; }
+var primeiro = itens[0].getAttribute('onclick') || itens[0].textContent || '';
+var ultimo = itens[itens.length - 1].getAttribute('onclick') || itens[itens.length - 1].textContent || '';
+return itens.length + '|' + primeiro.trim() + '|' + ultimo.trim();
+"""
+
+_JS_DOCUMENTO_INTERATIVO = """
+return document.readyState === 'interactive' || document.readyState === 'complete';
+"""
+
+# Conta as XHRs em andamento (instalado antes dos scripts da página via CDP)
+_JS_CONTADOR_XHR = """
+(function () {
+    if (window.__xhrPendentes !== undefined) { return; }
+    window.__xhrPendentes = 0;
+    var enviar = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__xhrPendentes++;
+        this.addEventListener('loadend', function () { window.__xhrPendentes--; });
+        return enviar.apply(this, arguments);
+    };
+})();
+"""
+
+_JS_XHR_PENDENTES = """
+var jq = (window.jQuery && window.jQuery.active) || 0;
+return jq + (window.__xhrPendentes || 0);
+"""
+
+
+def instalar_contador_xhr(driver: WebDriver) -> bool:
+    """
+    Instala o contador de XHRs pendentes em todos os documentos do driver.
+
+    Usa ``Page.addScriptToEvaluateOnNewDocument``, então o contador já existe
+    quando os scripts da página (como o carregador de cidades) executam.
+    Chamar de novo com o mesmo driver não reinstala o script.
+
+    Args:
+        driver: Instância do ChromeDriver
+
+    Returns:
+        True se o contador está instalado
+    """
+    if getattr(driver, "_contador_xhr", False):
+        return True
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _JS_CONTADOR_XHR})
+    except Exception as e:
+        logger.debug(f"Contador de XHR indisponível (usando só jQuery.active): {e}")
+        return False
+    driver._contador_xhr = True
+    return True
+
+
+def documento_interativo() -> Condicao:
+    """
+    Predicado: ``document.readyState`` é ``interactive`` ou ``complete``.
+
+    Returns:
+        Condição que retorna True quando o DOM já foi construído
+    """
+    def _condicao(driver: WebDriver) -> bool:
+        return bool(driver.execute_script(_JS_DOCUMENTO_INTERATIVO))
+    return _condicao
+
+
+def sem_xhr_pendente() -> Condicao:
+    """
+    Predicado: não há XHRs em andamento na página.
+
+    Considera ``jQuery.active`` e o contador de ``instalar_contador_xhr``
+    (sem o contador, vale só o jQuery).
+
+    Returns:
+        Condição que retorna True quando não há requisições pendentes
+    """
+    def _condicao(driver: WebDriver) -> bool:
+        return not driver.execute_script(_JS_XHR_PENDENTES)
+    return _condicao
+
+
+def todas(*condicoes: Condicao) -> Condicao:
+    """
+    Predicado composto: todas as condições são satisfeitas na mesma verificação.
+
+    Args:
+        condicoes: Predicados avaliados em ordem (para no primeiro falso)
+
+    Returns:
+        Condição que retorna o valor da primeira condição quando todas são verdadeiras
+    """
+    def _condicao(driver: WebDriver) -> Any:
+        primeiro = None
+        for indice, condicao in enumerate(condicoes):
+            valor = condicao(driver)
+            if not valor:
+                return None
+            if indice == 0:
+                primeiro = valor
+        return primeiro
+    return _condicao
+
+
+def formulario_pronto(id_select: str = "cmb_estado") -> Condicao:
+    """
+    Predicado: o formulário de busca pode ser usado.
+
+    Com ``page_load_strategy`` eager/none o ``driver.get`` retorna antes de
+    a página terminar de carregar; este predicado substitui a espera pelo
+    load completo: DOM interativo, ``<select>`` populado e nenhuma XHR pendente.
+
+    Args:
+        id_select: ID do select que precisa estar populado
+
+    Returns:
+        Condição que retorna o WebElement do select quando pronto
+    """
+    return todas(select_com_opcoes(id_select), documento_interativo(), sem_xhr_pendente())
+
+
+def select_com_opcoes(id_select: str, minimo: int = 2) -> Condicao:
+    """
+    Predicado: o ``<select>`` informado tem pelo menos ``minimo`` opções.
+
+    O padrão (2) significa "carregou algo além do 'Selecione'".
+
+    Args:
+        id_select: ID do elemento select
+        minimo: Número mínimo de opções
+
+    Returns:
+        Condição que retorna o WebElement do select quando pronto
+    """
+    def _condicao(driver: WebDriver) -> Any:
+        return driver.execute_script(_JS_SELECT_COM_OPCOES, id_select, minimo)
+    return _condicao
+
+
+def opcao_disponivel(id_select: str, valor: str) -> Condicao:
+    """
+    Predicado: o ``<select>`` informado já tem uma opção com ``valor``.
+
+    Args:
+        id_select: ID do elemento select
+        valor: Valor da opção esperada
+
+    Returns:
+        Condição que retorna o WebElement do select quando a opção existe
+    """
+    def _condicao(driver: WebDriver) -> Any:
+        return driver.execute_script(_JS_OPCAO_DISPONIVEL, id_select, valor)
+    return _condicao
+
+
+def valor_selecionado(id_select: str, valor: str) -> Condicao:
+    """
+    Predicado: o ``<select>`` informado está com ``valor`` selecionado.
+
+    Args:
+        id_select: ID do elemento select
+        valor: Valor esperado
+
+    Returns:
+        Condição que retorna True quando o valor está selecionado
+    """
+    def _condicao(driver: WebDriver) -> bool:
+        return bool(driver.execute_script(_JS_VALOR_SELECIONADO, id_select, valor))
+    return _condicao
+
+
+def resultados_presentes() -> Condicao:
+    """
+    Predicado: a área de resultados foi renderizada.
+
+    Considera pronta tanto uma página com imóveis quanto uma página
+    com a mensagem de "nenhum resultado".
+
+    Returns:
+        Condição que retorna True quando há resultados (ou aviso de vazio)
+    """
+    def _condicao(driver: WebDriver) -> bool:
+        return bool(driver.execute_script(
+            _JS_RESULTADOS_PRESENTES, SELETOR_RESULTADOS, list(TEXTOS_SEM_RESULTADO)
+        ))
+    return _condicao
+
+
+def marcador_resultados(driver: WebDriver) -> str:
+    """
+    Calcula uma assinatura da lista de resultados exibida.
+
+    A assinatura combina a quantidade de imóveis e o primeiro/último
+    item, e muda sempre que a paginação troca o conteúdo da lista.
+
+    Args:
+        driver: Instância do WebDriver
+
+    Returns:
+        Assinatura da página atual ou string vazia se não há resultados
+    """
+    try:
+        return driver.execute_script(_JS_MARCADOR_RESULTADOS, "a[onclick*='detalhe_imovel']") or ''
+    except Exception:
+        return ''
+
+
+def dom_mudou(marcador_anterior: str) -> Condicao:
+    """
+    Predicado: a lista de resultados foi substituída após a paginação.
+
+    Args:
+        marcador_anterior: Assinatura obtida com ``marcador_resultados`` antes do clique
+
+    Returns:
+        Condição que retorna a nova assinatura quando o conteúdo muda
+    """
+    def _condicao(driver: WebDriver) -> Any:
+        atual = marcador_resultados(driver)
+        return atual if atual and atual != marcador_anterior else None
+    return _condicao
+
+
+class WaitEngine:
+    """
+    Executa esperas condicionais dentro de um orçamento global de tempo.
+
+    Cada chamada recebe o nome da etapa, que é usado para contabilizar
+    o tempo gasto. O timeout de cada espera é limitado pelo que resta
+    do orçamento, de modo que uma busca nunca ultrapassa ``wait_budget``
+    segundos somando todas as esperas.
+
+    Examples:
+        >>> esperas = WaitEngine(driver, ScraperConfig())
+        >>> esperas.aguardar("estados", select_com_opcoes("cmb_estado"))
+        >>> esperas.registrar_relatorio()
+    """
+
+    def __init__(self, driver: WebDriver, config: Optional[ScraperConfig] = None) -> None:
+        """
+        Inicializa o motor de esperas.
+
+        Args:
+            driver: Instância do WebDriver
+            config: Configuração do scraper. Se None, usa configuração padrão.
+        """
+        config = config or ScraperConfig()
+        self.driver = driver
+        self.estrategia = config.page_load_strategy
+        self.timeout_padrao = float(config.timeout)
+        self.orcamento = float(config.wait_budget)
+        self.intervalo = float(config.poll_interval)
+        self.tempos: Dict[str, float] = {}
+        self._etapas: List[Tuple[str, float, bool]] = []
+        self._gasto = 0.0
+
+    @property
+    def restante(self) -> float:
+        """Tempo (segundos) que ainda resta no orçamento."""
+        return max(0.0, self.orcamento - self._gasto)
+
+    def aguardar(
+        self,
+        etapa: str,
+        condicao: Condicao,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Aguarda até a condição ser satisfeita.
+
+        Args:
+            etapa: Nome da etapa (usado no relatório de tempos)
+            condicao: Predicado que recebe o driver e retorna valor verdadeiro quando pronto
+            timeout: Timeout da etapa. Se None, usa o timeout padrão da configuração.
+
+        Returns:
+            Valor retornado pela condição
+
+        Raises:
+            TimeoutError: Se a condição não for satisfeita a tempo ou o orçamento acabar
+        """
+        limite = min(timeout or self.timeout_padrao, self.restante)
+        if limite <= 0:
+            self._registrar(etapa, 0.0, False)
+            raise ScraperTimeoutError(
+                f"Orçamento de espera ({self.orcamento:.0f}s) esgotado antes da etapa '{etapa}'"
+            )
+
+        inicio = time.monotonic()
+        try:
+            resultado = WebDriverWait(self.driver, limite, poll_frequency=self.intervalo).until(condicao)
+        except TimeoutException as e:
+            self._registrar(etapa, time.monotonic() - inicio, False)
+            raise ScraperTimeoutError(f"Timeout de {limite:.1f}s na etapa '{etapa}'") from e
+
+        self._registrar(etapa, time.monotonic() - inicio, True)
+        return resultado
+
+    def tentar(
+        self,
+        etapa: str,
+        condicao: Condicao,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Igual a ``aguardar``, mas retorna None em vez de levantar exceção.
+
+        Args:
+            etapa: Nome da etapa
+            condicao: Predicado de prontidão
+            timeout: Timeout da etapa
+
+        Returns:
+            Valor retornado pela condição ou None se não foi satisfeita
+        """
+        try:
+            return self.aguardar(etapa, condicao, timeout)
+        except ScraperTimeoutError as e:
+            logger.warning(str(e))
+            return None
+
+    @contextmanager
+    def cronometrar(self, etapa: str) -> Iterator[None]:
+        """
+        Registra o tempo de um bloco (por exemplo, o ``driver.get``) como etapa.
+
+        Args:
+            etapa: Nome da etapa
+        """
+        inicio = time.monotonic()
+        sucesso = False
+        try:
+            yield
+            sucesso = True
+        finally:
+            self._registrar(etapa, time.monotonic() - inicio, sucesso)
+
+    def relatorio(self) -> str:
+        """
+        Gera um resumo do tempo gasto por etapa.
+
+        Returns:
+            Texto com uma linha por etapa e o total consumido do orçamento
+        """
+        linhas = [
+            f"{etapa:<28} {duracao:7.2f}s {'ok' if sucesso else 'TIMEOUT'}"
+            for etapa, duracao, sucesso in self._etapas
+        ]
+        linhas.append(f"{'total':<28} {self._gasto:7.2f}s de {self.orcamento:.0f}s")
+        return "\n".join(linhas)
+
+    def registrar_relatorio(self) -> None:
+        """Escreve o resumo de tempos por etapa no log."""
+        logger.info(f"Tempo gasto em esperas por etapa (page_load_strategy={self.estrategia}):\n" + self.relatorio())
+
+    def _registrar(self, etapa: str, duracao: float, sucesso: bool) -> None:
+        """Contabiliza o tempo gasto em uma etapa."""
+        self._gasto += duracao
+        self.tempos[etapa] = self.tempos.get(etapa, 0.0) + duracao
+        self._etapas.append((etapa, duracao, sucesso))
+        obter_rastreador().registrar(etapa, time.monotonic() - duracao, duracao, "espera", sucesso=sucesso)
+        logger.debug(f"Espera '{etapa}': {duracao:.2f}s ({'ok' if sucesso else 'timeout'})")
@@ -20,7 +20,8 @@ class DataValidator:
         
         # Padrões de validação
         self.patterns = {
-            'valor': r'R\$\s*\d{1,3}(?:\.\d{3})*(?:,\d{2})?$',
+            # O extrator guarda o valor sem o prefixo "R$" (ex.: "151.000,00")
+            'valor': r'(?:R\$\s*)?\d{1,3}(?:\.\d{3})*(?:,\d{2})?$',
             'id_imovel': r'^\d+$',
             'cidade': r'^[A-Z\s]+$',
             'nome_imovel': r'^.+$'